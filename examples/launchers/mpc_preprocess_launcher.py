@@ -0,0 +1,33 @@
+import logging
+from dataclasses import dataclass, field
+
+from fate.arch.launchers.argparser import HfArgumentParser
+from fate.arch.launchers.multiprocess_launcher import launch
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreprocessArguments:
+    cache_path: str = field()
+    provider: str = field(default="HE")
+    repeats: int = field(default=1)
+
+
+def run_preprocess(ctx):
+    """
+    offline phase: generates the tuples of the request log traced under `cache_path`,
+    the online phase consumes them with `mpc.load_cache(cache_path)`
+    """
+    from fate.arch.config import cfg
+    from fate.arch.protocol import mpc
+
+    args, _ = HfArgumentParser(PreprocessArguments).parse_args_into_dataclasses(return_remaining_strings=True)
+    cfg.safety.mpc.provider = args.provider
+    ctx.mpc.init()
+    mpc.preprocess(ctx, filepath=args.cache_path, repeats=args.repeats)
+    logger.info(f"tuples for {args.repeats} run(s) saved to {args.cache_path}")
+
+
+if __name__ == "__main__":
+    launch(run_preprocess)
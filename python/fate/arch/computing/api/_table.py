@@ -18,6 +18,9 @@ import logging
 import random
 from typing import Any, Callable, Tuple, Iterable, Generic, TypeVar, Optional
 
+import cloudpickle
+
+from fate.arch.config import cfg
 from fate.arch.computing.partitioners import get_partitioner_by_type
 from fate.arch.computing.serdes import get_serdes_by_type
 from fate.arch.trace import auto_trace
@@ -254,6 +257,12 @@ class KVTable(Generic[K, V]):
     def destroy(self):
         self._destroy()
 
+    def materialize(self) -> "KVTable":
+        """
+        return the backend table holding the data, tables with pending lazy transformations run them here
+        """
+        return self
+
     @auto_trace
     @_compute_info
     def map_reduce_partitions_with_index(
@@ -285,6 +294,7 @@ class KVTable(Generic[K, V]):
         output_value_serdes_type=None,
         output_partitioner_type=None,
         output_num_partitions=None,
+        fusible=True,
     ):
         if not shuffle and reduce_partition_op is not None:
             raise ValueError("when shuffle is False, it is not allowed to specify reduce_partition_op")
@@ -296,6 +306,15 @@ class KVTable(Generic[K, V]):
             output_partitioner_type = self.partitioner_type
         if output_num_partitions is None:
             output_num_partitions = self.num_partitions
+        if fusible and not shuffle and cfg.computing.lazy_fusion:
+            return _LazyKVTable.from_narrow_op(
+                self,
+                map_partition_op,
+                key_serdes_type=output_key_serdes_type,
+                value_serdes_type=output_value_serdes_type,
+                partitioner_type=output_partitioner_type,
+                num_partitions=output_num_partitions,
+            )
         input_key_serdes = self.key_serdes
         input_value_serdes = self.value_serdes
         input_partitioner = self.partitioner
@@ -478,11 +497,13 @@ class KVTable(Generic[K, V]):
         )
 
     def _sample(self, fraction, seed=None) -> "KVTable":
+        # sampling is not deterministic across recomputation, so never defer it
         return self._map_reduce_partitions_with_index(
             _lifted_sample_to_mpwi(fraction, seed),
             shuffle=False,
             output_key_serdes_type=self.key_serdes_type,
             output_value_serdes_type=self.value_serdes_type,
+            fusible=False,
         )
 
     @auto_trace
@@ -564,6 +585,7 @@ class KVTable(Generic[K, V]):
         #   self.num_partitions == other.num_partitions
         #   self.partitioner_type == other.partitioner_type
         first, second = self.repartition_with(other)
+        first, second = first.materialize(), second.materialize()
 
         # apply binary_sorted_map_partitions_with_index_op
         return first._binary_sorted_map_partitions_with_index(
@@ -692,6 +714,132 @@ class KVTable(Generic[K, V]):
                 return sampled_table._drop_num(sampled_count - num, self.partitioner)
 
 
+class _LazyKVTable(KVTable):
+    """
+    a table defined by a narrow (non-shuffling) transformation of its parent table.
+
+    chains of lazy tables are fused into one per-partition pass when the table is consumed, values flow
+    between fused ops as python objects without serdes. A lazy parent consumed by several tables is
+    materialized once and shared instead of being fused into each of them. The materialized result is
+    cached so that the ops run at most once per consumed table.
+    """
+
+    def __init__(self, parent: KVTable, op, key_serdes_type, value_serdes_type, partitioner_type, num_partitions):
+        super().__init__(
+            key_serdes_type=key_serdes_type,
+            value_serdes_type=value_serdes_type,
+            partitioner_type=partitioner_type,
+            num_partitions=num_partitions,
+        )
+        self._parent = parent
+        # the op is pickled now as eager execution would, state it captures is bound at call time
+        self._op_bytes = cloudpickle.dumps(op)
+        self._num_consumers = 0
+        self._materialized = None
+
+    @classmethod
+    def from_narrow_op(
+        cls, table: KVTable, op, key_serdes_type, value_serdes_type, partitioner_type, num_partitions
+    ) -> "_LazyKVTable":
+        if isinstance(table, _LazyKVTable):
+            table._num_consumers += 1
+        return cls(
+            table,
+            op,
+            key_serdes_type=key_serdes_type,
+            value_serdes_type=value_serdes_type,
+            partitioner_type=partitioner_type,
+            num_partitions=num_partitions,
+        )
+
+    def __str__(self):
+        return f"<{self.__class__.__name__} materialized={self._materialized}, parent={self._parent}>"
+
+    @KVTable.schema.setter
+    def schema(self, schema):
+        self._schema = schema
+        if self._materialized is not None:
+            self._materialized.schema = schema
+
+    def _fused_source_and_ops(self):
+        ops_bytes = [self._op_bytes]
+        parent = self._parent
+        while isinstance(parent, _LazyKVTable) and parent._materialized is None and parent._num_consumers == 1:
+            ops_bytes.append(parent._op_bytes)
+            parent = parent._parent
+        return parent.materialize(), [cloudpickle.loads(op_bytes) for op_bytes in reversed(ops_bytes)]
+
+    def materialize(self) -> KVTable:
+        if self._materialized is None:
+            source, ops = self._fused_source_and_ops()
+            self._materialized = source._impl_map_reduce_partitions_with_index(
+                map_partition_op=_lifted_mpwi_map_to_serdes(
+                    _fused_mpwi(ops),
+                    source.key_serdes,
+                    source.value_serdes,
+                    self.key_serdes,
+                    self.value_serdes,
+                ),
+                reduce_partition_op=None,
+                shuffle=False,
+                input_key_serdes=source.key_serdes,
+                input_key_serdes_type=source.key_serdes_type,
+                input_value_serdes=source.value_serdes,
+                input_value_serdes_type=source.value_serdes_type,
+                input_partitioner=source.partitioner,
+                input_partitioner_type=source.partitioner_type,
+                output_key_serdes=self.key_serdes,
+                output_key_serdes_type=self.key_serdes_type,
+                output_value_serdes=self.value_serdes,
+                output_value_serdes_type=self.value_serdes_type,
+                output_partitioner=self.partitioner,
+                output_partitioner_type=self.partitioner_type,
+                output_num_partitions=self.num_partitions,
+            )
+            self._materialized.schema = self._schema
+            # release parent so that it can be cleaned up
+            self._parent = None
+            self._op_bytes = None
+        return self._materialized
+
+    def _save(self, uri: URI, schema, options: dict):
+        return self.materialize()._save(uri, schema, options)
+
+    def _drop_num(self, num: int, partitioner):
+        return self.materialize()._drop_num(num, partitioner)
+
+    def _impl_map_reduce_partitions_with_index(self, *args, **kwargs):
+        return self.materialize()._impl_map_reduce_partitions_with_index(*args, **kwargs)
+
+    def _binary_sorted_map_partitions_with_index(self, other: "KVTable", *args, **kwargs):
+        return self.materialize()._binary_sorted_map_partitions_with_index(other.materialize(), *args, **kwargs)
+
+    def _reduce(self, func, **kwargs):
+        return self.materialize()._reduce(func, **kwargs)
+
+    def _collect(self, **kwargs):
+        return self.materialize()._collect(**kwargs)
+
+    def _take(self, n=1, **kwargs):
+        return self.materialize()._take(n, **kwargs)
+
+    def _count(self):
+        return self.materialize()._count()
+
+    def _destroy(self):
+        if self._materialized is not None:
+            self._materialized.destroy()
+
+
+def _fused_mpwi(ops):
+    def _fused(_index, _iter):
+        for op in ops:
+            _iter = op(_index, _iter)
+        return _iter
+
+    return _fused
+
+
 def _lifted_map_to_io_serdes(_f, input_key_serdes, input_value_serdes, output_key_serdes, output_value_serdes):
     def _lifted(_index, _iter):
         for out_k, out_v in _f(_index, _serdes_wrapped_generator(_iter, input_key_serdes, input_value_serdes)):
@@ -14,15 +14,20 @@
 #  limitations under the License.
 
 import logging
+import os
 from typing import Optional
 
 from fate.arch.computing.api import KVTableContext, generate_computing_uuid
-from fate.arch.unify import URI, uuid
-from ._standalone import Session
+from fate.arch.computing.partitioners import get_partitioner_by_type
+from fate.arch.computing.serdes import get_serdes_by_type
+from fate.arch.unify import URI
+from ._standalone import Session, BasicProcessPool, PinnedProcessPool
 from ._table import Table
 
 logger = logging.getLogger(__name__)
 
+_WORKER_POOLS = {"basic": BasicProcessPool, "pinned": PinnedProcessPool}
+
 
 class CSession(KVTableContext):
     def __init__(
@@ -39,7 +44,16 @@ class CSession(KVTableContext):
         if options is None:
             options = {}
         max_workers = options.get("task_cores", None)
-        self._session = Session(session_id, data_dir=data_dir, max_workers=max_workers, logger_config=logger_config)
+        shuffle_memory_budget = options.get("shuffle_memory_budget", None)
+        executor_pool_cls = _WORKER_POOLS[options.get("worker_pool", "pinned")]
+        self._session = Session(
+            session_id,
+            data_dir=data_dir,
+            max_workers=max_workers,
+            logger_config=logger_config,
+            shuffle_memory_budget=shuffle_memory_budget,
+            executor_pool_cls=executor_pool_cls,
+        )
 
     def get_standalone_session(self):
         return self._session
@@ -54,6 +68,8 @@ class CSession(KVTableContext):
         schema: dict,
         options: dict,
     ):
+        if uri.scheme == "file":
+            return self._load_file(uri, schema, options)
         if uri.scheme != "standalone":
             raise ValueError(f"uri scheme `{uri.scheme}` not supported with standalone backend")
         try:
@@ -61,13 +77,54 @@ class CSession(KVTableContext):
         except Exception as e:
             raise ValueError(f"uri `{uri}` not valid, demo format: standalone://database_path/namespace/name") from e
 
-        raw_table = self._session.load(name=name, namespace=namespace)
-        raw_table = raw_table.copy_as(
-            name=f"{name}_{uuid()}",
-            namespace=namespace,
-            need_cleanup=True,
+        # a copy-on-write view of the stored table, it is only copied if written
+        raw_table = self._session.load(name=name, namespace=namespace, copy_on_write=True)
+        table = Table(raw_table)
+        table.schema = schema
+        return table
+
+    def _load_file(self, uri: URI, schema: dict, options: Optional[dict]):
+        """
+        loads a csv or parquet file, splits of the file are read by the workers in parallel.
+
+        each record is keyed by its first column and valued by the rest columns joined by `id_delimiter`,
+        same as lines uploaded without serialization. A csv is split by byte ranges, its first line is
+        taken as header unless `has_header` is False; a parquet is split by row groups.
+        """
+        if options is None:
+            options = {}
+        path = uri.path
+        if not os.path.isfile(path):
+            raise ValueError(f"uri `{uri}` not valid, file `{path}` not found")
+        file_format = options.get("format", "parquet" if path.endswith(".parquet") else "csv")
+        id_delimiter = options.get("id_delimiter", ",")
+        partitions = options.get("partitions", None)
+        if partitions is None:
+            partitions = self._session.max_workers
+        num_splits = options.get("splits", self._session.max_workers)
+
+        key_serdes_type, value_serdes_type, partitioner_type = 0, 0, 0
+        if file_format == "csv":
+            header, splits = _get_csv_splits(path, num_splits, options.get("has_header", True))
+            reader = _CsvSplitReader(path, id_delimiter, key_serdes_type, value_serdes_type)
+        elif file_format == "parquet":
+            header, splits = _get_parquet_splits(path, num_splits, id_delimiter)
+            reader = _ParquetSplitReader(path, id_delimiter, key_serdes_type, value_serdes_type)
+        else:
+            raise ValueError(f"file format `{file_format}` not supported with standalone backend")
+
+        raw_table = self._session.ingest(
+            reader=reader,
+            splits=splits,
+            partition=partitions,
+            partitioner=get_partitioner_by_type(partitioner_type),
+            key_serdes_type=key_serdes_type,
+            value_serdes_type=value_serdes_type,
+            partitioner_type=partitioner_type,
         )
         table = Table(raw_table)
+        if header is not None and "header" not in schema:
+            schema = {**schema, "header": header}
         table.schema = schema
         return table
 
@@ -127,3 +184,78 @@ class CSession(KVTableContext):
         except Exception as e:
             logger.warning(f"stop storage session {self.session_id} failed, try to kill", e)
             self.kill()
+
+
+def _get_csv_splits(path: str, num_splits: int, has_header: bool):
+    header, start = None, 0
+    if has_header:
+        with open(path, "rb") as f:
+            line = f.readline()
+            # an empty file has no header
+            if line:
+                header = line.decode("utf-8").rstrip("\r\n")
+            start = f.tell()
+    size = os.path.getsize(path)
+    split_size = max(-(-(size - start) // num_splits), 1)
+    return header, [(offset, min(offset + split_size, size)) for offset in range(start, size, split_size)]
+
+
+def _get_parquet_splits(path: str, num_splits: int, id_delimiter: str):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    header = id_delimiter.join(parquet_file.schema_arrow.names)
+    row_groups = list(range(parquet_file.num_row_groups))
+    split_size = max(-(-len(row_groups) // num_splits), 1)
+    return header, [row_groups[i : i + split_size] for i in range(0, len(row_groups), split_size)]
+
+
+class _CsvSplitReader:
+    """
+    reads the lines starting in byte range [start, end), a line crossing `start` belongs to the previous split
+    """
+
+    def __init__(self, path, id_delimiter, key_serdes_type, value_serdes_type):
+        self.path = path
+        self.id_delimiter = id_delimiter
+        self.key_serdes_type = key_serdes_type
+        self.value_serdes_type = value_serdes_type
+
+    def __call__(self, split):
+        start, end = split
+        key_serdes = get_serdes_by_type(self.key_serdes_type)
+        value_serdes = get_serdes_by_type(self.value_serdes_type)
+        with open(self.path, "rb") as f:
+            if start > 0:
+                f.seek(start - 1)
+                f.readline()
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                line = line.decode("utf-8").rstrip("\r\n")
+                if not line:
+                    continue
+                k, _, v = line.partition(self.id_delimiter)
+                yield key_serdes.serialize(k), value_serdes.serialize(v)
+
+
+class _ParquetSplitReader:
+    def __init__(self, path, id_delimiter, key_serdes_type, value_serdes_type):
+        self.path = path
+        self.id_delimiter = id_delimiter
+        self.key_serdes_type = key_serdes_type
+        self.value_serdes_type = value_serdes_type
+
+    def __call__(self, split):
+        import pyarrow.parquet as pq
+
+        key_serdes = get_serdes_by_type(self.key_serdes_type)
+        value_serdes = get_serdes_by_type(self.value_serdes_type)
+        parquet_file = pq.ParquetFile(self.path)
+        for row_group in split:
+            columns = parquet_file.read_row_group(row_group).columns
+            keys, values = columns[0].to_pylist(), [column.to_pylist() for column in columns[1:]]
+            for i, k in enumerate(keys):
+                v = self.id_delimiter.join("" if value[i] is None else str(value[i]) for value in values)
+                yield key_serdes.serialize(str(k)), value_serdes.serialize(v)
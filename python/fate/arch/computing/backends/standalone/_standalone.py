@@ -15,20 +15,25 @@
 #
 
 import hashlib
+import heapq
 import itertools
 import logging
 import logging.config
 import os
 import shutil
 import signal
+import socket
+import struct
+import tempfile
 import threading
 import time
 import uuid
+from collections import OrderedDict
 from concurrent.futures import ProcessPoolExecutor as Executor
 from contextlib import ExitStack
 from functools import partial
 from heapq import heapify, heappop, heapreplace
-from operator import is_not
+from operator import is_not, itemgetter
 from pathlib import Path
 from typing import Callable, Any, Iterable, Optional
 from typing import List, Tuple, Literal
@@ -40,6 +45,8 @@ PartyMeta = Tuple[Literal["guest", "host", "arbiter", "local"], str]
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_SHUFFLE_MEMORY_BUDGET = 64 * 1024 * 1024
+
 
 def _watch_thread_react_to_parent_die(ppid, logger_config):
     """
@@ -77,6 +84,20 @@ class BasicProcessPool:
         self._exception_tb = {}
         self.log_level = log_level
 
+    @classmethod
+    def create(cls, max_workers, logger_config, log_level):
+        return cls(
+            pool=Executor(
+                max_workers=max_workers,
+                initializer=_watch_thread_react_to_parent_die,
+                initargs=(
+                    os.getpid(),
+                    logger_config,
+                ),
+            ),
+            log_level=log_level,
+        )
+
     def submit(self, func, process_infos):
         features = []
         outputs = {}
@@ -119,10 +140,215 @@ class BasicProcessPool:
             logger.error(f"exception in rank {process_info.partition_id}: {e}")
             return process_info.partition_id, None, e
 
+    def evict_cached_envs(self, path: Path):
+        pass
+
     def shutdown(self):
         self._pool.shutdown()
 
 
+def _init_pinned_worker(ppid, logger_config, env_cache_size, functor_cache_size, functor_cache_bytes):
+    global _worker_env_cache, _worker_functor_cache
+
+    _watch_thread_react_to_parent_die(ppid, logger_config)
+    _worker_env_cache = _EnvCache(env_cache_size)
+    _worker_functor_cache = _FunctorCache(functor_cache_size, functor_cache_bytes)
+
+
+class PinnedProcessPool:
+    """
+    long-lived worker processes with partitions pinned to them: partition `p` always runs on worker
+    `p % num_workers`, so lmdb envs and deserialized functors cached in the worker are reused across tasks.
+    all partitions of a task assigned to a worker are dispatched in one batch.
+
+    functors are cached by their pickled bytes until evicted or the session closes, partitions and tasks
+    running the same functor share one instance of it, so functors should not keep state between calls.
+    """
+
+    def __init__(self, workers, log_level):
+        self._workers = workers
+        self.log_level = log_level
+
+    @classmethod
+    def create(
+        cls,
+        max_workers,
+        logger_config,
+        log_level,
+        env_cache_size=128,
+        functor_cache_size=64,
+        functor_cache_bytes=256 * 1024 * 1024,
+    ):
+        if max_workers is None:
+            max_workers = os.cpu_count()
+        workers = [
+            Executor(
+                max_workers=1,
+                initializer=_init_pinned_worker,
+                initargs=(os.getpid(), logger_config, env_cache_size, functor_cache_size, functor_cache_bytes),
+            )
+            for _ in range(max_workers)
+        ]
+        return cls(workers=workers, log_level=log_level)
+
+    def submit(self, func, process_infos):
+        batches = {}
+        for process_info in process_infos:
+            batches.setdefault(process_info.partition_id % len(self._workers), []).append(process_info)
+        features = [
+            self._workers[worker_id].submit(PinnedProcessPool._batch_wrapper, func, batch, self.log_level)
+            for worker_id, batch in batches.items()
+        ]
+
+        from concurrent.futures import as_completed
+
+        outputs = {}
+        for f in as_completed(features):
+            for partition_id, output, e in f.result():
+                if e is not None:
+                    logger.error(f"partition {partition_id} exec failed: {e}")
+                    raise RuntimeError(f"Partition {partition_id} exec failed: {e}")
+                outputs[partition_id] = output
+        return [outputs[p] for p in range(len(process_infos))]
+
+    @classmethod
+    def _batch_wrapper(cls, do_func, process_infos, log_level):
+        # noinspection PyProtectedMember
+        return [BasicProcessPool._process_wrapper(do_func, process_info, log_level) for process_info in process_infos]
+
+    def evict_cached_envs(self, path: Path):
+        """
+        closes envs under `path` cached by the workers, each worker runs it before any task submitted later
+        """
+        for worker in self._workers:
+            try:
+                worker.submit(_evict_worker_envs, path)
+            except RuntimeError:
+                # pool already shut down, the cached envs are closed with the workers
+                pass
+
+    def shutdown(self):
+        for worker in self._workers:
+            worker.submit(_clear_worker_functors)
+            worker.shutdown()
+
+
+def _evict_worker_envs(path: Path):
+    _worker_env_cache.evict(path)
+
+
+def _clear_worker_functors():
+    _worker_functor_cache.clear()
+
+
+# worker local caches, only enabled in processes of `PinnedProcessPool`
+_worker_env_cache: Optional["_EnvCache"] = None
+_worker_functor_cache: Optional["_FunctorCache"] = None
+
+
+class _CachedEnv:
+    """
+    env handle owned by `_EnvCache`, leaving a `with` block does not close it
+    """
+
+    def __init__(self, env, write, inode):
+        self.env = env
+        self.write = write
+        self.inode = inode
+
+    def __enter__(self):
+        return self.env
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def __getattr__(self, item):
+        return getattr(self.env, item)
+
+
+class _EnvCache:
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._envs = OrderedDict()
+
+    @staticmethod
+    def _inode(path: Path):
+        try:
+            return os.stat(path.joinpath("data.mdb")).st_ino
+        except FileNotFoundError:
+            return None
+
+    def get(self, path: Path, write=False):
+        key = path.as_posix()
+        inode = self._inode(path)
+        if (cached := self._envs.get(key)) is not None:
+            # a writable env serves reads as well, but a read-only one must be reopened for writes,
+            # and tables destroyed and recreated under the same path since caching must be reopened too
+            if cached.inode == inode and (cached.write or not write):
+                self._envs.move_to_end(key)
+                return cached
+            self._envs.pop(key).env.close()
+        try:
+            env = _open_env_uncached(path, write=write)
+        except lmdb.Error as e:
+            if "already open" not in e.args[0]:
+                raise e
+            # lmdb identifies open envs by the inodes of their files, a cached env of a table destroyed by
+            # another process, e.g. a table pushed by another party, may claim inodes of the files of a new one
+            self._close_stale()
+            env = _open_env_uncached(path, write=write)
+        cached = _CachedEnv(env, write, self._inode(path))
+        self._envs[key] = cached
+        while len(self._envs) > self._max_size:
+            _, evicted = self._envs.popitem(last=False)
+            evicted.env.close()
+        return cached
+
+    def evict(self, path: Path):
+        prefix = path.as_posix()
+        for key in [key for key in self._envs if key == prefix or key.startswith(prefix + "/")]:
+            self._envs.pop(key).env.close()
+
+    def _close_stale(self):
+        for key in [key for key, cached in self._envs.items() if cached.inode != self._inode(Path(key))]:
+            self._envs.pop(key).env.close()
+
+
+class _FunctorCache:
+    """
+    lru cache of unpickled functors keyed by their pickled bytes, bounded by count and by total pickled size
+    """
+
+    def __init__(self, max_size, max_bytes):
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._functors = OrderedDict()
+        self._bytes = 0
+
+    def loads(self, functor_bytes: bytes):
+        key = hashlib.sha1(functor_bytes).digest()
+        if (cached := self._functors.get(key)) is not None:
+            self._functors.move_to_end(key)
+            return cached[0]
+        functor = f_pickle.loads(functor_bytes)
+        self._functors[key] = (functor, len(functor_bytes))
+        self._bytes += len(functor_bytes)
+        while len(self._functors) > 1 and (len(self._functors) > self._max_size or self._bytes > self._max_bytes):
+            _, (_, size) = self._functors.popitem(last=False)
+            self._bytes -= size
+        return functor
+
+    def clear(self):
+        self._functors.clear()
+        self._bytes = 0
+
+
+def _loads_functor(functor_bytes: bytes):
+    if _worker_functor_cache is not None:
+        return _worker_functor_cache.loads(functor_bytes)
+    return f_pickle.loads(functor_bytes)
+
+
 # noinspection PyPep8Naming
 class Table(object):
     def __init__(
@@ -136,8 +362,12 @@ class Table(object):
         value_serdes_type: int,
         partitioner_type: int,
         need_cleanup=True,
+        read_only=False,
+        copy_on_write=False,
     ):
         self._need_cleanup = need_cleanup
+        self._read_only = read_only
+        self._copy_on_write = copy_on_write
         self._data_dir = data_dir
         self._namespace = namespace
         self._name = name
@@ -175,6 +405,10 @@ class Table(object):
     def namespace(self):
         return self._namespace
 
+    @property
+    def read_only(self):
+        return self._read_only
+
     def __del__(self):
         if self._need_cleanup:
             try:
@@ -189,12 +423,19 @@ class Table(object):
         return self.__str__()
 
     def destroy(self):
+        # avoid releasing shared reference twice when destroy is called explicitly before `__del__`
+        self._need_cleanup = False
+        remaining_refs = _TableRefManager.release(data_dir=self._data_dir, namespace=self._namespace, name=self._name)
+        if remaining_refs is not None and remaining_refs > 0:
+            logger.debug(f"table {self} is still referenced by {remaining_refs} holders, skip destroy")
+            return
         for p in range(self.num_partitions):
             with self._get_env_for_partition(p, write=True) as env:
                 db = env.open_db()
                 with env.begin(write=True) as txn:
                     txn.drop(db)
         _TableMetaManager.destroy_table(data_dir=self._data_dir, namespace=self._namespace, name=self._name)
+        self._session.evict_cached_envs(Path(self._data_dir).joinpath(self._namespace, self._name))
 
     def take(self, num, **kwargs):
         if num <= 0:
@@ -351,7 +592,7 @@ class Table(object):
         self._session._submit_map_reduce_partitions_with_index(
             _do_shuffle_write_func,
             mapper=map_partition_op,
-            reducer=None,
+            reducer=reduce_partition_op,
             input_data_dir=self._data_dir,
             input_num_partitions=self.num_partitions,
             input_name=self._name,
@@ -389,15 +630,7 @@ class Table(object):
             partitioner_type=output_partitioner_type,
         )
 
-        # drop cache table
-        for p in range(self._partitions):
-            with _get_env_with_data_dir(
-                intermediate_data_dir, intermediate_namespace, intermediate_name, str(p), write=True
-            ) as env:
-                db = env.open_db()
-                with env.begin(write=True) as txn:
-                    txn.drop(db)
-
+        # drop shuffle runs
         path = Path(self._data_dir).joinpath(intermediate_namespace, intermediate_name)
         shutil.rmtree(path, ignore_errors=True)
         return output
@@ -420,13 +653,66 @@ class Table(object):
     def _get_env_for_partition(self, p: int, write=False):
         return _get_env_with_data_dir(self._data_dir, self._namespace, self._name, str(p), write=write)
 
+    def share(self, num_refs: int):
+        """
+        add `num_refs` references to this table, storage is kept until every reference is released by `destroy`
+        """
+        return _TableRefManager.acquire(
+            data_dir=self._data_dir, namespace=self._namespace, name=self._name, num_refs=num_refs
+        )
+
+    def save_as(self, name, namespace):
+        """
+        saves the table as a table of its own under `name` and `namespace`, which outlives this table and its session.
+        partitions are copied page by page by lmdb, records are not deserialized or written one by one
+        """
+        if _TableMetaManager.get_table_meta(self._data_dir, namespace, name) is not None:
+            if _TableRefManager.get_refs(self._data_dir, namespace, name):
+                raise RuntimeError(f"table {namespace}.{name} is still referenced, could not save over it")
+            _TableMetaManager.destroy_table(data_dir=self._data_dir, namespace=namespace, name=name)
+            self._session.evict_cached_envs(Path(self._data_dir).joinpath(namespace, name))
+
+        path = Path(self._data_dir).joinpath(namespace, name)
+        for p in range(self.num_partitions):
+            path.joinpath(str(p)).mkdir(parents=True, exist_ok=True)
+            with self._get_env_for_partition(p) as env:
+                env.copy(path.joinpath(str(p)).as_posix(), compact=True)
+        _TableMetaManager.add_table_meta(
+            data_dir=self._data_dir,
+            namespace=namespace,
+            name=name,
+            num_partitions=self.num_partitions,
+            key_serdes_type=self._key_serdes_type,
+            value_serdes_type=self._value_serdes_type,
+            partitioner_type=self._partitioner_type,
+        )
+
+    def _materialize(self):
+        """
+        copies the shared storage a copy-on-write view reads from into a table of its own before the first write
+        """
+        copied = self.copy_as(name=str(uuid.uuid1()), namespace=self._session.session_id, need_cleanup=False)
+        self.destroy()
+        self._namespace, self._name = copied.namespace, copied.name
+        self._copy_on_write = False
+        self._read_only = False
+        self._need_cleanup = True
+
+    def _check_writable(self):
+        if self._copy_on_write:
+            self._materialize()
+        if self._read_only:
+            raise RuntimeError(f"table {self} is read only")
+
     def put(self, k_bytes: bytes, v_bytes: bytes, partitioner: Callable[[bytes, int], int] = None):
+        self._check_writable()
         p = partitioner(k_bytes, self._partitions)
         with self._get_env_for_partition(p, write=True) as env:
             with env.begin(write=True) as txn:
                 return txn.put(k_bytes, v_bytes)
 
     def put_all(self, kv_list: Iterable[Tuple[bytes, bytes]], partitioner: Callable[[bytes, int], int]):
+        self._check_writable()
         txn_map = {}
         with ExitStack() as s:
             for p in range(self._partitions):
@@ -452,6 +738,7 @@ class Table(object):
                 return txn.get(k_bytes)
 
     def delete(self, k_bytes: bytes, partitioner: Callable[[bytes, int], int]):
+        self._check_writable()
         p = partitioner(k_bytes, self._partitions)
         with self._get_env_for_partition(p, write=True) as env:
             with env.begin(write=True) as txn:
@@ -469,28 +756,29 @@ class Session(object):
         data_dir: str,
         max_workers=None,
         logger_config=None,
-        executor_pool_cls=BasicProcessPool,
+        executor_pool_cls=None,
+        shuffle_memory_budget=None,
     ):
         self.session_id = session_id
         self._data_dir = data_dir
         self._max_workers = max_workers
         if self._max_workers is None:
             self._max_workers = os.cpu_count()
+        # bytes each map task may buffer before spilling a sorted shuffle run
+        self._shuffle_memory_budget = shuffle_memory_budget
+        if self._shuffle_memory_budget is None:
+            self._shuffle_memory_budget = _DEFAULT_SHUFFLE_MEMORY_BUDGET
 
         self._enable_process_logger = True
         if self._enable_process_logger:
             log_level = logging.getLevelName(logger.getEffectiveLevel())
         else:
             log_level = None
-        self._pool = executor_pool_cls(
-            pool=Executor(
-                max_workers=max_workers,
-                initializer=_watch_thread_react_to_parent_die,
-                initargs=(
-                    os.getpid(),
-                    logger_config,
-                ),
-            ),
+        if executor_pool_cls is None:
+            executor_pool_cls = PinnedProcessPool
+        self._pool = executor_pool_cls.create(
+            max_workers=max_workers,
+            logger_config=logger_config,
             log_level=log_level,
         )
 
@@ -506,8 +794,25 @@ class Session(object):
         # session won't be pickled
         pass
 
-    def load(self, name, namespace):
-        return _load_table(session=self, data_dir=self._data_dir, name=name, namespace=namespace)
+    def load(self, name, namespace, copy_on_write=False):
+        """
+        with `copy_on_write`, returns a view of the table's storage holding a reference to it,
+        the storage is copied into the session only if the view is written
+        """
+        if not copy_on_write:
+            return _load_table(session=self, data_dir=self._data_dir, name=name, namespace=namespace)
+
+        table = _load_table(
+            session=self,
+            data_dir=self._data_dir,
+            name=name,
+            namespace=namespace,
+            need_cleanup=True,
+            read_only=True,
+            copy_on_write=True,
+        )
+        table.share(1)
+        return table
 
     def create_table(
         self,
@@ -557,6 +862,68 @@ class Session(object):
         table.put_all(data, partitioner=partitioner)
         return table
 
+    def ingest(
+        self,
+        reader: Callable[[Any], Iterable[Tuple[bytes, bytes]]],
+        splits: List[Any],
+        partition: int,
+        partitioner: Callable[[bytes, int], int],
+        key_serdes_type,
+        value_serdes_type,
+        partitioner_type,
+    ):
+        """
+        builds a table from external data, `reader(split)` yields the serialized records of a split.
+
+        splits are read in parallel by the pool and shuffled to the partitions of the table,
+        each partition is then written by one worker. Keys are expected to be unique.
+        """
+        name = str(uuid.uuid1())
+        intermediate_name = str(uuid.uuid1())
+        intermediate_info = _TaskOutputInfo(
+            self._data_dir,
+            self.session_id,
+            intermediate_name,
+            partition,
+            partitioner=partitioner,
+            shuffle_memory_budget=self._shuffle_memory_budget,
+        )
+        reader_info = _SplitReaderFunctorInfo(reader)
+        # Step 1: read splits and write sorted shuffle runs
+        self._submit_process(
+            _do_split_read_and_shuffle_write,
+            [
+                _SplitReadProcess(partition_id=p, split=split, output_info=intermediate_info, reader_info=reader_info)
+                for p, split in enumerate(splits)
+            ],
+        )
+        # Step 2: merge shuffle runs into partitions
+        self._submit_map_reduce_partitions_with_index(
+            _do_mrwi_shuffle_read_no_reduce,
+            mapper=None,
+            reducer=None,
+            input_data_dir=self._data_dir,
+            input_num_partitions=len(splits),
+            input_name=intermediate_name,
+            input_namespace=self.session_id,
+            output_data_dir=self._data_dir,
+            output_num_partitions=partition,
+            output_name=name,
+            output_namespace=self.session_id,
+        )
+        shutil.rmtree(Path(self._data_dir).joinpath(self.session_id, intermediate_name), ignore_errors=True)
+        return _create_table(
+            session=self,
+            data_dir=self._data_dir,
+            name=name,
+            namespace=self.session_id,
+            partitions=partition,
+            need_cleanup=True,
+            key_serdes_type=key_serdes_type,
+            value_serdes_type=value_serdes_type,
+            partitioner_type=partitioner_type,
+        )
+
     def cleanup(self, name, namespace):
         path = Path(self._data_dir)
         if not path.is_dir():
@@ -564,11 +931,19 @@ class Session(object):
         namespace_dir = path.joinpath(namespace)
         if not namespace_dir.is_dir():
             return
-        if name == "*":
-            shutil.rmtree(namespace_dir, True)
-            return
+        # storage still referenced by shared tables or loaded by other sessions is kept
+        shared = False
         for table in namespace_dir.glob(name):
+            if _TableRefManager.get_refs(self._data_dir, namespace, table.name):
+                shared = True
+                continue
             shutil.rmtree(table, True)
+            self.evict_cached_envs(table)
+        if name == "*" and not shared:
+            shutil.rmtree(namespace_dir, True)
+
+    def evict_cached_envs(self, path: Path):
+        self._pool.evict_cached_envs(path)
 
     def stop(self):
         self.cleanup(name="*", namespace=self.session_id)
@@ -611,7 +986,12 @@ class Session(object):
     ):
         input_info = _TaskInputInfo(input_data_dir, input_namespace, input_name, input_num_partitions)
         output_info = _TaskOutputInfo(
-            output_data_dir, output_namespace, output_name, output_num_partitions, partitioner=output_partitioner
+            output_data_dir,
+            output_namespace,
+            output_name,
+            output_num_partitions,
+            partitioner=output_partitioner,
+            shuffle_memory_budget=self._shuffle_memory_budget,
         )
         return self._submit_process(
             _do_func,
@@ -688,14 +1068,16 @@ class Federation(object):
         return federation
 
     def destroy(self):
+        self._meta.close()
         self._session.cleanup(namespace=self._session_id, name="*")
 
-    def push_table(self, table, name: str, tag: str, parties: List[PartyMeta]):
+    def push_table(self, table: Table, name: str, tag: str, parties: List[PartyMeta]):
+        # parties open the pushed table itself instead of a copy,
+        # each of them holds a reference which is released when its table handle is destroyed
+        table.share(len(parties))
         for party in parties:
             _tagged_key = self._federation_object_key(name, tag, self._party, party)
-            saved_name = str(uuid.uuid1())
-            _table = table.copy_as(name=saved_name, namespace=table.namespace, need_cleanup=False)
-            self._meta.set_status(party, _tagged_key, _serialize_tuple_of_str(_table.name, _table.namespace))
+            self._meta.set_status(party, _tagged_key, _serialize_tuple_of_str(table.name, table.namespace))
 
     def push_bytes(self, v: bytes, name: str, tag: str, parties: List[PartyMeta]):
         for party in parties:
@@ -714,7 +1096,12 @@ class Federation(object):
         for r in results:
             name, namespace = _deserialize_tuple_of_str(self._meta.get_status(r))
             table: Table = _load_table(
-                session=self._session, data_dir=self._data_dir, name=name, namespace=namespace, need_cleanup=True
+                session=self._session,
+                data_dir=self._data_dir,
+                name=name,
+                namespace=namespace,
+                need_cleanup=True,
+                read_only=True,
             )
             rtn.append(table)
             self._meta.ack_status(r)
@@ -774,7 +1161,9 @@ def _create_table(
     )
 
 
-def _load_table(session, data_dir: str, name: str, namespace: str, need_cleanup=False):
+def _load_table(
+    session, data_dir: str, name: str, namespace: str, need_cleanup=False, read_only=False, copy_on_write=False
+):
     table_meta = _TableMetaManager.get_table_meta(data_dir, namespace, name)
     if table_meta is None:
         raise RuntimeError(f"table not exist: name={name}, namespace={namespace}")
@@ -784,6 +1173,8 @@ def _load_table(session, data_dir: str, name: str, namespace: str, need_cleanup=
         namespace=namespace,
         name=name,
         need_cleanup=need_cleanup,
+        read_only=read_only,
+        copy_on_write=copy_on_write,
         partitions=table_meta.num_partitions,
         key_serdes_type=table_meta.key_serdes_type,
         value_serdes_type=table_meta.value_serdes_type,
@@ -803,12 +1194,21 @@ class _TaskInputInfo:
 
 
 class _TaskOutputInfo:
-    def __init__(self, data_dir: str, namespace: str, name: str, num_partitions: int, partitioner):
+    def __init__(
+        self,
+        data_dir: str,
+        namespace: str,
+        name: str,
+        num_partitions: int,
+        partitioner,
+        shuffle_memory_budget: int = None,
+    ):
         self.data_dir = data_dir
         self.namespace = namespace
         self.name = name
         self.num_partitions = num_partitions
         self.partitioner = partitioner
+        self.shuffle_memory_budget = shuffle_memory_budget
 
     def get_env(self, pid, write=True):
         return _get_env_with_data_dir(self.data_dir, self.namespace, self.name, str(pid), write=write)
@@ -833,12 +1233,12 @@ class _MapReduceFunctorInfo:
     def get_mapper(self):
         if self.mapper_bytes is None:
             raise RuntimeError("mapper is None")
-        return f_pickle.loads(self.mapper_bytes)
+        return _loads_functor(self.mapper_bytes)
 
     def get_reducer(self):
         if self.reducer_bytes is None:
             raise RuntimeError("reducer is None")
-        return f_pickle.loads(self.reducer_bytes)
+        return _loads_functor(self.reducer_bytes)
 
 
 class _BinarySortedMapFunctorInfo:
@@ -851,7 +1251,15 @@ class _BinarySortedMapFunctorInfo:
     def get_mapper(self):
         if self.mapper_bytes is None:
             raise RuntimeError("mapper is None")
-        return f_pickle.loads(self.mapper_bytes)
+        return _loads_functor(self.mapper_bytes)
+
+
+class _SplitReaderFunctorInfo:
+    def __init__(self, reader):
+        self.reader_bytes = f_pickle.dumps(reader)
+
+    def get_reader(self):
+        return _loads_functor(self.reader_bytes)
 
 
 class _ReduceFunctorInfo:
@@ -864,7 +1272,7 @@ class _ReduceFunctorInfo:
     def get_reducer(self):
         if self.reducer_bytes is None:
             raise RuntimeError("reducer is None")
-        return f_pickle.loads(self.reducer_bytes)
+        return _loads_functor(self.reducer_bytes)
 
 
 class _ReduceProcess:
@@ -938,6 +1346,29 @@ class _MapReduceProcess:
         return self.operator_info.get_reducer()
 
 
+class _SplitReadProcess:
+    def __init__(
+        self,
+        partition_id: int,
+        split,
+        output_info: _TaskOutputInfo,
+        reader_info: _SplitReaderFunctorInfo,
+    ):
+        self.partition_id = partition_id
+        self.split = split
+        self.output_info = output_info
+        self.reader_info = reader_info
+
+    def get_output_partition_num(self):
+        return self.output_info.num_partitions
+
+    def get_output_partition_id(self, key: bytes):
+        return self.output_info.get_partition_id(key)
+
+    def get_reader(self):
+        return self.reader_info.get_reader()
+
+
 class _BinarySortedMapProcess:
     def __init__(
         self,
@@ -1002,6 +1433,12 @@ def _get_env_with_data_dir(data_dir: str, *args, write=False):
 
 
 def _open_env(path, write=False):
+    if _worker_env_cache is not None:
+        return _worker_env_cache.get(path, write=write)
+    return _open_env_uncached(path, write=write)
+
+
+def _open_env_uncached(path, write=False):
     path.mkdir(parents=True, exist_ok=True)
 
     t = 0
@@ -1056,22 +1493,82 @@ def _do_binary_sorted_map_with_index(p: _BinarySortedMapProcess):
         return rtn
 
 
-def _serialize_shuffle_write_key(iteration_index: int, k_bytes: bytes) -> bytes:
-    iteration_bytes = iteration_index.to_bytes(4, "big")  # 4 bytes for the iteration index
-    serialized_key = iteration_bytes + k_bytes
+_SHUFFLE_RECORD_HEADER = struct.Struct("<II")
+# rough per-record overhead of python dict entry and bytes objects, used for memory budget estimation
+_SHUFFLE_RECORD_OVERHEAD = 128
 
-    return serialized_key
 
+def _get_shuffle_run_path(output_info: "_TaskOutputInfo", source_partition_id: int, destination_partition_id: int):
+    return Path(output_info.data_dir).joinpath(
+        output_info.namespace, output_info.name, f"{source_partition_id}_{destination_partition_id}"
+    )
 
-def _deserialize_shuffle_write_key(serialized_key: bytes) -> (int, int, bytes):
-    iteration_bytes = serialized_key[:4]
-    k_bytes = serialized_key[4:]
-    iteration_index = int.from_bytes(iteration_bytes, "big")
-    return iteration_index, k_bytes
 
+class _ShuffleWriter:
+    """
+    map side of the shuffle: records are combined in memory per destination partition,
+    then written out as key-sorted runs with pure sequential writes.
 
-def _get_shuffle_partition_id(shuffle_source_partition_id: int, shuffle_destination_partition_id: int) -> str:
-    return f"{shuffle_source_partition_id}_{shuffle_destination_partition_id}"
+    A run is spilled every time the estimated buffered size exceeds `memory_budget`.
+    Without reducer, the first value of a key in this source partition wins.
+    """
+
+    def __init__(self, p: "_MapReduceProcess", reducer):
+        self._p = p
+        self._reducer = reducer
+        self._memory_budget = p.output_info.shuffle_memory_budget
+        self._buckets = [{} for _ in range(p.get_output_partition_num())]
+        self._size = 0
+        self._num_runs = 0
+
+    def write(self, k_bytes: bytes, v_bytes: bytes):
+        bucket = self._buckets[self._p.get_output_partition_id(k_bytes)]
+        if (old := bucket.get(k_bytes)) is None:
+            bucket[k_bytes] = v_bytes
+            self._size += len(k_bytes) + len(v_bytes) + _SHUFFLE_RECORD_OVERHEAD
+        elif self._reducer is not None:
+            bucket[k_bytes] = reduced = self._reducer(old, v_bytes)
+            # combined values may grow, e.g. when the reducer collects values into a list
+            self._size += len(reduced) - len(old)
+        if self._size > self._memory_budget:
+            self.spill()
+
+    def spill(self):
+        for destination_partition_id, bucket in enumerate(self._buckets):
+            if not bucket:
+                continue
+            path = _get_shuffle_run_path(self._p.output_info, self._p.partition_id, destination_partition_id)
+            path.mkdir(parents=True, exist_ok=True)
+            with open(path.joinpath(str(self._num_runs)), "wb") as f:
+                for k_bytes in sorted(bucket):
+                    v_bytes = bucket[k_bytes]
+                    f.write(_SHUFFLE_RECORD_HEADER.pack(len(k_bytes), len(v_bytes)))
+                    f.write(k_bytes)
+                    f.write(v_bytes)
+            bucket.clear()
+        self._num_runs += 1
+        self._size = 0
+
+
+def _iter_shuffle_run(path: Path, source_partition_id: int):
+    with open(path, "rb") as f:
+        while header := f.read(_SHUFFLE_RECORD_HEADER.size):
+            k_len, v_len = _SHUFFLE_RECORD_HEADER.unpack(header)
+            yield f.read(k_len), source_partition_id, f.read(v_len)
+
+
+def _iter_shuffle_read(p: "_MapReduceProcess"):
+    """
+    merge the sorted runs of all source partitions, records with same key are yielded
+    in order of (source partition, run)
+    """
+    runs = []
+    for source_partition_id in range(p.get_input_partition_num()):
+        path = _get_shuffle_run_path(p.input_info, source_partition_id, p.partition_id)
+        if path.is_dir():
+            for run_path in sorted(path.iterdir(), key=lambda x: int(x.name)):
+                runs.append(_iter_shuffle_run(run_path, source_partition_id))
+    return itertools.groupby(heapq.merge(*runs, key=itemgetter(0)), key=itemgetter(0))
 
 
 def _do_mrwi_map_and_shuffle_write(p: _MapReduceProcess):
@@ -1079,16 +1576,10 @@ def _do_mrwi_map_and_shuffle_write(p: _MapReduceProcess):
     if p.has_partition(p.partition_id):
         with ExitStack() as s:
             cursor = p.get_input_cursor(s)
-            shuffle_write_txn_map = {}
-            for output_partition_id in range(p.get_output_partition_num()):
-                shuffle_partition_id = _get_shuffle_partition_id(p.partition_id, output_partition_id)
-                shuffle_write_txn_map[output_partition_id] = p.get_output_transaction(shuffle_partition_id, s)
-
-            output_kv_iter = p.get_mapper()(p.partition_id, _generator_from_cursor(cursor))
-            for index, (k_bytes, v_bytes) in enumerate(output_kv_iter):
-                shuffle_write_txn_map[p.get_output_partition_id(k_bytes)].put(
-                    _serialize_shuffle_write_key(index, k_bytes), v_bytes, overwrite=False
-                )
+            writer = _ShuffleWriter(p, p.get_reducer())
+            for k_bytes, v_bytes in p.get_mapper()(p.partition_id, _generator_from_cursor(cursor)):
+                writer.write(k_bytes, v_bytes)
+            writer.spill()
     return rtn
 
 
@@ -1097,55 +1588,64 @@ def _do_mrwi_map_and_shuffle_write_unique(p: _MapReduceProcess):
     if p.has_partition(p.partition_id):
         with ExitStack() as s:
             cursor = p.get_input_cursor(s)
-            shuffle_write_txn_map = {}
-            for output_partition_id in range(p.get_output_partition_num()):
-                shuffle_partition_id = _get_shuffle_partition_id(p.partition_id, output_partition_id)
-                shuffle_write_txn_map[output_partition_id] = p.get_output_transaction(shuffle_partition_id, s)
-
-            output_kv_iter = p.get_mapper()(p.partition_id, _generator_from_cursor(cursor))
-            for k_bytes, v_bytes in output_kv_iter:
-                shuffle_write_txn_map[p.get_output_partition_id(k_bytes)].put(k_bytes, v_bytes, overwrite=False)
+            writer = _ShuffleWriter(p, None)
+            for k_bytes, v_bytes in p.get_mapper()(p.partition_id, _generator_from_cursor(cursor)):
+                writer.write(k_bytes, v_bytes)
+            writer.spill()
+    return rtn
+
+
+def _do_split_read_and_shuffle_write(p: _SplitReadProcess):
+    rtn = p.output_info
+    # noinspection PyTypeChecker
+    writer = _ShuffleWriter(p, None)
+    for k_bytes, v_bytes in p.get_reader()(p.split):
+        writer.write(k_bytes, v_bytes)
+    writer.spill()
     return rtn
 
 
 def _do_mrwi_shuffle_read_and_reduce(p: _MapReduceProcess):
     rtn = p.output_info
+    if p.partition_id >= p.get_output_partition_num():
+        return rtn
     reducer = p.get_reducer()
     with ExitStack() as s:
         dst_txn = p.get_output_transaction(p.partition_id, s)
-        for input_partition_id in range(p.get_input_partition_num()):
-            for k_bytes, v_bytes in p.get_input_cursor(
-                s, pid=_get_shuffle_partition_id(input_partition_id, p.partition_id)
-            ):
-                _, key = _deserialize_shuffle_write_key(k_bytes)
-                if (old := dst_txn.get(key)) is None:
-                    dst_txn.put(key, v_bytes)
-                else:
-                    dst_txn.put(key, reducer(old, v_bytes))
+        for k_bytes, records in _iter_shuffle_read(p):
+            _, _, value = next(records)
+            for _, _, v_bytes in records:
+                value = reducer(value, v_bytes)
+            dst_txn.put(k_bytes, value)
     return rtn
 
 
 def _do_mrwi_shuffle_read_no_reduce(p: _MapReduceProcess):
     rtn = p.output_info
+    if p.partition_id >= p.get_output_partition_num():
+        return rtn
     with ExitStack() as s:
         dst_txn = p.get_output_transaction(p.partition_id, s)
-        for input_partition_id in range(p.get_input_partition_num()):
-            for k_bytes, v_bytes in p.get_input_cursor(
-                s, pid=_get_shuffle_partition_id(input_partition_id, p.partition_id)
-            ):
-                dst_txn.put(k_bytes, v_bytes)
+        for k_bytes, records in _iter_shuffle_read(p):
+            # the value from last source partition wins, same as writing source partitions in order
+            value, last_source_partition_id = None, -1
+            for _, source_partition_id, v_bytes in records:
+                if source_partition_id != last_source_partition_id:
+                    value, last_source_partition_id = v_bytes, source_partition_id
+            dst_txn.put(k_bytes, value)
     return rtn
 
 
 def _do_reduce(p: _ReduceProcess):
     value = None
+    reducer = p.get_reducer()
     with ExitStack() as s:
         cursor = p.input_cursor(s)
         for _, v_bytes in cursor:
             if value is None:
                 value = v_bytes
             else:
-                value = p.get_reducer()(value, v_bytes)
+                value = reducer(value, v_bytes)
     return value
 
 
@@ -1153,16 +1653,30 @@ class _FederationMetaManager:
     STATUS_TABLE_NAME_PREFIX = "__federation_status__"
     OBJECT_TABLE_NAME_PREFIX = "__federation_object__"
 
-    def __init__(self, data_dir: str, session_id, party: Tuple[str, str]) -> None:
+    def __init__(self, data_dir: str, session_id, party: Tuple[str, str], notify=True) -> None:
         self.session_id = session_id
         self.party = party
         self._data_dir = data_dir
         self._env = {}
+        # federation may be accessed from several threads, e.g. `Parties.gather`
+        self._env_lock = threading.Lock()
+        self._notifier = None
+        if notify and _FederationNotifier.is_supported():
+            self._notifier = _FederationNotifier.acquire(data_dir=data_dir, session_id=session_id, party=party)
 
     def wait_status_set(self, key: bytes) -> bytes:
+        if self._notifier is None:
+            value = self.get_status(key)
+            while value is None:
+                time.sleep(0.001)
+                value = self.get_status(key)
+            return key
+
+        # take the generation before checking so that a notification between check and wait is not lost
+        generation = self._notifier.generation
         value = self.get_status(key)
         while value is None:
-            time.sleep(0.001)
+            generation = self._notifier.wait(generation)
             value = self.get_status(key)
         return key
 
@@ -1170,7 +1684,10 @@ class _FederationMetaManager:
         return self._get(self._get_status_table_name(self.party), key)
 
     def set_status(self, party: Tuple[str, str], key: bytes, value: bytes):
-        return self._set(self._get_status_table_name(party), key, value)
+        rtn = self._set(self._get_status_table_name(party), key, value)
+        if self._notifier is not None:
+            self._notifier.notify(party)
+        return rtn
 
     def ack_status(self, key: bytes):
         return self._ack(self._get_status_table_name(self.party), key)
@@ -1184,6 +1701,15 @@ class _FederationMetaManager:
     def ack_object(self, key: bytes):
         return self._ack(self._get_object_table_name(self.party), key)
 
+    def close(self):
+        if self._notifier is not None:
+            self._notifier.release()
+            self._notifier = None
+        with self._env_lock:
+            for path in self._env:
+                _federation_env_registry.release(path, lambda env: env.close())
+            self._env.clear()
+
     def _get_status_table_name(self, party: Tuple[str, str]):
         return f"{self.STATUS_TABLE_NAME_PREFIX}.{party[0]}_{party[1]}"
 
@@ -1191,9 +1717,15 @@ class _FederationMetaManager:
         return f"{self.OBJECT_TABLE_NAME_PREFIX}.{party[0]}_{party[1]}"
 
     def _get_env(self, name):
-        if name not in self._env:
-            self._env[name] = _get_env_with_data_dir(self._data_dir, self.session_id, name, str(0), write=True)
-        return self._env[name]
+        path = Path(self._data_dir).joinpath(self.session_id, name, str(0))
+        if path not in self._env:
+            with self._env_lock:
+                if path not in self._env:
+                    # lmdb refuses to open an env twice in one process, parties in the same process share it
+                    self._env[path] = _federation_env_registry.acquire(
+                        path, lambda: _open_env_uncached(path, write=True)
+                    )
+        return self._env[path]
 
     def _get(self, name: str, key: bytes) -> bytes:
         env = self._get_env(name)
@@ -1211,6 +1743,152 @@ class _FederationMetaManager:
             txn.delete(key)
 
 
+class _FederationNotifier:
+    """
+    wakes up `wait_status_set` of the receiving party as soon as the status is set.
+
+    each party listens on a unix datagram socket derived from (data_dir, session_id, party),
+    senders write a datagram to the socket of the destination party after setting the status.
+    notifications only trigger a re-check of the status table, so a missed or dropped one costs
+    at most `fallback_timeout` seconds.
+    """
+
+    fallback_timeout = 0.1
+
+    def __init__(self, data_dir: str, session_id: str, party: Tuple[str, str]):
+        self._data_dir = data_dir
+        self._session_id = session_id
+        self._key = (data_dir, session_id, party)
+        self._path = self._get_socket_path(party)
+        self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._send_sock.setblocking(False)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        if os.path.exists(self._path):
+            if self._is_live():
+                self._sock.close()
+                self._send_sock.close()
+                raise RuntimeError(f"notify socket {self._path} is in use by another process")
+            os.unlink(self._path)
+        self._sock.bind(self._path)
+
+        # only one thread reads the socket at a time, others wait for the generation to change
+        self._cond = threading.Condition()
+        self._reading = False
+        self._generation = 0
+
+    @classmethod
+    def acquire(cls, data_dir: str, session_id: str, party: Tuple[str, str]) -> Optional["_FederationNotifier"]:
+        """
+        returns the notifier of the party shared in this process, or None if another process listens for the party
+        """
+        try:
+            return _federation_notifier_registry.acquire(
+                (data_dir, session_id, party), lambda: cls(data_dir=data_dir, session_id=session_id, party=party)
+            )
+        except RuntimeError as e:
+            logger.warning(f"{e}, fallback to polling")
+            return None
+
+    def release(self):
+        _federation_notifier_registry.release(self._key, lambda notifier: notifier.close())
+
+    def _is_live(self):
+        try:
+            self._send_sock.sendto(b"\x00", self._path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+        except BlockingIOError:
+            pass
+        # a spurious notification only triggers a re-check on the listener
+        return True
+
+    @staticmethod
+    def is_supported():
+        return hasattr(socket, "AF_UNIX")
+
+    def _get_socket_path(self, party: Tuple[str, str]):
+        # unix socket path is limited to ~100 bytes, so hash the identity into the temp dir
+        digest = hashlib.sha1(f"{self._data_dir}|{self._session_id}|{party[0]}|{party[1]}".encode("utf-8"))
+        return os.path.join(tempfile.gettempdir(), f"fate_federation_{digest.hexdigest()[:16]}.sock")
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def notify(self, party: Tuple[str, str]):
+        try:
+            self._send_sock.sendto(b"\x00", self._get_socket_path(party))
+        except (FileNotFoundError, ConnectionRefusedError, BlockingIOError):
+            # receiver is not waiting yet or already has pending notifications
+            pass
+
+    def wait(self, generation: int) -> int:
+        """
+        block until a notification arrives after `generation` or fallback timeout, return the new generation
+        """
+        with self._cond:
+            if self._generation != generation:
+                return self._generation
+            if self._reading:
+                self._cond.wait(self.fallback_timeout)
+                return self._generation
+            self._reading = True
+        try:
+            self._sock.settimeout(self.fallback_timeout)
+            try:
+                self._sock.recv(16)
+                # drain pending notifications, one re-check serves all of them
+                self._sock.setblocking(False)
+                while True:
+                    self._sock.recv(16)
+            except (socket.timeout, BlockingIOError):
+                pass
+        finally:
+            with self._cond:
+                self._reading = False
+                self._generation += 1
+                self._cond.notify_all()
+        return self._generation
+
+    def close(self):
+        self._sock.close()
+        self._send_sock.close()
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+
+class _ProcessSharedRegistry:
+    """
+    resources shared by all users in the process, created on first acquire and closed on last release
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = {}
+
+    def acquire(self, key, create: Callable[[], Any]):
+        with self._lock:
+            item, refs = self._items.get(key, (None, 0))
+            if refs == 0:
+                item = create()
+            self._items[key] = (item, refs + 1)
+            return item
+
+    def release(self, key, close: Callable[[Any], None]):
+        with self._lock:
+            item, refs = self._items.pop(key)
+            if refs > 1:
+                self._items[key] = (item, refs - 1)
+            else:
+                close(item)
+
+
+_federation_env_registry = _ProcessSharedRegistry()
+_federation_notifier_registry = _ProcessSharedRegistry()
+
+
 def _hash_namespace_name_to_partition(namespace: str, name: str, partitions: int) -> Tuple[bytes, int]:
     k_bytes = f"{name}.{namespace}".encode("utf-8")
     partition_id = int.from_bytes(hashlib.sha256(k_bytes).digest(), "big") % partitions
@@ -1222,12 +1900,17 @@ class _TableMetaManager:
     name = "fragments"
     num_partitions = 11
     _env = {}
+    _env_lock = threading.Lock()
 
     @classmethod
     def _get_or_create_meta_env(cls, data_dir: str, p):
-        if p not in cls._env:
-            cls._env[p] = _get_env_with_data_dir(data_dir, cls.namespace, cls.name, str(p), write=True)
-        return cls._env[p]
+        if (data_dir, p) not in cls._env:
+            with cls._env_lock:
+                if (data_dir, p) not in cls._env:
+                    cls._env[(data_dir, p)] = _get_env_with_data_dir(
+                        data_dir, cls.namespace, cls.name, str(p), write=True
+                    )
+        return cls._env[(data_dir, p)]
 
     @classmethod
     def _get_meta_env(cls, data_dir: str, namespace: str, name: str):
@@ -1269,6 +1952,67 @@ class _TableMetaManager:
         shutil.rmtree(path, ignore_errors=True)
 
 
+class _TableRefManager:
+    """
+    reference counts of tables shared between parties, stored in lmdb so that they are
+    consistent across processes. tables never shared have no record.
+    """
+
+    namespace = "__META__"
+    name = "refs"
+    _env = {}
+    _env_lock = threading.Lock()
+
+    @classmethod
+    def _get_env(cls, data_dir: str, create=True):
+        if data_dir not in cls._env:
+            # sessions that never share a table do not create the store just to look up references
+            if not create and not Path(data_dir).joinpath(cls.namespace, cls.name).exists():
+                return None
+            with cls._env_lock:
+                if data_dir not in cls._env:
+                    cls._env[data_dir] = _get_env_with_data_dir(data_dir, cls.namespace, cls.name, str(0), write=True)
+        return cls._env[data_dir]
+
+    @classmethod
+    def acquire(cls, data_dir: str, namespace: str, name: str, num_refs: int) -> int:
+        k_bytes = f"{name}.{namespace}".encode("utf-8")
+        with cls._get_env(data_dir).begin(write=True) as txn:
+            refs_bytes = txn.get(k_bytes)
+            # the first share accounts for the owner's handle as well
+            refs = 1 if refs_bytes is None else int.from_bytes(refs_bytes, "big")
+            refs += num_refs
+            txn.put(k_bytes, refs.to_bytes(8, "big"))
+            return refs
+
+    @classmethod
+    def get_refs(cls, data_dir: str, namespace: str, name: str) -> int:
+        k_bytes = f"{name}.{namespace}".encode("utf-8")
+        env = cls._get_env(data_dir, create=False)
+        if env is None:
+            return 0
+        with env.begin(write=False) as txn:
+            refs_bytes = txn.get(k_bytes)
+            return 0 if refs_bytes is None else int.from_bytes(refs_bytes, "big")
+
+    @classmethod
+    def release(cls, data_dir: str, namespace: str, name: str) -> Optional[int]:
+        k_bytes = f"{name}.{namespace}".encode("utf-8")
+        env = cls._get_env(data_dir, create=False)
+        if env is None:
+            return None
+        with env.begin(write=True) as txn:
+            refs_bytes = txn.get(k_bytes)
+            if refs_bytes is None:
+                return None
+            refs = int.from_bytes(refs_bytes, "big") - 1
+            if refs <= 0:
+                txn.delete(k_bytes)
+            else:
+                txn.put(k_bytes, refs.to_bytes(8, "big"))
+            return refs
+
+
 class _TableMeta:
     def __init__(self, num_partitions: int, key_serdes_type: int, value_serdes_type: int, partitioner_type: int):
         self.num_partitions = num_partitions
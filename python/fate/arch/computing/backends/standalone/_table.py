@@ -126,8 +126,4 @@ class Table(KVTable):
             *database, namespace, name = uri.path_splits()
         except Exception as e:
             raise ValueError(f"uri `{uri}` not supported with standalone backend") from e
-        self._table.copy_as(
-            name=name,
-            namespace=namespace,
-            need_cleanup=False,
-        )
+        self._table.save_as(name=name, namespace=namespace)
@@ -84,10 +84,15 @@ class CipherKit:
 
 
 class PHECipherBuilder:
-    def __init__(self, ctx: "Context", kind, key_length) -> None:
+    def __init__(
+        self, ctx: "Context", kind, key_length, obfuscator_pool_size=0, obfuscator_pool_threads=1, num_threads=1
+    ) -> None:
         self.ctx = ctx
         self.kind = kind
         self.key_length = key_length
+        self.obfuscator_pool_size = obfuscator_pool_size
+        self.obfuscator_pool_threads = obfuscator_pool_threads
+        self.num_threads = num_threads
 
     def broadcast(self, src: int = 0, options: typing.Optional[dict] = None, tag: str = "phe_cipher"):
         if src == self.ctx.rank:
@@ -98,15 +103,25 @@ class PHECipherBuilder:
                     p.put(tag, cipher_public)
             return cipher
         else:
-            return self.ctx.parties[src].get(name=tag)
+            cipher_public = self.ctx.parties[src].get(name=tag)
+            # obfuscator pools are local to a party and never sent along with the public key
+            pool_size = (options or {}).get("obfuscator_pool_size", self.obfuscator_pool_size)
+            if pool_size > 0:
+                pool_threads = (options or {}).get("obfuscator_pool_threads", self.obfuscator_pool_threads)
+                cipher_public.get_tensor_encryptor().start_obfuscator_pool(pool_size, pool_threads)
+            num_threads = (options or {}).get("num_threads", self.num_threads)
+            if num_threads != 1:
+                cipher_public.pk.set_num_threads(num_threads)
+            return cipher_public
 
     def setup(self, options: typing.Optional[dict] = None):
         if options is None:
-            kind = self.kind
-            key_size = self.key_length
-        else:
-            kind = options.get("kind", self.kind)
-            key_size = options.get("key_length", self.key_length)
+            options = {}
+        kind = options.get("kind", self.kind)
+        key_size = options.get("key_length", self.key_length)
+        pool_size = options.get("obfuscator_pool_size", self.obfuscator_pool_size)
+        pool_threads = options.get("obfuscator_pool_threads", self.obfuscator_pool_threads)
+        num_threads = options.get("num_threads", self.num_threads)
 
         if kind == "paillier":
             if not cfg.safety.phe.paillier.allow:
@@ -119,7 +134,11 @@ class PHECipherBuilder:
             from fate.arch.tensor.phe import PHETensorCipher
 
             sk, pk, coder = keygen(key_size)
+            sk.set_num_threads(num_threads)
+            pk.set_num_threads(num_threads)
             tensor_cipher = PHETensorCipher.from_raw_cipher(pk, coder, sk, evaluator)
+            if pool_size > 0:
+                tensor_cipher.pk.start_obfuscator_pool(pool_size, pool_threads)
 
             return PHECipher(kind, key_size, pk, sk, evaluator, coder, tensor_cipher, True, True, True)
 
@@ -132,7 +151,11 @@ class PHECipherBuilder:
             from fate.arch.tensor.phe import PHETensorCipher
 
             sk, pk, coder = keygen(key_size)
+            sk.set_num_threads(num_threads)
+            pk.set_num_threads(num_threads)
             tensor_cipher = PHETensorCipher.from_raw_cipher(pk, coder, sk, evaluator)
+            if pool_size > 0:
+                tensor_cipher.pk.start_obfuscator_pool(pool_size, pool_threads)
             return PHECipher(kind, key_size, pk, sk, evaluator, coder, tensor_cipher, False, False, True)
 
         elif kind == "mock":
@@ -13,16 +13,39 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import logging
+import threading
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Tuple, TypeVar, Union
 
 from fate.arch.federation.api import PartyMeta, TableRemotePersistentPickler, TableRemotePersistentUnpickler
-from fate.arch.trace import federation_get_timer, federation_remote_timer
+from fate.arch.trace import federation_get_timer, federation_remote_timer, instrument_thread_pool_executor
 from ._namespace import NS
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+_federation_executor = None
+_federation_executor_lock = threading.Lock()
+
+
+def _get_federation_executor():
+    """
+    executor shared by all async puts and gets, serialization, transfer and deserialization run on it
+    """
+    global _federation_executor
+    if _federation_executor is None:
+        with _federation_executor_lock:
+            if _federation_executor is None:
+                from fate.arch.config import cfg
+
+                _federation_executor = instrument_thread_pool_executor(
+                    ThreadPoolExecutor(
+                        max_workers=cfg.federation.async_executor.max_workers, thread_name_prefix="federation"
+                    )
+                )
+    return _federation_executor
+
 if typing.TYPE_CHECKING:
     from fate.arch.context import Context
     from fate.arch.federation.api import Federation
@@ -40,6 +63,12 @@ class _KeyedParty:
     def get(self):
         return self._party.get(self._key)
 
+    def put_async(self, value) -> Future:
+        return self._party.put_async(self._key, value)
+
+    def get_async(self):
+        return self._party.get_async(self._key)
+
 
 class Party:
     def __init__(
@@ -99,11 +128,27 @@ class Party:
                 value=v,
                 max_message_size=self.federation.get_default_max_message_size(),
                 num_partitions_of_slice_table=self.federation.get_default_partition_num(),
+                codec=self.federation.get_default_compress_codec(),
+                codec_threshold=self.federation.get_default_compress_threshold(),
             )
 
     def get(self, name: str):
         return _pull(self._ctx, self.federation, name, self.namespace, [self.party])[0]
 
+    def put_async(self, *args, **kwargs) -> Future:
+        """
+        same as `put` but runs in background, the returned future resolves when the value is sent
+
+        Note: the value should not be modified before the future is done
+        """
+        return _get_federation_executor().submit(self.put, *args, **kwargs)
+
+    def get_async(self, name: str) -> Future:
+        """
+        same as `get` but runs in background, the returned future resolves to the received value
+        """
+        return _get_federation_executor().submit(self.get, name)
+
     def get_int(self, name: str):
         ...
 
@@ -165,11 +210,40 @@ class Parties:
                 value=v,
                 max_message_size=self.federation.get_default_max_message_size(),
                 num_partitions_of_slice_table=self.federation.get_default_partition_num(),
+                codec=self.federation.get_default_compress_codec(),
+                codec_threshold=self.federation.get_default_compress_threshold(),
             )
 
     def get(self, name: str):
         return _pull(self._ctx, self.federation, name, self.namespace, [p[1] for p in self.parties])
 
+    def put_async(self, *args, **kwargs) -> Future:
+        """
+        same as `put` but runs in background, the returned future resolves when the value is sent
+
+        Note: the value should not be modified before the future is done
+        """
+        return _get_federation_executor().submit(self.put, *args, **kwargs)
+
+    def get_async(self, name: str) -> List[Future]:
+        """
+        receive `name` from each party concurrently in background
+
+        Returns:
+            one future per party, in the same order as `get`
+        """
+        executor = _get_federation_executor()
+        return [
+            executor.submit(lambda party: _pull(self._ctx, self.federation, name, self.namespace, [party])[0], p[1])
+            for p in self.parties
+        ]
+
+    def gather(self, name: str) -> List:
+        """
+        same as `get` but receives and deserializes values from all parties concurrently
+        """
+        return [future.result() for future in self.get_async(name)]
+
 
 def _push(
     federation: "Federation",
@@ -180,6 +254,8 @@ def _push(
     value,
     max_message_size,
     num_partitions_of_slice_table,
+    codec=None,
+    codec_threshold=0,
 ):
     tag = namespace.federation_tag
     timer = federation_remote_timer(name=name, full_name=name, tag=tag, local=federation.local_party, parties=parties)
@@ -192,6 +268,8 @@ def _push(
         parties,
         max_message_size=max_message_size,
         num_partitions_of_slice_table=num_partitions_of_slice_table,
+        codec=codec,
+        codec_threshold=codec_threshold,
     )
     timer.done()
 
@@ -173,6 +173,12 @@ class DataFrame(object):
             enable_type_align_checking=enable_type_align_checking,
         )
 
+    @auto_trace
+    def apply_block(self, func, columns=None, with_label=False, with_weight=False):
+        from .ops._apply_row import apply_block
+
+        return apply_block(self, func, columns=columns, with_label=with_label, with_weight=with_weight)
+
     @auto_trace
     def create_frame(self, with_label=False, with_weight=False, columns: Union[list, pd.Index] = None) -> "DataFrame":
         if columns is not None and isinstance(columns, pd.Index):
@@ -307,10 +313,10 @@ class DataFrame(object):
         return self.shape[0]
 
     @auto_trace
-    def describe(self, ddof=1, unbiased=False):
+    def describe(self, ddof=1, unbiased=False, q=None, relative_error: float = 1e-4):
         from .ops._stat import describe
 
-        return describe(self, ddof=ddof, unbiased=unbiased)
+        return describe(self, ddof=ddof, unbiased=unbiased, q=q, relative_error=relative_error)
 
     @auto_trace
     def quantile(self, q, relative_error: float = 1e-4):
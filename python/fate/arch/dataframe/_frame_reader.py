@@ -13,17 +13,21 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import functools
+import itertools
 import pandas as pd
-from typing import Union
+from typing import Iterable, Union
 
 
-from .conf.default_config import DATAFRAME_BLOCK_ROW_SIZE
+from .conf.default_config import DATAFRAME_BLOCK_ROW_SIZE, DATAFRAME_READ_CHUNK_SIZE
 from .entity import types
 from ._dataframe import DataFrame
-from .manager import DataManager
+from .manager import BlockType, DataManager
 from fate.arch.trace import auto_trace
 
 
+SPARSE_INPUT_FORMATS = {"tag", "sparse", "svmlight"}
+
+
 class TableReader(object):
     def __init__(
         self,
@@ -72,10 +76,13 @@ class TableReader(object):
         if not isinstance(self._block_row_size, int) or self._block_row_size < 0:
             raise ValueError("block_row_size should be positive integer")
 
+        if self._input_format != "dense" and self._input_format not in SPARSE_INPUT_FORMATS:
+            raise ValueError(f"input_format should be dense or one of {sorted(SPARSE_INPUT_FORMATS)}")
+
     @auto_trace
     def to_frame(self, ctx, table):
-        if self._input_format != "dense":
-            raise ValueError("Only support dense input format in this version.")
+        if self._input_format in SPARSE_INPUT_FORMATS:
+            return self._sparse_format_to_frame(ctx, table)
 
         return self._dense_format_to_frame(ctx, table)
 
@@ -116,6 +123,65 @@ class TableReader(object):
             data_manager=data_manager,
         )
 
+    def _sparse_format_to_frame(self, ctx, table):
+        """
+        each line is `[match_id][,label][,weight],tag[:value],tag[:value]...` splitting by delimiter,
+        header only contains sample_id and the leading meta columns. Features are stored in a single
+        csr block, columns are the distinct tags sorted in numeric order if all of them are numbers.
+        """
+        data_manager = DataManager(block_row_size=self._block_row_size)
+        meta_columns = self._header.split(self._delimiter, -1) if self._header else [self._sample_id_name]
+        meta_columns.remove(self._sample_id_name)
+
+        with_value = self._tag_with_value or self._input_format != "tag"
+        parse_func = functools.partial(
+            _parse_tag_line,
+            delimiter=self._delimiter,
+            meta_num=len(meta_columns),
+            with_value=with_value,
+            tag_value_delimiter=self._tag_value_delimiter,
+        )
+        table = table.mapValues(parse_func)
+
+        tags = table.mapValues(lambda value: set(value[1])).reduce(lambda l_tags, r_tags: l_tags | r_tags)
+        tags = list(tags) if tags else []
+        if all(tag.isdigit() for tag in tags):
+            tags.sort(key=int)
+        else:
+            tags.sort()
+
+        retrieval_index_dict = data_manager.init_from_local_file(
+            sample_id_name=self._sample_id_name,
+            columns=meta_columns + tags,
+            match_id_list=self._match_id_list,
+            match_id_name=self._match_id_name,
+            label_name=self._label_name,
+            weight_name=self._weight_name,
+            label_type=self._label_type,
+            weight_type=self._weight_type,
+            dtype=BlockType.sparse_float32.value,
+            default_type=BlockType.sparse_float32.value,
+        )
+
+        from .ops._indexer import get_partition_order_by_raw_table
+
+        partition_order_mappings = get_partition_order_by_raw_table(table, data_manager.block_row_size)
+        to_block_func = functools.partial(
+            _to_sparse_blocks,
+            data_manager=data_manager,
+            retrieval_index_dict=retrieval_index_dict,
+            partition_order_mappings=partition_order_mappings,
+            tag_offsets=dict(zip(tags, range(len(tags)))),
+        )
+        block_table = table.mapPartitions(to_block_func, use_previous_behavior=False)
+
+        return DataFrame(
+            ctx=ctx,
+            block_table=block_table,
+            partition_order_mappings=partition_order_mappings,
+            data_manager=data_manager,
+        )
+
 
 class ImageReader(object):
     """
@@ -130,7 +196,6 @@ class ImageReader(object):
 
 
 class CSVReader(object):
-    # TODO: fast data read
     def __init__(
         self,
         sample_id_name: Union[None, str] = None,
@@ -145,6 +210,7 @@ class CSVReader(object):
         na_values: Union[None, str, list, dict] = None,
         partition: int = 4,
         block_row_size: int = None,
+        chunk_size: int = None,
     ):
         self._sample_id_name = sample_id_name
         self._match_id_list = match_id_list
@@ -158,11 +224,15 @@ class CSVReader(object):
         self._na_values = na_values
         self._partition = partition
         self._block_row_size = block_row_size if block_row_size is not None else DATAFRAME_BLOCK_ROW_SIZE
+        self._chunk_size = chunk_size if chunk_size is not None else DATAFRAME_READ_CHUNK_SIZE
 
     @auto_trace
     def to_frame(self, ctx, path):
-        # TODO: use table put data instead of read all data
-        df = pd.read_csv(path, delimiter=self._delimiter, na_values=self._na_values)
+        """
+        the file is read `chunk_size` rows at a time and each chunk is written into the computing table
+        before the next one is parsed, so memory is bounded by the chunk size instead of the file size.
+        """
+        chunks = pd.read_csv(path, delimiter=self._delimiter, na_values=self._na_values, chunksize=self._chunk_size)
 
         return PandasReader(
             sample_id_name=self._sample_id_name,
@@ -174,7 +244,7 @@ class CSVReader(object):
             dtype=self._dtype,
             partition=self._partition,
             block_row_size=self._block_row_size,
-        ).to_frame(ctx, df)
+        ).chunks_to_frame(ctx, chunks)
 
 
 class HiveReader(object):
@@ -224,22 +294,27 @@ class PandasReader(object):
         self._dtype = dtype
         self._partition = partition
         self._block_row_size = block_row_size if block_row_size is not None else DATAFRAME_BLOCK_ROW_SIZE
+        self._index_as_sample_id = False
 
         if self._sample_id_name and not self._match_id_name:
             raise ValueError(f"As sample_id {self._sample_id_name} is given, match_id should be given too")
 
     @auto_trace
     def to_frame(self, ctx, df: "pd.DataFrame"):
-        if not self._sample_id_name:
-            self._sample_id_name = types.DEFAULT_SID_NAME
-            df.index.name = self._sample_id_name
-        else:
-            df = df.set_index(self._sample_id_name)
+        return self.chunks_to_frame(ctx, [df])
+
+    def chunks_to_frame(self, ctx, chunks: Iterable["pd.DataFrame"]):
+        """
+        build DataFrame from an iterable of pandas chunks sharing the same columns,
+        rows are put into the computing table chunk by chunk
+        """
+        chunks = iter(chunks)
+        first_chunk = self._set_index(next(chunks))
 
         data_manager = DataManager(block_row_size=self._block_row_size)
         retrieval_index_dict = data_manager.init_from_local_file(
             sample_id_name=self._sample_id_name,
-            columns=df.columns.tolist(),
+            columns=first_chunk.columns.tolist(),
             match_id_list=self._match_id_list,
             match_id_name=self._match_id_name,
             label_name=self._label_name,
@@ -256,7 +331,7 @@ class PandasReader(object):
         if local_role != "local":
             data_manager.fill_anonymous_site_name(site_name=site_name)
 
-        buf = zip(df.index.tolist(), df.values.tolist())
+        buf = self._iter_rows(first_chunk, chunks)
         table = ctx.computing.parallelize(buf, include_key=True, partition=self._partition)
 
         from .ops._indexer import get_partition_order_by_raw_table
@@ -279,6 +354,23 @@ class PandasReader(object):
             data_manager=data_manager,
         )
 
+    def _set_index(self, df: "pd.DataFrame"):
+        if not self._sample_id_name:
+            self._sample_id_name = types.DEFAULT_SID_NAME
+            self._index_as_sample_id = True
+
+        if self._index_as_sample_id:
+            df.index.name = self._sample_id_name
+            return df
+        else:
+            return df.set_index(self._sample_id_name)
+
+    def _iter_rows(self, first_chunk: "pd.DataFrame", chunks: Iterable["pd.DataFrame"]):
+        for chunk in itertools.chain([first_chunk], chunks):
+            if chunk is not first_chunk:
+                chunk = self._set_index(chunk)
+            yield from zip(chunk.index.tolist(), chunk.values.tolist())
+
 
 def _to_blocks(kvs, data_manager=None, retrieval_index_dict=None, partition_order_mappings=None, na_values=None):
     """
@@ -342,3 +434,84 @@ def _to_blocks(kvs, data_manager=None, retrieval_index_dict=None, partition_orde
     if lid % block_row_size:
         converted_blocks = data_manager.convert_to_blocks(splits)
         yield block_id, converted_blocks
+
+
+def _parse_tag_line(line, delimiter=",", meta_num=0, with_value=False, tag_value_delimiter=":"):
+    """
+    returns (meta values, tags, tag values). values of a tag repeated in a line are summed up when the
+    block is built, a tag without value is present or not, so its repeats are dropped here
+    """
+    values = line.split(delimiter, -1)
+    tags, tag_values = [], []
+    for tag in values[meta_num:]:
+        tag = tag.strip()
+        if not tag:
+            continue
+        if with_value:
+            tag, sep, tag_value = tag.partition(tag_value_delimiter)
+            if not sep or not tag:
+                raise ValueError(f"malformed tag `{tag}{sep}{tag_value}`, should be tag{tag_value_delimiter}value")
+            try:
+                tag_values.append(float(tag_value))
+            except ValueError:
+                raise ValueError(f"value of tag `{tag}` should be a number, got `{tag_value}`")
+        elif tag in tags:
+            continue
+        else:
+            tag_values.append(1.0)
+        tags.append(tag)
+
+    return values[:meta_num], tags, tag_values
+
+
+def _to_sparse_blocks(
+    kvs, data_manager=None, retrieval_index_dict=None, partition_order_mappings=None, tag_offsets=None
+):
+    """
+    same as `_to_blocks`, but all features go into the single sparse block as (offsets, values) pairs
+    """
+    block_id = None
+
+    schema = data_manager.schema
+
+    splits = [[] for _ in range(data_manager.block_num)]
+    sample_id_block = data_manager.loc_block(schema.sample_id_name, with_offset=False)
+
+    match_id_block = data_manager.loc_block(schema.match_id_name, with_offset=False) if schema.match_id_name else None
+    match_id_column_index = retrieval_index_dict["match_id_index"]
+
+    label_block = data_manager.loc_block(schema.label_name, with_offset=False) if schema.label_name else None
+    label_column_index = retrieval_index_dict["label_index"]
+
+    weight_block = data_manager.loc_block(schema.weight_name, with_offset=False) if schema.weight_name else None
+    weight_column_index = retrieval_index_dict["weight_index"]
+
+    feature_block = data_manager.loc_block(schema.columns[0], with_offset=False) if len(schema.columns) else None
+
+    block_row_size = data_manager.block_row_size
+
+    lid = 0
+    for key, (meta_values, tags, tag_values) in kvs:
+        if block_id is None:
+            block_id = partition_order_mappings[key]["start_block_id"]
+        lid += 1
+
+        splits[sample_id_block].append(key)
+        if match_id_block:
+            splits[match_id_block].append(meta_values[match_id_column_index])
+        if label_block:
+            splits[label_block].append([meta_values[label_column_index]])
+        if weight_block:
+            splits[weight_block].append([meta_values[weight_column_index]])
+        if feature_block is not None:
+            splits[feature_block].append(([tag_offsets[tag] for tag in tags], tag_values))
+
+        if lid % block_row_size == 0:
+            converted_blocks = data_manager.convert_to_blocks(splits)
+            yield block_id, converted_blocks
+            block_id += 1
+            splits = [[] for _ in range(data_manager.block_num)]
+
+    if lid % block_row_size:
+        converted_blocks = data_manager.convert_to_blocks(splits)
+        yield block_id, converted_blocks
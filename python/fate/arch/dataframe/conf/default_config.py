@@ -15,3 +15,4 @@
 #
 DATAFRAME_BLOCK_ROW_SIZE = 2**7
 BLOCK_COMPRESS_THRESHOLD = 5
+DATAFRAME_READ_CHUNK_SIZE = 2**16
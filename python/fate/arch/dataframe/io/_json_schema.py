@@ -13,15 +13,18 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 FRAME_SCHEME = "fate.arch.dataframe"
+COLUMNAR_FORMAT = "columnar"
+LIST_FORMAT = "list"
 
 
-def build_schema(data):
+def build_schema(data, serialize_format=COLUMNAR_FORMAT):
     meta = data.data_manager.serialize()
 
     built_schema = dict()
     built_schema["schema_meta"] = meta
     built_schema["partition_order_mappings"] = data.partition_order_mappings
     built_schema["type"] = FRAME_SCHEME
+    built_schema["format"] = serialize_format
 
     return built_schema
 
@@ -34,3 +37,8 @@ def parse_schema(schema):
     partition_order_mappings = schema["partition_order_mappings"]
 
     return schema_meta, partition_order_mappings
+
+
+def parse_format(schema):
+    # tables serialized before the columnar format have no format in their schema
+    return schema.get("format", LIST_FORMAT)
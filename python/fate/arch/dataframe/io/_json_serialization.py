@@ -15,24 +15,31 @@
 
 from .._dataframe import DataFrame
 from ..manager import DataManager
-from ._json_schema import build_schema, parse_schema
+from ._json_schema import COLUMNAR_FORMAT, LIST_FORMAT, build_schema, parse_format, parse_schema
 
 
-def _serialize(ctx, data):
+def _serialize(ctx, data, serialize_format=COLUMNAR_FORMAT):
     """
-    index, match_id, label, weight, values
+    columnar: raw buffers of every block, the schema of blocks is kept in DataManager's meta
+    list: rows of index, match_id, label, weight, values
     """
-    schema = build_schema(data)
+    schema = build_schema(data, serialize_format=serialize_format)
 
-    from ..ops._transformer import transform_block_table_to_list
+    from ..ops._transformer import transform_block_table_to_buffers, transform_block_table_to_list
+
+    if serialize_format == COLUMNAR_FORMAT:
+        serialize_data = transform_block_table_to_buffers(data.block_table)
+    elif serialize_format == LIST_FORMAT:
+        serialize_data = transform_block_table_to_list(data.block_table, data.data_manager)
+    else:
+        raise ValueError(f"serialize format should be one of {[COLUMNAR_FORMAT, LIST_FORMAT]}, got {serialize_format}")
 
-    serialize_data = transform_block_table_to_list(data.block_table, data.data_manager)
     serialize_data.schema = schema
     return serialize_data
 
 
-def serialize(ctx, data):
-    return _serialize(ctx, data)
+def serialize(ctx, data, serialize_format=COLUMNAR_FORMAT):
+    return _serialize(ctx, data, serialize_format=serialize_format)
 
 
 def deserialize(ctx, data):
@@ -43,8 +50,11 @@ def deserialize(ctx, data):
     site_name = ctx.local.name
     data_manager.fill_anonymous_site_name(site_name)
 
-    from ..ops._transformer import transform_list_to_block_table
+    from ..ops._transformer import transform_buffers_to_block_table, transform_list_to_block_table
 
-    block_table = transform_list_to_block_table(data, data_manager)
+    if parse_format(data.schema) == COLUMNAR_FORMAT:
+        block_table = transform_buffers_to_block_table(data)
+    else:
+        block_table = transform_list_to_block_table(data, data_manager)
 
     return DataFrame(ctx, block_table, partition_order_mappings, data_manager)
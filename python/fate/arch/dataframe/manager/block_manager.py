@@ -16,6 +16,7 @@
 
 import bisect
 import copy
+import itertools
 import json
 from enum import Enum
 from typing import Dict, List, Tuple, Union
@@ -23,6 +24,7 @@ from typing import Dict, List, Tuple, Union
 import numpy as np
 import pandas as pd
 import torch
+from scipy import sparse as sp
 from fate.arch.tensor.phe._tensor import PHETensor
 
 from .schema_manager import SchemaManager
@@ -37,6 +39,8 @@ class BlockType(str, Enum):
     index = "index"
     phe_tensor = "phe_tensor"
     np_object = "np_object"
+    sparse_int64 = "sparse_int64"
+    sparse_float32 = "sparse_float32"
 
     @staticmethod
     def promote_types(l_type: "BlockType", r_type: "BlockType"):
@@ -67,10 +71,22 @@ class BlockType(str, Enum):
         if self == BlockType.int64:
             return other not in [BlockType.bool, BlockType.int32, BlockType.int64]
 
+        if self == BlockType.sparse_int64:
+            return other in [
+                BlockType.float32,
+                BlockType.float64,
+                BlockType.sparse_float32,
+                BlockType.phe_tensor,
+                BlockType.np_object,
+            ]
+
         if self == BlockType.float32:
-            return other in [BlockType.float64, BlockType.phe_tensor, BlockType.np_object]
+            return other in [BlockType.float64, BlockType.sparse_float32, BlockType.phe_tensor, BlockType.np_object]
 
         if self == BlockType.float64:
+            return other in [BlockType.sparse_float32, BlockType.phe_tensor, BlockType.np_object]
+
+        if self == BlockType.sparse_float32:
             return other in [BlockType.phe_tensor, BlockType.np_object]
 
         return False
@@ -85,6 +101,8 @@ class BlockType(str, Enum):
     def get_block_type(data_type):
         if isinstance(data_type, PHETensor) or type(data_type) == PHETensor:
             return BlockType.phe_tensor
+        if sp.issparse(data_type):
+            return BlockType.sparse_int64 if np.issubdtype(data_type.dtype, np.integer) else BlockType.sparse_float32
         if hasattr(data_type, "dtype"):
             data_type = data_type.dtype
         if hasattr(data_type, "name"):
@@ -120,6 +138,10 @@ class BlockType(str, Enum):
     def is_integer(block_type):
         return block_type in [BlockType.int32, BlockType.int64]
 
+    @staticmethod
+    def is_sparse(block_type):
+        return block_type in [BlockType.sparse_int64, BlockType.sparse_float32]
+
     @staticmethod
     def is_arr(block_value):
         if isinstance(block_value, (torch.Tensor, np.ndarray)) and block_value.shape:
@@ -213,6 +235,9 @@ class Block(object):
     def is_phe_tensor(self):
         return self._block_type == BlockType.phe_tensor
 
+    def is_sparse(self):
+        return BlockType.is_sparse(self._block_type)
+
     def to_dict(self):
         return dict(
             block_type=json.dumps(self._block_type),
@@ -247,6 +272,10 @@ class Block(object):
             return IndexBlock
         elif block_type == block_type.phe_tensor:
             return PHETensorBlock
+        elif block_type == block_type.sparse_int64:
+            return SparseInt64Block
+        elif block_type == block_type.sparse_float32:
+            return SparseFloat32Block
         else:
             return NPObjectBlock
 
@@ -259,22 +288,67 @@ class Block(object):
 
         return converted_block
 
-    # @classmethod
-    # def retrieval_row(cls, block, indexes):
-    #     if isinstance(block, CiphertextVector):
-    #         return block.slice_indexes(indexes)
-    #     elif isinstance(block, pd.Index):
-    #         if isinstance(indexes, list):
-    #             return block[indexes]
-    #         else:
-    #             return pd.Index(block[indexes])
-    #     else:
-    #         return block[indexes]
+    @classmethod
+    def retrieval_row(cls, block, indexes):
+        """
+        gathers the rows at positions `indexes` (an int array) of a block, keeping its type
+        """
+        if isinstance(block, pd.Index):
+            return block[indexes]
+        elif isinstance(block, torch.Tensor):
+            return block[torch.as_tensor(indexes, dtype=torch.int64)]
+        elif isinstance(block, np.ndarray) or sp.issparse(block):
+            return block[indexes]
+        else:
+            raise ValueError(f"Not implemented block retrieval_row for type {type(block)}")
 
     @classmethod
     def transform_block_to_list(cls, block):
         return block.tolist()
 
+    @classmethod
+    def to_buffer(cls, block):
+        """
+        columnar form of a block for persistence: (kind, dtype, shape, raw buffers)
+        """
+        if isinstance(block, pd.Index):
+            arr = np.asarray(block, dtype=str)
+            return "index", arr.dtype.str, arr.shape, [arr.tobytes()]
+        elif isinstance(block, torch.Tensor):
+            arr = block.detach().contiguous().numpy()
+            return "tensor", arr.dtype.str, arr.shape, [arr.tobytes()]
+        elif sp.issparse(block):
+            block = sp.csr_matrix(block)
+            buffers = [
+                block.data.tobytes(),
+                block.indices.astype(np.int64).tobytes(),
+                block.indptr.astype(np.int64).tobytes(),
+            ]
+            return "csr", block.dtype.str, block.shape, buffers
+        else:
+            # object arrays and ciphertexts have no raw buffer, they are left to the serdes of the table
+            return "object", None, None, block
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        kind, dtype, shape, buffers = buffer
+        if kind == "object":
+            return buffers
+        elif kind == "csr":
+            data, indices, indptr = [
+                np.frombuffer(buf, dtype=buf_dtype).copy()
+                for buf, buf_dtype in zip(buffers, [dtype, np.int64, np.int64])
+            ]
+            return sp.csr_matrix((data, indices, indptr), shape=shape)
+
+        arr = np.frombuffer(buffers[0], dtype=dtype).reshape(shape)
+        if kind == "index":
+            return pd.Index(arr, dtype=str)
+        elif kind == "tensor":
+            return torch.from_numpy(arr.copy())
+        else:
+            raise ValueError(f"Not implemented block buffer kind {kind}")
+
     # @classmethod
     # def transform_row_to_raw(cls, block, index):
     #     if isinstance(block, pd.Index):
@@ -294,6 +368,8 @@ class Block(object):
             ret = torch.vstack(blocks)
         elif isinstance(ret, np.ndarray):
             ret = np.vstack(blocks)
+        elif sp.issparse(ret):
+            ret = sp.vstack(blocks, format="csr")
         else:
             raise ValueError(f"Not implemented block vstack for type {type(ret)}")
 
@@ -488,6 +564,60 @@ class NPObjectBlock(Block):
         return np.dtype("O")
 
 
+class SparseBlock(Block):
+    """
+    block of a scipy csr_matrix with shape (num_rows, len(field_indexes)), implicit entries are zeros,
+    used for one-hot/tag features whose dense form does not fit in memory
+    """
+
+    _np_dtype = None
+
+    def convert_block(self, block):
+        if sp.issparse(block):
+            return sp.csr_matrix(block, dtype=self._np_dtype)
+        if isinstance(block, torch.Tensor):
+            return sp.csr_matrix(block.detach().numpy(), dtype=self._np_dtype)
+        if isinstance(block, np.ndarray):
+            return sp.csr_matrix(block, dtype=self._np_dtype)
+
+        # list of rows, each row is a pair of (column offsets, values) or a dense row,
+        # values of an offset repeated in a row are summed up
+        if block and not isinstance(block[0], tuple):
+            return sp.csr_matrix(np.array(block, dtype=self._np_dtype))
+
+        indptr = np.zeros(len(block) + 1, dtype=np.int64)
+        for i, (indices, _) in enumerate(block):
+            indptr[i + 1] = indptr[i] + len(indices)
+        indices = np.fromiter(itertools.chain.from_iterable(row[0] for row in block), dtype=np.int64, count=indptr[-1])
+        data = np.fromiter(
+            itertools.chain.from_iterable(row[1] for row in block), dtype=self._np_dtype, count=indptr[-1]
+        )
+        ret = sp.csr_matrix((data, indices, indptr), shape=(len(block), len(self._field_indexes)))
+        ret.sum_duplicates()
+
+        return ret
+
+    @property
+    def dtype(self):
+        return np.dtype(self._np_dtype)
+
+
+class SparseInt64Block(SparseBlock):
+    _np_dtype = np.int64
+
+    def __init__(self, *args, **kwargs):
+        super(SparseInt64Block, self).__init__(*args, **kwargs)
+        self._block_type = BlockType.sparse_int64
+
+
+class SparseFloat32Block(SparseBlock):
+    _np_dtype = np.float32
+
+    def __init__(self, *args, **kwargs):
+        super(SparseFloat32Block, self).__init__(*args, **kwargs)
+        self._block_type = BlockType.sparse_float32
+
+
 class BlockManager(object):
     def __init__(self):
         """
@@ -13,8 +13,10 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import functools
+import numpy as np
 import pandas as pd
 import torch
+from scipy import sparse as sp
 
 from collections.abc import Iterable
 
@@ -173,3 +175,99 @@ def _apply(
             ret_blocks[bid] = dm.blocks[bid].convert_block(apply_blocks[idx])
 
     return ret_blocks, dm
+
+
+def apply_block(df: "DataFrame", func, columns: list = None, with_label=False, with_weight=False) -> "DataFrame":
+    """
+    apply func on each block instead of each row: func receives a pd.DataFrame of all rows in the block
+    and returns a pd.DataFrame (or a dict of columns) with the same number of rows, columns of object dtype
+    are stored as np_object, others are stored by their dtypes, so func should return the same dtypes for all blocks
+    """
+    data_manager = df.data_manager
+    dst_data_manager, _ = data_manager.derive_new_data_manager(
+        with_sample_id=True, with_match_id=True, with_label=not with_label, with_weight=not with_weight, columns=None
+    )
+
+    non_operable_field_names = dst_data_manager.get_field_name_list()
+    non_operable_blocks = [
+        data_manager.loc_block(field_name, with_offset=False) for field_name in non_operable_field_names
+    ]
+    fields_name = data_manager.get_field_name_list(
+        with_sample_id=False, with_match_id=False, with_label=with_label, with_weight=with_weight
+    )
+    operable_blocks = sorted(list(set(data_manager.loc_block(fields_name, with_offset=False))))
+    block_columns = [
+        (bid, [data_manager.get_field_name(field_index) for field_index in data_manager.get_block(bid).field_indexes])
+        for bid in operable_blocks
+    ]
+
+    _apply_func = functools.partial(
+        _apply_block,
+        func=func,
+        src_block_columns=block_columns,
+        src_field_names=fields_name,
+        src_non_operable_blocks=non_operable_blocks,
+        ret_columns=columns,
+        dst_dm=dst_data_manager,
+    )
+
+    dst_block_table_with_dm = df.block_table.mapValues(_apply_func)
+
+    dst_data_manager = dst_block_table_with_dm.first()[1][1]
+    dst_block_table = dst_block_table_with_dm.mapValues(lambda blocks_with_dm: blocks_with_dm[0])
+
+    return DataFrame(df._ctx, dst_block_table, df.partition_order_mappings, dst_data_manager)
+
+
+def _apply_block(
+    blocks,
+    func=None,
+    src_block_columns=None,
+    src_field_names=None,
+    src_non_operable_blocks=None,
+    ret_columns=None,
+    dst_dm: "DataManager" = None,
+):
+    dm = dst_dm.duplicate()
+
+    apply_data = []
+    for bid, block_columns in src_block_columns:
+        block = blocks[bid]
+        if isinstance(block, torch.Tensor):
+            apply_data.append(pd.DataFrame(block.detach().numpy(), columns=block_columns))
+        elif sp.issparse(block):
+            apply_data.append(pd.DataFrame.sparse.from_spmatrix(block, columns=block_columns))
+        else:
+            apply_data.append(
+                pd.DataFrame({name: list(block[:, offset]) for offset, name in enumerate(block_columns)})
+            )
+
+    if apply_data:
+        apply_data = pd.concat(apply_data, axis=1)[src_field_names]
+    else:
+        apply_data = pd.DataFrame(index=range(len(blocks[0])))
+
+    apply_ret = func(apply_data)
+    if not isinstance(apply_ret, pd.DataFrame):
+        apply_ret = pd.DataFrame(apply_ret)
+
+    if not ret_columns:
+        ret_columns = generated_default_column_names(len(apply_ret.columns))
+
+    block_types = []
+    for name in apply_ret.columns:
+        dtype = apply_ret[name].dtype
+        block_types.append(BlockType.np_object if dtype == np.dtype("O") else BlockType.get_block_type(dtype))
+    block_indexes = dm.append_columns(ret_columns, block_types)
+
+    ret_blocks = [[] for _ in range(len(src_non_operable_blocks) + len(block_indexes))]
+    for idx, bid in enumerate(src_non_operable_blocks):
+        ret_blocks[idx] = blocks[bid]
+
+    for name, bid in zip(apply_ret.columns, block_indexes):
+        if dm.blocks[bid].block_type == BlockType.np_object:
+            ret_blocks[bid] = dm.blocks[bid].convert_block([[value] for value in apply_ret[name].tolist()])
+        else:
+            ret_blocks[bid] = dm.blocks[bid].convert_block(apply_ret[name].to_numpy().reshape(-1, 1))
+
+    return ret_blocks, dm
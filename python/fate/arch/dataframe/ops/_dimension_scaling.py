@@ -21,7 +21,7 @@ from .._dataframe import DataFrame
 from ..manager.data_manager import DataManager
 from ..manager.block_manager import Block
 from ._compress_block import compress_blocks
-from ._indexer import get_partition_order_by_raw_table, get_partition_order_mappings_by_block_table
+from ._indexer import get_partition_order_mappings_by_block_table, loc
 from ._promote_types import promote_partial_block_types
 from ._set_item import set_item
 from fate.arch.tensor import DTensor
@@ -185,23 +185,9 @@ def drop(df: "DataFrame", index: "DataFrame" = None) -> "DataFrame":
     if index.shape[0] == df.shape[0]:
         return df.empty_frame()
 
-    data_manager = df.data_manager.duplicate()
-    l_flatten_func = functools.partial(_flatten_partition, block_num=data_manager.block_num)
-    l_flatten_table = df.block_table.mapPartitions(l_flatten_func, use_previous_behavior=False)
-
-    r_flatten_func = functools.partial(_flatten_partition_without_value)
-    r_flatten_table = index.block_table.mapPartitions(r_flatten_func, use_previous_behavior=False)
-
-    drop_flatten = l_flatten_table.subtractByKey(r_flatten_table)
-    partition_order_mappings = (
-        get_partition_order_by_raw_table(drop_flatten, data_manager.block_row_size) if drop_flatten.count() else dict()
-    )
-
-    _convert_to_block_func = functools.partial(to_blocks, dm=data_manager, partition_mappings=partition_order_mappings)
+    indexer = df.get_indexer(target="sample_id").subtractByKey(index.get_indexer(target="sample_id"))
 
-    block_table = drop_flatten.mapPartitions(_convert_to_block_func, use_previous_behavior=False)
-
-    return DataFrame(df._ctx, block_table, partition_order_mappings, data_manager)
+    return loc(df, indexer)
 
 
 def sample(df: "DataFrame", n=None, frac: float = None, random_state=None) -> "DataFrame":
@@ -294,12 +280,6 @@ def retrieval_row(df: "DataFrame", indexer: Union["DTensor", "DataFrame"]):
     return DataFrame(df._ctx, block_table, partition_order_mappings, data_manager)
 
 
-def _flatten_partition_without_value(kvs):
-    for block_id, blocks in kvs:
-        for sample_id in blocks[0]:
-            yield sample_id, []
-
-
 def _flatten_partition(kvs, block_num=0):
     for block_id, blocks in kvs:
         flat_blocks = [Block.transform_block_to_list(block) for block in blocks]
@@ -18,6 +18,7 @@ import functools
 import pandas as pd
 import numpy as np
 import torch
+from scipy import sparse as sp
 from sklearn.preprocessing import OneHotEncoder
 from typing import Union
 from ._compress_block import compress_blocks
@@ -128,6 +129,23 @@ def bucketize(df: DataFrame, boundaries: Union[pd.DataFrame, dict]):
     field_names = list(filter(lambda field_name: field_name in boundaries, data_manager.infer_operable_field_names()))
     blocks_loc = data_manager.loc_block(field_names)
 
+    # sparse blocks are bucketized as a whole and stay sparse, implicit zeros are kept in bin 0
+    sparse_field_names = dict()
+    for name, (_bid, _offset) in zip(field_names, blocks_loc):
+        if data_manager.blocks[_bid].is_sparse():
+            sparse_field_names.setdefault(_bid, dict())[_offset] = name
+
+    _sparse_boundaries_list = []
+    for _bid, offset_names in sparse_field_names.items():
+        if len(offset_names) != len(data_manager.blocks[_bid].field_indexes):
+            raise ValueError("bucketize on sparse columns should contain all columns of the sparse block")
+        _sparse_boundaries_list.append((_bid, _get_sparse_boundaries(offset_names, boundaries)))
+
+    if sparse_field_names:
+        field_names = [name for name, (_bid, _) in zip(field_names, blocks_loc) if _bid not in sparse_field_names]
+        blocks_loc = data_manager.loc_block(field_names)
+        data_manager.promote_types([(_bid, BlockType.sparse_int64) for _bid in sparse_field_names])
+
     _boundaries_list = []
     for name, (_bid, _) in zip(field_names, blocks_loc):
         if BlockType.is_tensor(data_manager.blocks[_bid].block_type):
@@ -139,12 +157,19 @@ def bucketize(df: DataFrame, boundaries: Union[pd.DataFrame, dict]):
 
         _boundaries_list.append((_bid, _, _boundary))
 
-    narrow_blocks, dst_blocks = data_manager.split_columns(
-        field_names, BlockType.get_block_type(BUCKETIZE_RESULT_TYPE)
-    )
+    narrow_blocks, dst_blocks = [], []
+    if field_names:
+        narrow_blocks, dst_blocks = data_manager.split_columns(
+            field_names, BlockType.get_block_type(BUCKETIZE_RESULT_TYPE)
+        )
 
     def _mapper(
-        blocks, boundaries_list: list = None, narrow_loc: list = None, dst_bids: list = None, dm: DataManager = None
+        blocks,
+        boundaries_list: list = None,
+        sparse_boundaries_list: list = None,
+        narrow_loc: list = None,
+        dst_bids: list = None,
+        dm: DataManager = None,
     ):
         ret_blocks = [block for block in blocks]
 
@@ -162,10 +187,18 @@ def bucketize(df: DataFrame, boundaries: Union[pd.DataFrame, dict]):
 
             ret_blocks[dst_bid] = dm.blocks[dst_bid].convert_block(ret)
 
+        for bid, sparse_boundaries in sparse_boundaries_list:
+            ret_blocks[bid] = dm.blocks[bid].convert_block(_bucketize_csr(blocks[bid], *sparse_boundaries))
+
         return ret_blocks
 
     bucketize_mapper = functools.partial(
-        _mapper, boundaries_list=_boundaries_list, narrow_loc=narrow_blocks, dst_bids=dst_blocks, dm=data_manager
+        _mapper,
+        boundaries_list=_boundaries_list,
+        sparse_boundaries_list=_sparse_boundaries_list,
+        narrow_loc=narrow_blocks,
+        dst_bids=dst_blocks,
+        dm=data_manager,
     )
 
     block_table = df.block_table.mapValues(bucketize_mapper)
@@ -182,3 +215,45 @@ def bucketize(df: DataFrame, boundaries: Union[pd.DataFrame, dict]):
     return DataFrame(
         df._ctx, block_table, partition_order_mappings=df.partition_order_mappings, data_manager=data_manager
     )
+
+
+def _get_sparse_boundaries(offset_names: dict, boundaries: dict):
+    """
+    flatten split points of a sparse block, the last split point of each column is replaced by inf like dense columns.
+    returns (column offset of each split point, split points, number of split points before each column)
+    """
+    bound_columns, bound_values, bound_starts = [], [], []
+    for offset in range(len(offset_names)):
+        _boundary = np.array(boundaries[offset_names[offset]], dtype=np.float64)
+        _boundary[-1] = np.inf
+        if _boundary[0] < 0:
+            raise ValueError(
+                f"column {offset_names[offset]} has negative split points, zeros of sparse column should be in bin 0"
+            )
+        bound_starts.append(len(bound_values))
+        bound_columns.extend([offset] * len(_boundary))
+        bound_values.extend(_boundary.tolist())
+
+    return np.array(bound_columns, dtype=np.int64), np.array(bound_values), np.array(bound_starts, dtype=np.int64)
+
+
+def _bucketize_csr(block, bound_columns, bound_values, bound_starts):
+    """
+    bucketize stored values of all columns at once: stored values and split points are sorted together by
+    (column, value), a value ranks after the split points smaller than it, the same as torch.bucketize(right=False)
+    """
+    block = block.tocsr()
+    nnz = block.nnz
+    columns = np.concatenate([block.indices, bound_columns])
+    values = np.concatenate([np.asarray(block.data, dtype=np.float64), bound_values])
+    is_bound = np.concatenate([np.zeros(nnz, dtype=np.int64), np.ones(len(bound_values), dtype=np.int64)])
+
+    order = np.lexsort((is_bound, values, columns))
+    bound_rank = np.cumsum(is_bound[order])
+    value_mask = is_bound[order] == 0
+    value_pos = order[value_mask]
+
+    bins = np.empty(nnz, dtype=np.int64)
+    bins[value_pos] = bound_rank[value_mask] - bound_starts[columns[value_pos]]
+
+    return sp.csr_matrix((bins, block.indices.copy(), block.indptr.copy()), shape=block.shape)
@@ -16,6 +16,8 @@
 import functools
 import uuid
 
+import numpy as np
+
 from ..manager import Block, DataManager
 from .._dataframe import DataFrame
 
@@ -249,9 +251,125 @@ def transform_flatten_data_to_df(ctx, flatten_table, data_manager: DataManager,
 def loc(df: DataFrame, indexer, target="sample_id", preserve_order=False):
     """
     indexer: table, key=sample_id, value=(block_id, block_offset)
+
+    rows are gathered block by block: the selected offsets of each source block are grouped first,
+    then every block is sliced once and its fragments are stacked into the destination blocks,
+    so no row is ever flattened to python objects.
     """
     if target != "sample_id":
         raise ValueError(f"Only target=sample_id is supported, but target={target} is found")
+
+    if any(block.is_phe_tensor() for block in df.data_manager.blocks):
+        return _loc_by_flatten(df, indexer, preserve_order=preserve_order)
+
+    src_indexer = df.get_indexer(target="sample_id")
+    if not preserve_order:
+        selected = src_indexer.join(indexer, lambda src, dst: src)
+        block_indexer = _assign_continuous_positions(selected, df.data_manager.block_row_size)
+    else:
+        selected = src_indexer.join(indexer, lambda src, dst: (src, dst))
+        block_indexer = selected.mapReducePartitions(_group_by_src_block, lambda l1, l2: l1 + l2).mapValues(
+            lambda rows: np.array(
+                [(src_offset, dst_bid, dst_offset) for src_offset, (dst_bid, dst_offset) in rows], dtype=np.int64
+            )
+        )
+
+    if block_indexer is None or not block_indexer.count():
+        return df.empty_frame()
+
+    return _gather_rows(df, block_indexer)
+
+
+def _group_by_src_block(kvs):
+    """
+    (sample_id, ((src_block_id, src_offset), dst)) -> (src_block_id, [(src_offset, dst)...])
+    """
+    ret = dict()
+    for _, ((src_bid, src_offset), dst) in kvs:
+        if src_bid not in ret:
+            ret[src_bid] = []
+        ret[src_bid].append((src_offset, dst))
+
+    for src_bid, rows in ret.items():
+        yield src_bid, rows
+
+
+def _assign_continuous_positions(selected, block_row_size):
+    """
+    selected: table, key=sample_id, value=(src_block_id, src_offset)
+    returns a table keyed by src_block_id whose value is an int array of rows (src_offset, dst_block_id, dst_offset),
+    rows keep their source order and are packed into destination blocks of block_row_size rows.
+    """
+
+    def _group(kvs):
+        for src_bid, rows in _group_by_src_block(((k, (v, None)) for k, v in kvs)):
+            yield src_bid, [src_offset for src_offset, _ in rows]
+
+    src_offsets = selected.mapReducePartitions(_group, lambda l1, l2: l1 + l2).mapValues(
+        lambda offsets: np.sort(np.array(offsets, dtype=np.int64))
+    )
+    block_sizes = sorted(src_offsets.mapValues(len).collect())
+    if not block_sizes:
+        return None
+
+    start_indexes = dict()
+    start_index = 0
+    for src_bid, block_size in block_sizes:
+        start_indexes[src_bid] = start_index
+        start_index += block_size
+
+    def _to_dst_positions(kvs):
+        for src_bid, offsets in kvs:
+            positions = np.arange(len(offsets), dtype=np.int64) + start_indexes[src_bid]
+            yield src_bid, np.stack([offsets, positions // block_row_size, positions % block_row_size], axis=1)
+
+    return src_offsets.mapPartitions(_to_dst_positions, use_previous_behavior=False, preserves_partitioning=True)
+
+
+def _gather_rows(df: DataFrame, block_indexer):
+    """
+    block_indexer: table, key=src_block_id, value=int array of rows (src_offset, dst_block_id, dst_offset)
+    """
+
+    def _slice_blocks(kvs):
+        for _, (blocks, block_indexer) in kvs:
+            block_indexer = block_indexer[np.lexsort((block_indexer[:, 2], block_indexer[:, 1]))]
+            dst_bids, starts = np.unique(block_indexer[:, 1], return_index=True)
+            ends = list(starts[1:]) + [len(block_indexer)]
+            for dst_bid, start, end in zip(dst_bids, starts, ends):
+                src_offsets, dst_offsets = block_indexer[start:end, 0], block_indexer[start:end, 2]
+                yield int(dst_bid), [(dst_offsets, [Block.retrieval_row(block, src_offsets) for block in blocks])]
+
+    def _stack_fragments(fragments):
+        dst_offsets = np.concatenate([dst_offsets for dst_offsets, _ in fragments])
+        blocks = [Block.vstack([fragment[i] for _, fragment in fragments]) for i in range(len(fragments[0][1]))]
+        if len(fragments) == 1:
+            return blocks
+
+        order = np.argsort(dst_offsets, kind="stable")
+        return [Block.retrieval_row(block, order) for block in blocks]
+
+    data_manager = df.data_manager.duplicate()
+    block_table = df.block_table.join(block_indexer, lambda blocks, block_indexer: (blocks, block_indexer))
+    block_table = block_table.mapReducePartitions(_slice_blocks, lambda l1, l2: l1 + l2)
+    block_table = block_table.mapValues(_stack_fragments)
+
+    partition_order_mappings = get_partition_order_mappings_by_block_table(
+        block_table, block_row_size=data_manager.block_row_size
+    )
+
+    return DataFrame(
+        df._ctx,
+        block_table=block_table,
+        partition_order_mappings=partition_order_mappings,
+        data_manager=data_manager,
+    )
+
+
+def _loc_by_flatten(df: DataFrame, indexer, preserve_order=False):
+    """
+    row by row path of loc, kept for phe blocks which could not be sliced and stacked
+    """
     flatten_table = flatten_data(df, key_type="sample_id")
     if not preserve_order:
         flatten_table = flatten_table.join(indexer, lambda v1, v2: v1)
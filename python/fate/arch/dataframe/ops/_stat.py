@@ -17,6 +17,8 @@ import functools
 import numpy as np
 import pandas as pd
 import torch
+from scipy import sparse as sp
+from fate.arch.tensor.inside import GKSummary, MomentSummary
 from .._dataframe import DataFrame
 from ..manager import DataManager
 
@@ -212,20 +214,107 @@ def variation(df: "DataFrame", ddof=1):
     return std(df, ddof=ddof) / mean(df)
 
 
-def describe(df: "DataFrame", ddof=1, unbiased=False):
-    stat_metrics = dict()
-    stat_metrics["sum"] = sum(df)
-    stat_metrics["min"] = min(df)
-    stat_metrics["max"] = max(df)
-    stat_metrics["mean"] = mean(df)
-    stat_metrics["std"] = std(df, ddof=ddof)
-    stat_metrics["var"] = var(df, ddof=ddof)
-    stat_metrics["variation"] = variation(df, ddof=ddof)
-    stat_metrics["skew"] = skew(df, unbiased=unbiased)
-    stat_metrics["kurt"] = kurt(df, unbiased=unbiased)
-    stat_metrics["na_count"] = df.isna().sum()
-
-    return pd.DataFrame(stat_metrics)
+def describe(df: "DataFrame", ddof=1, unbiased=False, q=None, relative_error: float = 1e-4):
+    """
+    all statistics are computed in a single pass: every block is folded into a mergeable `MomentSummary`,
+    and into `GKSummary` sketches if quantiles `q` are requested, which are added as columns like `25%`.
+    NaN values are skipped, `na_count` counts them. Sparse blocks are summarized without being densified,
+    only quantile sketches take one column at a time.
+    """
+    data_manager = df.data_manager
+    field_names = data_manager.infer_operable_field_names()
+    columns_loc = [data_manager.loc_block(name) for name in field_names]
+    if q is not None and not isinstance(q, list):
+        q = [q] if isinstance(q, float) else list(q)
+
+    def _mapper(blocks, columns_loc=None, error=None):
+        block_columns = dict()
+        for idx, (bid, offset) in enumerate(columns_loc):
+            block_columns.setdefault(bid, []).append((idx, offset))
+
+        summaries, column_order = [], []
+        gk_summary_obj_list = [None] * len(columns_loc) if error is not None else None
+        for bid, idx_offsets in block_columns.items():
+            block = blocks[bid]
+            offsets = [offset for _, offset in idx_offsets]
+            column_order.extend(idx for idx, _ in idx_offsets)
+            if sp.issparse(block):
+                block = block[:, offsets]
+                summaries.append(MomentSummary.from_csr(block))
+                columns = (block[:, [i]].toarray().ravel() for i in range(len(offsets)))
+            else:
+                if isinstance(block, torch.Tensor):
+                    block = block.detach().numpy()
+                block = np.asarray(block[:, offsets], dtype=np.float64)
+                summaries.append(MomentSummary.from_array(block))
+                columns = (block[:, i] for i in range(len(offsets)))
+
+            if error is not None:
+                for (idx, _), column in zip(idx_offsets, columns):
+                    gk_summary_obj_list[idx] = GKSummary(error)
+                    gk_summary_obj_list[idx] += column
+
+        moments = MomentSummary.concat(summaries).take(np.argsort(column_order)) if summaries else MomentSummary(0)
+        return moments, gk_summary_obj_list
+
+    def _reducer(l_summary, r_summary):
+        l_moments, l_gk_summary_obj_list = l_summary
+        r_moments, r_gk_summary_obj_list = r_summary
+        gk_summary_obj_list = None
+        if l_gk_summary_obj_list is not None:
+            gk_summary_obj_list = [l + r for l, r in zip(l_gk_summary_obj_list, r_gk_summary_obj_list)]
+        return l_moments + r_moments, gk_summary_obj_list
+
+    mapper_func = functools.partial(_mapper, columns_loc=columns_loc, error=relative_error if q is not None else None)
+    moments, gk_summary_obj_list = df.block_table.mapValues(mapper_func).reduce(_reducer)
+
+    stat_metrics = _moments_to_metrics(moments, ddof=ddof, unbiased=unbiased)
+    if q is not None:
+        quantile_rets = np.array([gk_summary_obj.queries(q) for gk_summary_obj in gk_summary_obj_list])
+        for idx, q_pt in enumerate(q):
+            stat_metrics[_quantile_name(q_pt)] = quantile_rets[:, idx]
+
+    return pd.DataFrame(stat_metrics, index=field_names)
+
+
+def _moments_to_metrics(moments: "MomentSummary", ddof, unbiased):
+    n = moments.count.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        _mean = moments.sum / n
+        _var = moments.m2 / (n - ddof)
+        _std = _var**0.5
+
+        m2 = moments.m2 / n
+        m3 = moments.m3 / n
+        m4 = moments.m4 / n
+        # if abs(value) in m2 < eps=1e-14, we regard it as 0
+        non_zero_mask = np.abs(m2) >= FLOATING_POINT_ZERO
+        m3 = np.where(non_zero_mask, m3, 0)
+        m4 = np.where(non_zero_mask, m4, 0)
+        m2 = np.where(non_zero_mask, m2, 1)
+        if unbiased:
+            _skew = np.where(n < 3, np.nan, (n * (n - 1)) ** 0.5 / (n - 2) * (m3 / m2**1.5))
+            _kurt = np.where(n < 4, np.nan, (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * m4 / m2**2 - 3 * (n - 1)))
+        else:
+            _skew = m3 / m2**1.5
+            _kurt = m4 / m2**2 - 3
+
+    return dict(
+        sum=moments.sum,
+        min=np.where(moments.count > 0, moments.min, np.nan),
+        max=np.where(moments.count > 0, moments.max, np.nan),
+        mean=_mean,
+        std=_std,
+        var=_var,
+        variation=_std / _mean,
+        skew=_skew,
+        kurt=_kurt,
+        na_count=moments.nan_count,
+    )
+
+
+def _quantile_name(q: float) -> str:
+    return f"{q * 100:g}%"
 
 
 def _post_process(reduce_ret, operable_blocks, data_manager: "DataManager") -> "pd.Series":
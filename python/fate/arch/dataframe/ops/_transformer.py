@@ -19,35 +19,11 @@ from typing import List, Tuple
 import torch
 from fate.arch import tensor
 import numpy as np
+from scipy import sparse as sp
 from ..manager.data_manager import DataManager
 
 
 def transform_to_tensor(block_table, data_manager: "DataManager", dtype=None, partition_order_mappings=None):
-    def _merge_blocks(src_blocks, bids=None, fields=None):
-        if len(bids) == 1:
-            bid = bids[0]
-            t = src_blocks[bid]
-        else:
-            i = 0
-            tensors = []
-            while i < len(fields):
-                bid = fields[i][0]
-                indexes = [fields[i][1]]
-                j = i + 1
-                while j < len(fields) and bid == fields[j][0] and indexes[-1] + 1 == fields[j][1]:
-                    indexes.append(fields[j][1])
-                    j += 1
-
-                tensors.append(src_blocks[bid][:, indexes])
-                i = j
-
-            t = torch.hstack(tensors)
-
-        if dtype:
-            t = t.type(getattr(torch, t))
-
-        return t
-
     def _convert_to_phe_tensor(blocks, bid: int = None, dm: DataManager = None):
         phe_block = dm.get_block(bid)
         return phe_block.convert_to_phe_tensor(blocks[bid], shape=(len(blocks[0]), 1))
@@ -78,11 +54,7 @@ def transform_to_tensor(block_table, data_manager: "DataManager", dtype=None, pa
             device=data_manager.get_block(block_id).device,
         )
     else:
-        field_names = data_manager.infer_operable_field_names()
-        fields_loc = data_manager.loc_block(field_names)
-
-        _merged_func = functools.partial(_merge_blocks, bids=block_indexes, fields=fields_loc)
-        merged_table = block_table.mapValues(_merged_func)
+        merged_table = transform_to_tensor_table(block_table, data_manager, dtype=dtype)
 
         shape_table = merged_table.mapValues(lambda v: v.shape)
         shapes = [shape_obj for k, shape_obj in sorted(shape_table.collect())]
@@ -90,6 +62,62 @@ def transform_to_tensor(block_table, data_manager: "DataManager", dtype=None, pa
         return tensor.DTensor.from_sharding_table(merged_table, shapes=shapes)
 
 
+def transform_to_tensor_table(block_table, data_manager: "DataManager", dtype=None):
+    """
+    merges the operable fields of every block into a local tensor, returns a table of block_id -> tensor
+    """
+    block_indexes = data_manager.infer_operable_blocks()
+    field_names = data_manager.infer_operable_field_names()
+    fields_loc = data_manager.loc_block(field_names)
+
+    _merged_func = functools.partial(_merge_blocks, bids=block_indexes, fields=fields_loc, dtype=dtype)
+    return block_table.mapValues(_merged_func)
+
+
+def _merge_blocks(src_blocks, bids=None, fields=None, dtype=None):
+    if len(bids) == 1:
+        bid = bids[0]
+        t = src_blocks[bid]
+    else:
+        i = 0
+        tensors = []
+        while i < len(fields):
+            bid = fields[i][0]
+            indexes = [fields[i][1]]
+            j = i + 1
+            while j < len(fields) and bid == fields[j][0] and indexes[-1] + 1 == fields[j][1]:
+                indexes.append(fields[j][1])
+                j += 1
+
+            tensors.append(src_blocks[bid][:, indexes])
+            i = j
+
+        if any(sp.issparse(tensor) for tensor in tensors):
+            t = sp.hstack(
+                [tensor if sp.issparse(tensor) else sp.csr_matrix(tensor.detach().numpy()) for tensor in tensors]
+            )
+        else:
+            t = torch.hstack(tensors)
+
+    if sp.issparse(t):
+        t = _csr_to_sparse_tensor(t)
+
+    if dtype:
+        t = t.type(getattr(torch, t))
+
+    return t
+
+
+def _csr_to_sparse_tensor(csr):
+    """
+    csr blocks are exposed as torch sparse coo tensors, which support transpose and matmul with dense tensors,
+    so `X @ w` and `X.T @ g` of GLM never densify X
+    """
+    coo = csr.tocoo()
+    indices = torch.from_numpy(np.vstack([coo.row, coo.col]).astype(np.int64))
+    return torch.sparse_coo_tensor(indices, torch.from_numpy(coo.data), size=coo.shape).coalesce()
+
+
 def transform_block_table_to_list(block_table, data_manager):
     fields_loc = data_manager.get_fields_loc()
     transform_block_to_list_func = functools.partial(transform_block_to_list, fields_loc=fields_loc)
@@ -125,7 +153,10 @@ def transform_block_to_list(blocks, fields_loc):
                 indexes.append(fields_loc[j][1])
                 j += 1
 
-            if isinstance(blocks[bid], np.ndarray):
+            if sp.issparse(blocks[bid]):
+                for line_id, row_value in enumerate(blocks[bid][:, indexes].toarray().tolist()):
+                    dst_list[line_id].extend(row_value)
+            elif isinstance(blocks[bid], np.ndarray):
                 for line_id, row_value in enumerate(blocks[bid][:, indexes]):
                     dst_list[line_id].extend(row_value.tolist())
             else:
@@ -140,6 +171,18 @@ def transform_block_to_list(blocks, fields_loc):
     return dst_list
 
 
+def transform_block_table_to_buffers(block_table):
+    from ..manager.block_manager import Block
+
+    return block_table.mapValues(lambda blocks: [Block.to_buffer(block) for block in blocks])
+
+
+def transform_buffers_to_block_table(table):
+    from ..manager.block_manager import Block
+
+    return table.mapValues(lambda buffers: [Block.from_buffer(buffer) for buffer in buffers])
+
+
 def transform_list_to_block_table(table, data_manager):
     from ..manager.block_manager import BlockType
 
@@ -192,6 +235,8 @@ def transform_to_pandas_dataframe(block_table, data_manager):
                     row[field_id] = blocks[bid][lid][offset]
                 elif isinstance(blocks[bid], torch.Tensor):
                     row[field_id] = blocks[bid][lid][offset].item()
+                elif sp.issparse(blocks[bid]):
+                    row[field_id] = blocks[bid][lid, offset].item()
                 else:
                     row[field_id] = blocks[bid][lid]
 
@@ -216,5 +261,7 @@ def transform_to_pandas_dataframe(block_table, data_manager):
         dtype = data_manager.get_field_type_by_name(name)
         if dtype in ["int32", "float32", "int64", "float64"]:
             pd_df[name] = pd_df[name].astype(dtype)
+        elif dtype in ["sparse_int64", "sparse_float32"]:
+            pd_df[name] = pd_df[name].astype(dtype[len("sparse_") :])
 
     return pd_df
@@ -12,6 +12,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import functools
 import random
 
 
@@ -77,6 +78,12 @@ class DataLoader(object):
 
 
 class FullBatchDataLoader(object):
+    """
+    rows are shuffled once and planned into batches, every row is assigned a (batch_id, position).
+    a batch is gathered by a loc over its part of the plan when it is first iterated, its tensors stay
+    distributed and are reused by later epochs.
+    """
+
     def __init__(self, dataset, ctx, mode, role, batch_size, shuffle, random_state, need_align, sync_arbiter):
         self._dataset = dataset
         self._ctx = ctx
@@ -91,7 +98,8 @@ class FullBatchDataLoader(object):
         self._sync_arbiter = sync_arbiter
 
         self._batch_num = None
-        self._batch_splits = []  # list of DataFrame
+        self._batch_plan = None  # table of sample_id -> (batch_id, position)
+        self._batch_splits = []  # list of BatchEncoding, filled as batches are first iterated
         self._prepare()
 
     def _prepare(self):
@@ -123,27 +131,27 @@ class FullBatchDataLoader(object):
             if self._mode in ["homo", "local"] or self._role == "guest":
                 indexer = sorted(list(self._dataset.get_indexer(target="sample_id").collect()))
                 if self._shuffle:
-                    random.seed = self._random_state
-                    random.shuffle(indexer)
+                    random.Random(self._random_state).shuffle(indexer)
 
-                for i, iter_ctx in self._ctx.sub_ctx("dataloader_batch").ctxs_range(self._batch_num):
-                    batch_indexer = indexer[self._batch_size * i : self._batch_size * (i + 1)]
-                    batch_indexer = self._ctx.computing.parallelize(
-                        batch_indexer, include_key=True, partition=self._dataset.block_table.num_partitions
-                    )
+                batch_plan = self._ctx.computing.parallelize(
+                    [(sample_id, divmod(i, self._batch_size)) for i, (sample_id, _) in enumerate(indexer)],
+                    include_key=True,
+                    partition=self._dataset.block_table.num_partitions,
+                )
 
-                    sub_frame = self._dataset.loc(batch_indexer, preserve_order=False)
+                if self._mode == "hetero" and self._role == "guest":
+                    self._ctx.sub_ctx("dataloader_batch").hosts.put("batch_plan", batch_plan)
 
-                    if self._mode == "hetero" and self._role == "guest":
-                        iter_ctx.hosts.put("batch_indexes", sub_frame.get_indexer(target="sample_id"))
+            else:
+                batch_plan = self._ctx.sub_ctx("dataloader_batch").guest.get("batch_plan")
 
-                    self._batch_splits.append(BatchEncoding(sub_frame, batch_id=i))
+            self._batch_plan = batch_plan
 
-            elif self._mode == "hetero" and self._role == "host":
-                for i, iter_ctx in self._ctx.sub_ctx("dataloader_batch").ctxs_range(self._batch_num):
-                    batch_indexes = iter_ctx.guest.get("batch_indexes")
-                    sub_frame = self._dataset.loc(batch_indexes, preserve_order=True)
-                    self._batch_splits.append(BatchEncoding(sub_frame, batch_id=i))
+    def _gather_batch(self, batch_id):
+        batch_indexer = self._batch_plan.filter(functools.partial(_in_batch, batch_id=batch_id)).mapValues(
+            _to_batch_position
+        )
+        return BatchEncoding(self._dataset.loc(batch_indexer, preserve_order=True), batch_id=batch_id)
 
     def __next__(self):
         if self._role == "arbiter":
@@ -151,8 +159,10 @@ class FullBatchDataLoader(object):
                 yield BatchEncoding(batch_id=batch_id)
             return
 
-        for batch in self._batch_splits:
-            yield batch
+        for batch_id in range(self._batch_num):
+            if batch_id == len(self._batch_splits):
+                self._batch_splits.append(self._gather_batch(batch_id))
+            yield self._batch_splits[batch_id]
 
     def __iter__(self):
         return self.__next__()
@@ -190,3 +200,12 @@ class BatchEncoding(object):
     @property
     def batch_id(self):
         return self._batch_id
+
+
+def _in_batch(plan, batch_id):
+    return plan[0] == batch_id
+
+
+def _to_batch_position(plan):
+    # every batch is gathered into a single block
+    return 0, plan[1]
@@ -0,0 +1,156 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import logging
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+class Codec:
+    """
+    compression stage applied to federation payloads, identified on the wire by `codec_id`
+    """
+
+    codec_id: int
+    name: str
+
+    def compress(self, v: bytes) -> bytes:
+        raise NotImplementedError()
+
+    def decompress(self, v: bytes) -> bytes:
+        raise NotImplementedError()
+
+    def is_encoded(self, v: bytes) -> bool:
+        """
+        whether `v` starts with the frame header of this codec
+        """
+        return False
+
+
+class NoneCodec(Codec):
+    codec_id = 0
+    name = "none"
+
+    def compress(self, v: bytes) -> bytes:
+        return v
+
+    def decompress(self, v: bytes) -> bytes:
+        return v
+
+
+class ZlibCodec(Codec):
+    codec_id = 1
+    name = "zlib"
+
+    def __init__(self, level=6):
+        self._level = level
+
+    def compress(self, v: bytes) -> bytes:
+        import zlib
+
+        return zlib.compress(v, self._level)
+
+    def decompress(self, v: bytes) -> bytes:
+        import zlib
+
+        return zlib.decompress(v)
+
+    def is_encoded(self, v: bytes) -> bool:
+        # deflate method with a window of at most 32k and a header checksum divisible by 31
+        return len(v) >= 2 and v[0] & 0x0F == 8 and v[0] >> 4 <= 7 and (v[0] << 8 | v[1]) % 31 == 0
+
+
+class Lz4Codec(Codec):
+    codec_id = 2
+    name = "lz4"
+
+    def compress(self, v: bytes) -> bytes:
+        import lz4.frame
+
+        return lz4.frame.compress(v)
+
+    def decompress(self, v: bytes) -> bytes:
+        import lz4.frame
+
+        return lz4.frame.decompress(v)
+
+    def is_encoded(self, v: bytes) -> bool:
+        return v[:4] == b"\x04\x22\x4d\x18"
+
+
+class ZstdCodec(Codec):
+    codec_id = 3
+    name = "zstd"
+
+    def __init__(self, level=3):
+        self._level = level
+
+    def compress(self, v: bytes) -> bytes:
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=self._level).compress(v)
+
+    def decompress(self, v: bytes) -> bytes:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(v)
+
+    def is_encoded(self, v: bytes) -> bool:
+        return v[:4] == b"\x28\xb5\x2f\xfd"
+
+
+_CODECS: typing.Dict[int, Codec] = {
+    codec.codec_id: codec for codec in [NoneCodec(), ZlibCodec(), Lz4Codec(), ZstdCodec()]
+}
+_CODEC_IDS = {codec.name: codec_id for codec_id, codec in _CODECS.items()}
+
+
+def get_codec(codec_id: int) -> Codec:
+    if codec_id not in _CODECS:
+        raise ValueError(f"invalid codec id: {codec_id}, supported: {list(_CODECS)}")
+    return _CODECS[codec_id]
+
+
+def get_codec_id(name: str) -> int:
+    if name is None:
+        return NoneCodec.codec_id
+    if name not in _CODEC_IDS:
+        raise ValueError(f"invalid codec: {name}, supported: {list(_CODEC_IDS)}")
+    return _CODEC_IDS[name]
+
+
+def compress(v: bytes, codec_name: str, threshold: int) -> typing.Tuple[int, bytes]:
+    """
+    compress `v` with codec `codec_name` if it is larger than `threshold` bytes
+
+    Returns:
+        the id of the codec actually applied and the encoded bytes, payloads that
+        are already encoded by a known codec or do not shrink are sent as is with `NoneCodec`
+    """
+    codec_id = get_codec_id(codec_name)
+    if codec_id == NoneCodec.codec_id or len(v) < threshold:
+        return NoneCodec.codec_id, v
+    if any(codec.is_encoded(v) for codec in _CODECS.values()):
+        logger.debug(f"payload of size {len(v)} is already encoded, skip codec {codec_name}")
+        return NoneCodec.codec_id, v
+    compressed = get_codec(codec_id).compress(v)
+    if len(compressed) >= len(v):
+        logger.debug(f"codec {codec_name} does not shrink payload of size {len(v)}, skip it")
+        return NoneCodec.codec_id, v
+    return codec_id, compressed
+
+
+def decompress(v: bytes, codec_id: int) -> bytes:
+    return get_codec(codec_id).decompress(v)
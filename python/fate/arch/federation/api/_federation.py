@@ -53,6 +53,16 @@ class Federation:
 
         return cfg.federation.split_large_object.partition_num
 
+    def get_default_compress_codec(self):
+        from fate.arch.config import cfg
+
+        return cfg.federation.compression.codec
+
+    def get_default_compress_threshold(self):
+        from fate.arch.config import cfg
+
+        return cfg.federation.compression.threshold
+
     @property
     def session_id(self) -> str:
         return self._session_id
@@ -124,7 +134,7 @@ class Federation:
             self._push_history.add((name, tag, party))
 
         self._push_table(
-            table=table,
+            table=table.materialize(),
             name=name,
             tag=tag,
             parties=parties,
@@ -20,6 +20,7 @@ import typing
 from typing import Any, List, Tuple, TypeVar
 
 from fate.arch.config import cfg
+from ._codec import NoneCodec, compress, decompress
 from ._table_meta import TableMeta
 from ._type import PartyMeta
 
@@ -119,13 +120,34 @@ class _NumpySafeTensorPersistentId:
 
 
 class _FederationBytesCoder:
+    """
+    modes:
+        0: base, `!B` + payload
+        1: split, `!B` + `!QIIIIII` split info, payload pushed as a slice table
+        2: compressed base, `!BB` (mode, codec_id) + payload
+        3: compressed split, `!BB` (mode, codec_id) + `!QIIIIII` split info
+    modes 0 and 1 are kept for uncompressed payloads so that peers without codec support still work
+    """
+
     @staticmethod
-    def encode_base(v: bytes) -> bytes:
-        return struct.pack("!B", 0) + v
+    def encode_base(v: bytes, codec_id: int = NoneCodec.codec_id) -> bytes:
+        if codec_id == NoneCodec.codec_id:
+            return struct.pack("!B", 0) + v
+        return struct.pack("!BB", 2, codec_id) + v
 
     @staticmethod
-    def encode_split(slice_table_meta: "TableMeta", total_size: int, num_slice: int, slice_size: int) -> bytes:
-        return struct.pack("!B", 1) + struct.pack(
+    def encode_split(
+        slice_table_meta: "TableMeta",
+        total_size: int,
+        num_slice: int,
+        slice_size: int,
+        codec_id: int = NoneCodec.codec_id,
+    ) -> bytes:
+        if codec_id == NoneCodec.codec_id:
+            header = struct.pack("!B", 1)
+        else:
+            header = struct.pack("!BB", 3, codec_id)
+        return header + struct.pack(
             "!QIIIIII",
             total_size,
             num_slice,
@@ -140,12 +162,23 @@ class _FederationBytesCoder:
     def decode_mode(cls, v: bytes) -> int:
         return struct.unpack("!B", v[:1])[0]
 
+    @classmethod
+    def decode_codec(cls, v: bytes) -> int:
+        if cls.decode_mode(v) in {0, 1}:
+            return NoneCodec.codec_id
+        return struct.unpack("!B", v[1:2])[0]
+
+    @classmethod
+    def _header_size(cls, v: bytes) -> int:
+        return 1 if cls.decode_mode(v) in {0, 1} else 2
+
     @classmethod
     def decode_base(cls, v: bytes) -> bytes:
-        return v[1:]
+        return v[cls._header_size(v) :]
 
     @classmethod
     def decode_split(cls, v: bytes) -> Tuple["TableMeta", int, int, int]:
+        offset = cls._header_size(v)
         (
             total_size,
             num_slice,
@@ -154,7 +187,7 @@ class _FederationBytesCoder:
             key_serdes_type,
             value_serdes_type,
             partitioner_type,
-        ) = struct.unpack("!QIIIIII", v[1:33])
+        ) = struct.unpack("!QIIIIII", v[offset : offset + 32])
         table_meta = TableMeta(
             num_partitions=num_partitions,
             key_serdes_type=key_serdes_type,
@@ -169,6 +202,10 @@ class _SplitTableUtil:
     def get_split_table_key(name):
         return f"{name}__table_persistent_split__"
 
+    @staticmethod
+    def is_split_table_key(name):
+        return name.endswith("__table_persistent_split__")
+
 
 class TableRemotePersistentPickler(pickle.Pickler):
     def __init__(
@@ -226,16 +263,18 @@ class TableRemotePersistentPickler(pickle.Pickler):
         parties: List[PartyMeta],
         max_message_size: int,
         num_partitions_of_slice_table: int,
+        codec: str = None,
+        codec_threshold: int = 0,
     ):
         with io.BytesIO() as f:
             pickler = TableRemotePersistentPickler(federation, name, tag, parties, f)
             pickler.dump(value)
-            if f.tell() > max_message_size:
-                total_size = f.tell()
+            codec_id, payload = compress(f.getvalue(), codec, codec_threshold)
+            if len(payload) > max_message_size:
+                total_size = len(payload)
                 num_slice = (total_size - 1) // max_message_size + 1
                 # create a table to store the slice
-                f.seek(0)
-                data = [(i, f.read(max_message_size)) for i in range(num_slice)]
+                data = [(i, payload[i * max_message_size : (i + 1) * max_message_size]) for i in range(num_slice)]
                 slice_table = computing.parallelize(
                     data,
                     partition=num_partitions_of_slice_table,
@@ -253,7 +292,9 @@ class TableRemotePersistentPickler(pickle.Pickler):
                 federation.push_table(slice_table, _SplitTableUtil.get_split_table_key(name), tag=tag, parties=parties)
                 # push the slice table info
                 federation.push_bytes(
-                    v=_FederationBytesCoder.encode_split(split_table_meta, total_size, num_slice, max_message_size),
+                    v=_FederationBytesCoder.encode_split(
+                        split_table_meta, total_size, num_slice, max_message_size, codec_id
+                    ),
                     name=name,
                     tag=tag,
                     parties=parties,
@@ -261,7 +302,7 @@ class TableRemotePersistentPickler(pickle.Pickler):
 
             else:
                 federation.push_bytes(
-                    v=_FederationBytesCoder.encode_base(f.getvalue()), name=name, tag=tag, parties=parties
+                    v=_FederationBytesCoder.encode_base(payload, codec_id), name=name, tag=tag, parties=parties
                 )
 
 
@@ -343,11 +384,13 @@ class TableRemotePersistentUnpickler(pickle.Unpickler):
         party: PartyMeta,
     ):
         mode = _FederationBytesCoder.decode_mode(buffers)
-        if mode == 0:
-            with io.BytesIO(_FederationBytesCoder.decode_base(buffers)) as f:
+        codec_id = _FederationBytesCoder.decode_codec(buffers)
+        if mode in {0, 2}:
+            payload = decompress(_FederationBytesCoder.decode_base(buffers), codec_id)
+            with io.BytesIO(payload) as f:
                 unpickler = TableRemotePersistentUnpickler(ctx, federation, name, tag, party, f)
                 return unpickler.load()
-        elif mode == 1:
+        elif mode in {1, 3}:
             # get num_slice and slice_size
             table_meta, total_size, num_slice, slice_size = _FederationBytesCoder.decode_split(buffers)
 
@@ -360,6 +403,11 @@ class TableRemotePersistentUnpickler(pickle.Unpickler):
                 for i, b in slice_table.collect():
                     f.seek(i * slice_size)
                     f.write(b)
+                if codec_id != NoneCodec.codec_id:
+                    payload = decompress(f.getvalue(), codec_id)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(payload)
                 f.seek(0)
                 unpickler = TableRemotePersistentUnpickler(ctx, federation, name, tag, party, f)
                 return unpickler.load()
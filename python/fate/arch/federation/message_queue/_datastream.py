@@ -17,6 +17,7 @@
 
 import io
 import json
+import struct
 import sys
 
 
@@ -42,3 +43,50 @@ class Datastream(object):
     def clear(self):
         self._string.close()
         self.__init__()
+
+
+# BinaryDatastream frames raw kv pairs as `<key_len><value_len><key><value>` records,
+# avoiding the hex + json round-trip of Datastream
+_FRAME_HEADER = struct.Struct("<II")
+
+
+class BinaryDatastream(object):
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def get_size(self):
+        return len(self._buffer)
+
+    def get_data(self):
+        return bytes(self._buffer)
+
+    def append(self, k: bytes, v: bytes):
+        self._buffer += _FRAME_HEADER.pack(len(k), len(v))
+        self._buffer += k
+        self._buffer += v
+
+    def clear(self):
+        self._buffer = bytearray()
+
+    @staticmethod
+    def frame_size(k: bytes, v: bytes):
+        return _FRAME_HEADER.size + len(k) + len(v)
+
+    @staticmethod
+    def iter_kv(data):
+        """
+        decode kv pairs framed by `append`, slicing a memoryview of data so that only
+        the final key/value bytes are copied
+        """
+        view = memoryview(data)
+        offset = 0
+        end = len(view)
+        while offset < end:
+            k_len, v_len = _FRAME_HEADER.unpack_from(view, offset)
+            offset += _FRAME_HEADER.size
+            k_end = offset + k_len
+            v_end = k_end + v_len
+            if v_end > end:
+                raise ValueError(f"truncated binary datastream: expect {v_end} bytes, got {end}")
+            yield view[offset:k_end].tobytes(), view[k_end:v_end].tobytes()
+            offset = v_end
@@ -23,13 +23,22 @@ from typing import List
 
 from fate.arch.computing.api import KVTableContext
 from fate.arch.federation.api import Federation, PartyMeta, TableMeta
-from ._datastream import Datastream
+from fate.arch.federation.api._codec import NoneCodec, compress, decompress
+from fate.arch.federation.api._serdes import _SplitTableUtil
+from ._datastream import BinaryDatastream, Datastream
 from ._parties import Party
 
 LOGGER = logging.getLogger(__name__)
 
 _SPLIT_ = "^"
 
+TABLE_MESSAGE_FORMAT_JSON = "json"
+TABLE_MESSAGE_FORMAT_BINARY = "binary"
+_TABLE_MESSAGE_CONTENT_TYPES = {
+    TABLE_MESSAGE_FORMAT_JSON: "application/json",
+    TABLE_MESSAGE_FORMAT_BINARY: "application/octet-stream",
+}
+
 
 class MessageQueueBasedFederation(Federation):
     def __init__(
@@ -42,6 +51,7 @@ class MessageQueueBasedFederation(Federation):
         max_message_size,
         conf=None,
         default_partition_num=None,
+        table_message_format=None,
     ):
         self._mq = mq
         self._topic_map = {}
@@ -51,6 +61,14 @@ class MessageQueueBasedFederation(Federation):
         if self._max_message_size is None:
             self._max_message_size = self.get_default_max_message_size()
         self._default_partition_num = default_partition_num
+        self._table_message_format = table_message_format
+        if self._table_message_format is None:
+            self._table_message_format = self.get_default_table_message_format()
+        if self._table_message_format not in _TABLE_MESSAGE_CONTENT_TYPES:
+            raise ValueError(
+                f"table_message_format should be one of {list(_TABLE_MESSAGE_CONTENT_TYPES)}, "
+                f"got {self._table_message_format}"
+            )
         self._conf = conf
         self.computing_session = computing_session
 
@@ -93,6 +111,11 @@ class MessageQueueBasedFederation(Federation):
         else:
             return self._default_partition_num
 
+    def get_default_table_message_format(self):
+        from fate.arch.config import cfg
+
+        return cfg.federation.message_queue.table_message_format
+
     def _pull_bytes(self, name: str, tag: str, parties: typing.List[PartyMeta]) -> typing.List:
         _parties = [Party(role=p[0], party_id=p[1]) for p in parties]
         rtn = []
@@ -156,6 +179,11 @@ class MessageQueueBasedFederation(Federation):
         party_topic_infos = self._get_party_topic_infos_by_name_and_partitions(
             _parties, name, partitions=table.num_partitions
         )
+        # slices of a split object are the pickled payload that already went through the codec
+        if _SplitTableUtil.is_split_table_key(name):
+            codec = None
+        else:
+            codec = self.get_default_compress_codec()
         send_func = self._get_partition_send_func(
             name=name,
             tag=tag,
@@ -166,6 +194,9 @@ class MessageQueueBasedFederation(Federation):
             mq=self._mq,
             max_message_size=self._max_message_size,
             conf=self._conf,
+            table_message_format=self._table_message_format,
+            codec=codec,
+            codec_threshold=self.get_default_compress_threshold(),
         )
         # noinspection PyProtectedMember
         table.mapPartitionsWithIndexNoSerdes(
@@ -257,17 +288,34 @@ class MessageQueueBasedFederation(Federation):
             LOGGER.debug(f"[federation._send_obj]properties:{properties}.")
             info.produce(body=data, properties=properties)
 
-    def _send_kv(self, name, tag, data, channel_infos, partition_size, partitions, message_key):
-        headers = json.dumps(
-            {
-                "partition_size": partition_size,
-                "partitions": partitions,
-                "message_key": message_key,
-            }
-        )
+    def _send_kv(
+        self,
+        name,
+        tag,
+        data,
+        channel_infos,
+        partition_size,
+        partitions,
+        message_key,
+        table_message_format=TABLE_MESSAGE_FORMAT_JSON,
+        codec=None,
+        codec_threshold=0,
+    ):
+        codec_id, data = compress(data, codec, codec_threshold)
+        header = {
+            "partition_size": partition_size,
+            "partitions": partitions,
+            "message_key": message_key,
+        }
+        # peers without binary support never see the `format` field
+        if table_message_format != TABLE_MESSAGE_FORMAT_JSON:
+            header["format"] = table_message_format
+        if codec_id != NoneCodec.codec_id:
+            header["codec"] = codec_id
+        headers = json.dumps(header)
         for info in channel_infos:
             properties = {
-                "content_type": "application/json",
+                "content_type": _TABLE_MESSAGE_CONTENT_TYPES[table_message_format],
                 "app_id": info._dst_party_id,
                 "message_id": name,
                 "correlation_id": tag,
@@ -287,6 +335,9 @@ class MessageQueueBasedFederation(Federation):
         mq,
         max_message_size,
         conf: dict,
+        table_message_format=TABLE_MESSAGE_FORMAT_JSON,
+        codec=None,
+        codec_threshold=0,
     ):
         def _fn(index, kvs):
             return self._partition_send(
@@ -301,6 +352,9 @@ class MessageQueueBasedFederation(Federation):
                 mq=mq,
                 max_message_size=max_message_size,
                 conf=conf,
+                table_message_format=table_message_format,
+                codec=codec,
+                codec_threshold=codec_threshold,
             )
 
         return _fn
@@ -318,6 +372,9 @@ class MessageQueueBasedFederation(Federation):
         mq,
         max_message_size,
         conf: dict,
+        table_message_format=TABLE_MESSAGE_FORMAT_JSON,
+        codec=None,
+        codec_threshold=0,
     ):
         channel_infos = self._get_channels_index(
             index=index,
@@ -328,30 +385,49 @@ class MessageQueueBasedFederation(Federation):
             conf=conf,
         )
 
-        datastream = Datastream()
+        if table_message_format == TABLE_MESSAGE_FORMAT_BINARY:
+            datastream = BinaryDatastream()
+        else:
+            datastream = Datastream()
         base_message_key = str(index)
         message_key_idx = 0
         count = 0
 
+        def _get_data():
+            if table_message_format == TABLE_MESSAGE_FORMAT_BINARY:
+                return datastream.get_data()
+            return datastream.get_data().encode()
+
         for k, v in kvs:
             count += 1
-            el = {"k": k.hex(), "v": v.hex()}
-            # roughly caculate the size of package to avoid serialization ;)
-            if datastream.get_size() + sys.getsizeof(el["k"]) + sys.getsizeof(el["v"]) >= max_message_size:
+            if table_message_format == TABLE_MESSAGE_FORMAT_BINARY:
+                el = (k, v)
+                el_size = BinaryDatastream.frame_size(k, v)
+            else:
+                el = {"k": k.hex(), "v": v.hex()}
+                # roughly caculate the size of package to avoid serialization ;)
+                el_size = sys.getsizeof(el["k"]) + sys.getsizeof(el["v"])
+            if datastream.get_size() + el_size >= max_message_size:
                 LOGGER.debug(f"[federation._partition_send]The size of message is: {datastream.get_size()}")
                 message_key_idx += 1
                 message_key = base_message_key + "_" + str(message_key_idx)
                 self._send_kv(
                     name=name,
                     tag=tag,
-                    data=datastream.get_data().encode(),
+                    data=_get_data(),
                     channel_infos=channel_infos,
                     partition_size=-1,
                     partitions=partitions,
                     message_key=message_key,
+                    table_message_format=table_message_format,
+                    codec=codec,
+                    codec_threshold=codec_threshold,
                 )
                 datastream.clear()
-            datastream.append(el)
+            if table_message_format == TABLE_MESSAGE_FORMAT_BINARY:
+                datastream.append(*el)
+            else:
+                datastream.append(el)
 
         message_key_idx += 1
         message_key = _SPLIT_.join([base_message_key, str(message_key_idx)])
@@ -359,11 +435,14 @@ class MessageQueueBasedFederation(Federation):
         self._send_kv(
             name=name,
             tag=tag,
-            data=datastream.get_data().encode(),
+            data=_get_data(),
             channel_infos=channel_infos,
             partition_size=count,
             partitions=partitions,
             message_key=message_key,
+            table_message_format=table_message_format,
+            codec=codec,
+            codec_threshold=codec_threshold,
         )
 
         return []
@@ -468,7 +547,7 @@ class MessageQueueBasedFederation(Federation):
                         )
                         continue
 
-                    if properties["content_type"] == "application/json":
+                    if properties["content_type"] in _TABLE_MESSAGE_CONTENT_TYPES.values():
                         header = json.loads(properties["headers"])
                         message_key = header["message_key"]
                         if message_key in message_key_cache:
@@ -481,17 +560,11 @@ class MessageQueueBasedFederation(Federation):
                         if header["partition_size"] >= 0:
                             partition_size = header["partition_size"]
 
-                        data = json.loads(body.decode())
-                        data_iter = (
-                            (
-                                bytes.fromhex(el["k"]),
-                                bytes.fromhex(el["v"]),
-                            )
-                            for el in data
-                        )
+                        body = decompress(body, header.get("codec", NoneCodec.codec_id))
+                        data = _decode_table_message(body, header.get("format", TABLE_MESSAGE_FORMAT_JSON))
                         count += len(data)
                         LOGGER.debug(f"[federation._partition_receive] count: {count}")
-                        all_data.extend(data_iter)
+                        all_data.extend(data)
                         self._consume_ack(channel_info, id)
 
                         if count == partition_size:
@@ -499,7 +572,7 @@ class MessageQueueBasedFederation(Federation):
                             return all_data
                     else:
                         ValueError(
-                            f"[federation._partition_receive]properties.content_type is {properties['content_type']}, but must be application/json"
+                            f"[federation._partition_receive]properties.content_type is {properties['content_type']}, but must be one of {list(_TABLE_MESSAGE_CONTENT_TYPES.values())}"
                         )
 
             except Exception as e:
@@ -512,6 +585,15 @@ class MessageQueueBasedFederation(Federation):
                     raise e
 
 
+def _decode_table_message(body, table_message_format):
+    if table_message_format == TABLE_MESSAGE_FORMAT_BINARY:
+        return list(BinaryDatastream.iter_kv(body))
+    elif table_message_format == TABLE_MESSAGE_FORMAT_JSON:
+        return [(bytes.fromhex(el["k"]), bytes.fromhex(el["v"])) for el in json.loads(body.decode())]
+    else:
+        raise ValueError(f"unknown table message format: {table_message_format}")
+
+
 def _get_message_cache_key(name: str, tag: str, party_id, role: str):
     cache_key = _SPLIT_.join([name, tag, str(party_id), role])
     return cache_key
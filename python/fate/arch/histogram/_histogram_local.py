@@ -16,6 +16,9 @@
 import logging
 import typing
 
+import numpy as np
+import torch
+
 from ._histogram_splits import HistogramSplits
 from .indexer import HistogramIndexer, Shuffler
 from .values import HistogramValuesContainer
@@ -82,6 +85,80 @@ class Histogram:
             self._data.i_update_with_masks(targets, positions, masks)
         return self
 
+    def i_update_vectorized(self, fids, nids, targets, node_mapping):
+        """
+        same as `i_update`, but positions are computed by the indexer over the whole
+        block instead of per row python lists, and plaintext values are accumulated with `index_add_`
+        """
+        if node_mapping is None:
+            positions = self._indexer.get_positions_array(_as_index_array(nids).reshape(-1), _as_index_array(fids))
+            positions = torch.from_numpy(positions)
+            if positions.shape[0] == 0:
+                return self
+            self._data.i_update_vectorized(targets, positions)
+        else:
+            positions, masks = self._indexer.get_positions_array_with_node_mapping(
+                _as_index_array(nids).reshape(-1), _as_index_array(fids), node_mapping
+            )
+            positions, masks = torch.from_numpy(positions), torch.from_numpy(masks)
+            if positions.shape[0] == 0:
+                return self
+            self._data.i_update_vectorized_with_masks(targets, positions, masks)
+        return self
+
+    def i_update_sparse(self, fids, nids, targets, node_mapping):
+        """
+        `fids` is a scipy sparse matrix of bin ids whose implicit entries are bin 0.
+        Targets of each node are added to bin 0 of every feature once, then each stored entry moves its target
+        from bin 0 to its own bin, which costs O(nnz + num_node * num_features) instead of O(num_rows * num_features).
+        """
+        if not all(isinstance(target, torch.Tensor) for target in targets.values()):
+            # encrypted targets can not be moved between bins here, densify the block instead
+            return self.i_update_vectorized(fids.toarray(), nids, targets, node_mapping)
+
+        fids = fids.tocsr()
+        nids = _as_index_array(nids).reshape(-1)
+        targets = {name: target.reshape(len(nids), -1) for name, target in targets.items()}
+        if node_mapping is not None:
+            nids = np.array([node_mapping.get(nid, -1) for nid in nids.tolist()], dtype=np.int64)
+            masks = nids >= 0
+            nids, fids = nids[masks], fids[masks]
+            masks = torch.from_numpy(masks)
+            targets = {name: target[masks] for name, target in targets.items()}
+        if len(nids) == 0:
+            return self
+
+        node_axis_stride = self._indexer.node_axis_stride
+        feature_offsets = np.asarray(self._indexer.feature_axis_stride, dtype=np.int64)[:-1]
+        node_size = self._indexer.node_size
+
+        torch_nids = torch.from_numpy(nids)
+        node_targets = {
+            name: torch.zeros((node_size, target.shape[1]), dtype=target.dtype).index_add_(0, torch_nids, target)
+            for name, target in targets.items()
+        }
+        zero_positions = np.arange(node_size, dtype=np.int64)[:, None] * node_axis_stride + feature_offsets[None, :]
+        self._data.i_update_vectorized(node_targets, torch.from_numpy(zero_positions))
+
+        rows = np.repeat(np.arange(fids.shape[0], dtype=np.int64), np.diff(fids.indptr))
+        bins = np.asarray(fids.data, dtype=np.int64)
+        non_zero = bins != 0
+        rows, bins = rows[non_zero], bins[non_zero]
+        if len(rows) == 0:
+            return self
+
+        zero_positions = nids[rows] * node_axis_stride + feature_offsets[fids.indices[non_zero]]
+        torch_rows = torch.from_numpy(rows)
+        self._data.i_update_vectorized(
+            {name: target[torch_rows] for name, target in targets.items()},
+            torch.from_numpy(zero_positions + bins).reshape(-1, 1),
+        )
+        self._data.i_update_vectorized(
+            {name: -target[torch_rows] for name, target in targets.items()},
+            torch.from_numpy(zero_positions).reshape(-1, 1),
+        )
+        return self
+
     def iadd(self, hist: "Histogram"):
         self._data.iadd(hist._data)
         return self
@@ -93,7 +170,7 @@ class Histogram:
         return Histogram(self._indexer, self._data.decode(coder_map))
 
     def i_shuffle(self, seed, reverse=False):
-        shuffler = Shuffler(self._indexer.get_node_size(), self._indexer.get_node_axis_stride(), seed)
+        shuffler = Shuffler(self._indexer.node_size, self._indexer.node_axis_stride, seed)
         self._data.i_shuffle(shuffler, reverse=reverse)
         return self
 
@@ -112,3 +189,9 @@ class Histogram:
         for pid, (start, end), indexes in self._indexer.splits_into_k(k):
             data = self._data.intervals_slice(indexes)
             yield pid, HistogramSplits(pid, self._indexer.node_size, start, end, data)
+
+
+def _as_index_array(t):
+    if isinstance(t, torch.Tensor):
+        t = t.detach().numpy()
+    return np.ascontiguousarray(t, dtype=np.int64)
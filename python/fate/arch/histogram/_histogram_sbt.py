@@ -13,6 +13,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from scipy import sparse as sp
+
 from ._histogram_distributed import DistributedHistogram
 from ._histogram_local import Histogram
 
@@ -28,6 +30,7 @@ class HistogramBuilder:
         node_mapping=None,
         k=None,
         enable_cumsum=True,
+        vectorized=True,
     ):
         self._num_node = num_node
         self._feature_bin_sizes = feature_bin_sizes
@@ -38,6 +41,7 @@ class HistogramBuilder:
         self._node_mapping = node_mapping
         self._enable_cumsum = enable_cumsum
         self._k = k
+        self._vectorized = vectorized
 
     def __str__(self):
         return f"<{self.__class__.__name__} node_size={self._num_node}, feature_bin_sizes={self._feature_bin_sizes}, node_data_size={self._node_data_size}, seed={self._global_seed}>"
@@ -60,6 +64,7 @@ class HistogramBuilder:
             self._k,
             self._node_mapping,
             self._enable_cumsum,
+            self._vectorized,
         )
         table = data.mapReducePartitions(mapper, lambda x, y: x.iadd(y))
         data = DistributedHistogram(
@@ -69,13 +74,18 @@ class HistogramBuilder:
 
 
 def get_partition_hist_build_mapper(
-    num_node, feature_bin_sizes, value_schemas, global_seed, k, node_mapping, enable_cumsum
+    num_node, feature_bin_sizes, value_schemas, global_seed, k, node_mapping, enable_cumsum, vectorized=False
 ):
     def _partition_hist_build_mapper(part):
         hist = Histogram.create(num_node, feature_bin_sizes, value_schemas)
         for _, raw in part:
             feature_ids, node_ids, targets = raw
-            hist.i_update(feature_ids, node_ids, targets, node_mapping)
+            if sp.issparse(feature_ids):
+                hist.i_update_sparse(feature_ids, node_ids, targets, node_mapping)
+            elif vectorized:
+                hist.i_update_vectorized(feature_ids, node_ids, targets, node_mapping)
+            else:
+                hist.i_update(feature_ids, node_ids, targets, node_mapping)
         if enable_cumsum:
             hist.i_cumsum_bins()
         if global_seed is not None:
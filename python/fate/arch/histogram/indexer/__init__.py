@@ -13,11 +13,27 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-INDEXER_USE_PYTHON = True
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# the native indexer is opt in until its parity tests run against a built fate_utils
+INDEXER_USE_PYTHON = os.environ.get("FATE_HISTOGRAM_NATIVE_INDEXER") != "1"
+
+if not INDEXER_USE_PYTHON:
+    try:
+        from fate_utils.histogram import HistogramIndexer, Shuffler
+
+        # builds of fate_utils predating the array api are not usable
+        if not hasattr(HistogramIndexer, "get_positions_array"):
+            logger.warning("fate_utils is built without the histogram array api, using the python indexer")
+            INDEXER_USE_PYTHON = True
+    except ImportError:
+        logger.warning("fate_utils.histogram is not available, using the python indexer")
+        INDEXER_USE_PYTHON = True
 
 if INDEXER_USE_PYTHON:
     from ._indexer import HistogramIndexer, Shuffler
-# else:
-#     from fate_utils.histogram import HistogramIndexer, Shuffler
 
 __all__ = ["HistogramIndexer", "Shuffler"]
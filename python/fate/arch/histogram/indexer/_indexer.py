@@ -42,15 +42,21 @@ class Shuffler:
         index = torch.hstack([index + (nid * self.node_size) for nid, index in enumerate(self._get_perm_indexes())])
         return index
 
-    def get_shuffle_index(self, step, reverse=False):
-        """
-        get chunk shuffle index
-        """
+    def _get_shuffle_index_tensor(self, step, reverse=False):
         stepped = torch.arange(0, self.num_node * self.node_size * step).reshape(self.num_node * self.node_size, step)
         indexes = stepped[self._get_global_perm_index(), :].flatten()
         if reverse:
             indexes = torch.argsort(indexes)
-        return indexes.detach().cpu().tolist()
+        return indexes
+
+    def get_shuffle_index(self, step, reverse=False):
+        """
+        get chunk shuffle index
+        """
+        return self._get_shuffle_index_tensor(step, reverse).detach().cpu().tolist()
+
+    def get_shuffle_index_array(self, step, reverse=False):
+        return self._get_shuffle_index_tensor(step, reverse).detach().cpu().numpy()
 
     def get_reverse_indexes(self, step, indexes):
         mapping = self.get_shuffle_index(step, reverse=False)
@@ -92,7 +98,8 @@ class HistogramIndexer:
     which means the bin_size of each feature is not necessary to be the same but the sum of all feature_bin_sizes
     should be the same.
 
-    Notes: This class will be rewritten in rust in the future.
+    Notes: `fate_utils.histogram.HistogramIndexer` is the native implementation of this class, this one is
+    kept as fallback and as reference for parity tests.
     """
 
     def __init__(self, node_size: int, feature_bin_sizes: List[int]):
@@ -156,6 +163,42 @@ class HistogramIndexer:
             positions.append([self.get_position(nid, fid, bid) for fid, bid in enumerate(bids)])
         return positions
 
+    def get_positions_array(self, nids: np.ndarray, bids: np.ndarray) -> np.ndarray:
+        """
+        array version of `get_positions`
+        Args:
+            nids: int64 node ids with shape (n,)
+            bids: int64 bin ids with shape (n, feature_size)
+
+        Returns: data positions, int64 array with shape (n, feature_size)
+        """
+        assert len(nids) == len(bids), f"nids length {len(nids)} is not equal to bids length {len(bids)}"
+        return nids.reshape(-1, 1) * self.node_axis_stride + self.feature_axis_stride[: bids.shape[1]] + bids
+
+    def get_positions_array_with_node_mapping(
+        self, nids: np.ndarray, bids: np.ndarray, node_mapping: Dict[int, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        array version of `get_positions_with_node_mapping`
+        Args:
+            nids: int64 node ids with shape (n,)
+            bids: int64 bin ids with shape (n, feature_size)
+            node_mapping: node mapping
+
+        Returns: data positions of the mapped rows and the boolean row masks
+        """
+        assert len(nids) == len(bids), f"nids length {len(nids)} is not equal to bids length {len(bids)}"
+        if len(node_mapping) == 0:
+            masks = np.zeros(len(nids), dtype=bool)
+            return bids[masks], masks
+        keys = np.fromiter(node_mapping.keys(), dtype=np.int64, count=len(node_mapping))
+        values = np.fromiter(node_mapping.values(), dtype=np.int64, count=len(node_mapping))
+        order = np.argsort(keys)
+        keys, values = keys[order], values[order]
+        index = np.minimum(np.searchsorted(keys, nids), len(keys) - 1)
+        masks = keys[index] == nids
+        return self.get_positions_array(values[index[masks]], bids[masks]), masks
+
     def get_reverse_position(self, position) -> Tuple[int, int, int]:
         """
         get node_id, feature_id, bin_id by data position
@@ -104,12 +104,30 @@ class HistogramPlainValues(HistogramValues):
             value = value.to(data.dtype)
         data.scatter_add_(0, index, value)
 
+    def i_update_vectorized(self, value, positions: torch.Tensor):
+        num_features = positions.shape[1]
+        index = positions.flatten()
+        if self.stride == 1:
+            data = self.data
+            value = value.view(-1, 1).expand(-1, num_features).flatten()
+        else:
+            data = self.data.view(-1, self.stride)
+            value = value.view(-1, self.stride).unsqueeze(1).expand(-1, num_features, self.stride)
+            value = value.reshape(-1, self.stride)
+        if self.data.dtype != value.dtype:
+            logger.warning(f"update value dtype {value.dtype} is not equal to data dtype {self.data.dtype}")
+            value = value.to(data.dtype)
+        data.index_add_(0, index, value)
+
+    def i_update_vectorized_with_masks(self, value, positions: torch.Tensor, masks: torch.Tensor):
+        self.i_update_vectorized(value.view(-1, self.stride)[masks], positions)
+
     def i_shuffle(self, shuffler: "Shuffler", reverse=False):
-        indices = shuffler.get_shuffle_index(step=self.stride, reverse=reverse)
+        indices = torch.from_numpy(shuffler.get_shuffle_index_array(step=self.stride, reverse=reverse))
         self.data = self.data[indices]
 
     def shuffle(self, shuffler: "Shuffler", reverse=False):
-        indices = shuffler.get_shuffle_index(step=self.stride, reverse=reverse)
+        indices = torch.from_numpy(shuffler.get_shuffle_index_array(step=self.stride, reverse=reverse))
         data = self.data[indices]
         return HistogramPlainValues(data, self.dtype, self.size, self.stride)
 
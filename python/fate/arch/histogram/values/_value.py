@@ -32,6 +32,13 @@ class HistogramValues:
     def i_update_with_masks(self, value, positions, masks):
         raise NotImplementedError
 
+    def i_update_vectorized(self, value, positions):
+        # backends without tensor support consume plain nested lists
+        return self.i_update(value, positions.tolist())
+
+    def i_update_vectorized_with_masks(self, value, positions, masks):
+        return self.i_update_with_masks(value, positions.tolist(), masks.tolist())
+
     def iadd(self, other):
         raise NotImplementedError
 
@@ -63,6 +63,16 @@ class HistogramValuesContainer(object):
             self._data[name].i_update_with_masks(value, positions, masks)
         return self
 
+    def i_update_vectorized(self, targets, positions):
+        for name, value in targets.items():
+            self._data[name].i_update_vectorized(value, positions)
+        return self
+
+    def i_update_vectorized_with_masks(self, targets, positions, masks):
+        for name, value in targets.items():
+            self._data[name].i_update_vectorized_with_masks(value, positions, masks)
+        return self
+
     def iadd(self, other: "HistogramValuesContainer"):
         for name, values in other._data.items():
             if name in self._data:
@@ -382,8 +382,20 @@ def trace_once():
     get_default_provider().trace_once()
 
 
-def fill_cache():
-    get_default_provider().fill_cache()
+def fill_cache(ctx=None):
+    get_default_provider().fill_cache(ctx)
+
+
+def save_cache(filepath=None):
+    get_default_provider().save_cache(filepath=filepath)
+
+
+def load_cache(filepath=None):
+    get_default_provider().load_cache(filepath=filepath)
+
+
+def preprocess(ctx=None, filepath=None, repeats=1):
+    get_default_provider().preprocess(ctx, filepath=filepath, repeats=repeats)
 
 
 def ttp_required():
@@ -185,51 +185,66 @@ class Communicator:
     def scatter(self, scatter_list, src, size=None, async_op=False):
         raise NotImplementedError
 
-    def reduce(self, tensor, dst, op=None, async_op=False, group=None):
+    def reduce(self, input, dst, op=ReduceOp.SUM, batched=False, async_op=False, group=None):
+        """
+        reduce `input` of all ranks in group to `dst`, only `dst` gets the result.
+
+        with `batched=True`, `input` is a list of tensors sent to `dst` in one message
+        and reduced tensor by tensor. `dst` receives from all other ranks concurrently.
+        """
         if group is None:
             group = self.main_group
         if self.rank not in group.ranks:
             raise ValueError(f"rank {self.rank} not in group {group}")
+        if batched:
+            assert isinstance(input, list), "batched reduce input must be a list"
         recv_index = group.tensor_recv_index_inc()
         send_index = group.tensor_send_index_inc()
         if self.rank == dst:
-            for i in range(self.world_size):
-                if i != dst:
-                    tensor.add_(
-                        self._recv(
-                            index=recv_index,
-                            tensor=None,
-                            src=i,
-                            group=group,
-                        )
-                    )
-            return tensor
+            received = self._recv_many(
+                index=recv_index,
+                src_list=[rank for rank in group.ranks if rank != dst],
+                group=group,
+            )
+            if batched:
+                return [
+                    self._reduce([tensor.clone(), *[other[i] for other in received]], op)
+                    for i, tensor in enumerate(input)
+                ]
+            return self._reduce([input.clone(), *received], op)
         else:
             self._send(
                 index=send_index,
-                tensor=tensor,
+                tensor=input,
                 dst=dst,
                 group=group,
             )
             return None
 
     def all_reduce(self, input, op=ReduceOp.SUM, batched=False, group=None):
+        """
+        reduce `input` of all ranks in group, every rank gets the result.
+
+        with `batched=True`, `input` is a list of tensors exchanged in a single all_gather round
+        and reduced tensor by tensor.
+        """
         if group is None:
             group = self.main_group
         if batched:
             assert isinstance(input, list), "batched reduce input must be a list"
-            results = []
-            for tensor in input:
-                results.append(self.all_reduce(tensor, op, batched=False))
-            return results
+            gathered = self.all_gather(input, group=group, batched=True)
+            return [self._reduce(list(tensors), op) for tensors in zip(*gathered)]
         else:
-            ag = self.all_gather(input, group=group)
-            if op == torch.distributed.ReduceOp.SUM:
-                return self._sum(ag)
-            elif op == torch.distributed.ReduceOp.BXOR:
-                return functools.reduce(torch.bitwise_xor, ag)
-            else:
-                raise NotImplementedError(f"op {op} is not implemented")
+            return self._reduce(self.all_gather(input, group=group), op)
+
+    @classmethod
+    def _reduce(cls, tensor_list, op):
+        if op == ReduceOp.SUM:
+            return cls._sum(tensor_list)
+        elif op == ReduceOp.BXOR:
+            return functools.reduce(torch.bitwise_xor, tensor_list)
+        else:
+            raise NotImplementedError(f"op {op} is not implemented")
 
     @staticmethod
     def _sum(tensor_list):
@@ -242,68 +257,82 @@ class Communicator:
     def gather(self, tensor, dst, async_op=False):
         raise NotImplementedError
 
-    def all_gather(self, tensor, async_op=False, group=None):
+    def all_gather(self, tensor, async_op=False, group=None, batched=False):
+        """
+        gather `tensor` of all ranks in group, returns the gathered values in rank order.
+
+        with `batched=True`, `tensor` is a list of tensors sent in one message and each
+        gathered value is a list. The send to all peers overlaps with the receives.
+        """
         if async_op:
             raise NotImplementedError()
 
         if group is None:
             group = self.main_group
+        if batched:
+            assert isinstance(tensor, list), "batched all_gather input must be a list"
 
         send_index = group.tensor_send_index_inc()
-        self._send_many(
+        sending = self._pool.submit(
+            self._send_many,
             index=send_index,
             tensor=tensor,
-            dst_list=[rank for rank in range(self.world_size) if rank != self.rank],
+            dst_list=[rank for rank in group.ranks if rank != self.rank],
             group=group,
         )
         # self.barrier.wait()
         recv_index = group.tensor_recv_index_inc()
+        received = self._recv_many(
+            index=recv_index,
+            src_list=[rank for rank in group.ranks if rank != self.rank],
+            group=group,
+        )
+        sending.result()
         result = []
-        for i in range(self.world_size):
-            if i == self.rank:
-                result.append(tensor.clone())
+        for rank in group.ranks:
+            if rank == self.rank:
+                result.append([t.clone() for t in tensor] if batched else tensor.clone())
             else:
-                result.append(
-                    self._recv(
-                        index=recv_index,
-                        tensor=tensor.clone(),
-                        src=i,
-                        group=group,
-                    )
-                )
+                result.append(received.pop(0))
         return result
 
     def broadcast(self, input, src, group=None, batched=False):
+        """
+        broadcast `input` of `src` to all ranks in group.
+
+        with `batched=True`, `input` is a list of tensors sent in one message.
+        """
         self._assert_initialized()
         group = self.main_group if group is None else group
         if batched:
-            assert isinstance(input, list), "batched reduce input must be a list"
-            reqs = []
-            for tensor in input:
-                reqs.append(self.broadcast(tensor.data, src, group=group, batched=False))
+            assert isinstance(input, list), "batched broadcast input must be a list"
+            input = [tensor.data for tensor in input]
+        send_index = group.tensor_send_index_inc()
+        recv_index = group.tensor_recv_index_inc()
+        if src == self.rank:
+            self._send_many(
+                index=send_index,
+                tensor=input,
+                dst_list=[rank for rank in group.ranks if rank != self.rank],
+                group=group,
+            )
+            return input
         else:
-            send_index = group.tensor_send_index_inc()
-            recv_index = group.tensor_recv_index_inc()
-            if src == self.rank:
-                self._send_many(
-                    index=send_index,
-                    tensor=input,
-                    dst_list=[rank for rank in group.ranks if rank != self.rank],
-                    group=group,
-                )
+            recv_tensor = self._recv(
+                index=recv_index,
+                tensor=None,
+                src=src,
+                group=group,
+            )
+            if batched:
+                for tensor, received in zip(input, recv_tensor):
+                    tensor.copy_(received)
+                return input
+            if input is not None:
+                input.copy_(recv_tensor)
                 return input
             else:
-                recv_tensor = self._recv(
-                    index=recv_index,
-                    tensor=input,
-                    src=src,
-                    group=group,
-                )
-                if input is not None:
-                    input.copy_(recv_tensor)
-                    return input
-                else:
-                    return recv_tensor
+                return recv_tensor
 
     def broadcast_obj(self, src, obj=None, group=None):
         self._assert_initialized()
@@ -414,6 +443,11 @@ class Communicator:
         got_obj = parties.get(group.namespace_obj.indexed_ns(index).federation_tag)[0]
         return got_obj
 
+    def _recv_many(self, index, src_list, group=None):
+        # receive from all sources concurrently, so a slow peer does not delay the others
+        futures = [self._pool.submit(self._recv, index, None, src, group=group) for src in src_list]
+        return [future.result() for future in futures]
+
     def _send_many(self, index, tensor, dst_list, group=None):
         if group is None:
             group = self.main_group
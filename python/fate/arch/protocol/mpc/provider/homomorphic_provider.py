@@ -5,28 +5,146 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import torch
+
+import fate.arch.protocol.mpc.communicator as comm
+from fate.arch.protocol.mpc.common.rng import generate_kbit_random_tensor, generate_random_ring_element
+from fate.arch.protocol.mpc.primitives import ArithmeticSharedTensor, BinarySharedTensor
 from .provider import TupleProvider
 
+_LIMB_BITS = 32
+_LIMB_MASK = (1 << _LIMB_BITS) - 1
+_RING_BITS = 64
+
 
 class HomomorphicProvider(TupleProvider):
+    """
+    Two-party tuple provider without a trusted dealer.
+
+    Each party samples its own shares of a and b, the cross terms of c = op(a, b) are
+    computed on the peer's ciphertexts under the PHE cipher of the encrypting party.
+    """
+
     NAME = "HE"
 
-    def generate_additive_triple(self, size0, size1, op, *args, **kwargs):
+    def __init__(self):
+        super().__init__()
+        self._phe_cipher = None
+        self._phe_ctx = None
+
+    def generate_additive_triple(self, ctx, size0, size1, op, device=None, *args, **kwargs):
         """Generate multiplicative triples of given sizes"""
-        raise NotImplementedError("HomomorphicProvider not implemented")
+        if op not in {"mul", "matmul"}:
+            raise NotImplementedError(f"HomomorphicProvider does not support triples for {op}")
+        func = getattr(torch, op)
+        a = generate_random_ring_element(ctx, size0, device=device)
+        b = generate_random_ring_element(ctx, size1, device=device)
+        # sums of products in matmul would overflow what decryption can reduce to the ring
+        c = func(a, b) + self._cross_share(ctx, a, b, func, limbs=op == "matmul")
 
-    def square(self, size):
+        a = ArithmeticSharedTensor.from_shares(ctx, a, precision=0)
+        b = ArithmeticSharedTensor.from_shares(ctx, b, precision=0)
+        c = ArithmeticSharedTensor.from_shares(ctx, c, precision=0)
+        return a, b, c
+
+    def square(self, ctx, size, device=None):
         """Generate square double of given size"""
-        raise NotImplementedError("HomomorphicProvider not implemented")
+        r = generate_random_ring_element(ctx, size, device=device)
+        r2 = r * r + self._cross_share(ctx, r, r, torch.mul, limbs=False)
+
+        r = ArithmeticSharedTensor.from_shares(ctx, r, precision=0)
+        r2 = ArithmeticSharedTensor.from_shares(ctx, r2, precision=0)
+        return r, r2
 
-    def generate_xor_triple(self, size0, size1):
+    def generate_binary_triple(self, size0, size1, device=None):
         """Generate xor triples of given size"""
-        raise NotImplementedError("HomomorphicProvider not implemented")
+        ctx = comm.get().ctx
+        a = generate_random_ring_element(ctx, size0, device=device)
+        b = generate_random_ring_element(ctx, size1, device=device)
+        # the cross terms of a & b are computed bit by bit, a bit's arithmetic share mod 2 is its xor share
+        a_bits, b_bits = self._to_bits(a), self._to_bits(b)
+        cross = self._cross_share(ctx, a_bits, b_bits, torch.mul, limbs=False)
+        c = (a & b) ^ self._from_bits(cross)
 
-    def wrap_rng(self, size, num_parties):
+        a = BinarySharedTensor.from_shares(a)
+        b = BinarySharedTensor.from_shares(b)
+        c = BinarySharedTensor.from_shares(c)
+        return a, b, c
+
+    def wrap_rng(self, size, device=None):
         """Generate random shared tensor of given size and sharing of its wraps"""
-        raise NotImplementedError("HomomorphicProvider not implemented")
+        raise NotImplementedError(
+            "HomomorphicProvider wrap_rng not implemented, wraps are only used by more than two parties"
+        )
 
-    def B2A_rng(self, size):
+    def B2A_rng(self, size, device=None):
         """Generate random bit tensor as arithmetic and binary shared tensors"""
-        raise NotImplementedError("HomomorphicProvider not implemented")
+        ctx = comm.get().ctx
+        r = generate_kbit_random_tensor(size, bitlength=1, device=device)
+        # r0 ^ r1 = r0 + r1 - 2 * r0 * r1
+        rA = r - self._cross_share(ctx, r, r, torch.mul, limbs=False)
+
+        rA = ArithmeticSharedTensor.from_shares(ctx, rA, precision=0)
+        rB = BinarySharedTensor.from_shares(r)
+        return rA, rB
+
+    def _get_phe_cipher(self, ctx):
+        if self._phe_cipher is None or self._phe_ctx is not ctx:
+            self._phe_cipher = ctx.cipher.phe.setup()
+            self._phe_ctx = ctx
+        return self._phe_cipher
+
+    def _cross_share(self, ctx, x, y, op, limbs):
+        """
+        Returns the local share of op(x_0, y_1) + op(x_1, y_0), x_i and y_i being the tensors of rank i.
+
+        Each party encrypts its x and sends it to the peer, which computes op(x_peer, y) under
+        encryption, subtracts a random mask it keeps as its share and sends the result back
+        to be decrypted. Decryption reduces the plaintext to the ring as long as it fits in
+        128 bits, with `limbs` x and y are split into 32 bit halves to keep sums of products
+        within that range.
+        """
+        if comm.get().get_world_size() != 2:
+            raise NotImplementedError("HomomorphicProvider only supports two parties")
+        cipher = self._get_phe_cipher(ctx)
+        encryptor = cipher.get_tensor_encryptor()
+        if limbs:
+            x_peer = self._exchange([encryptor.encrypt_tensor(limb) for limb in self._to_limbs(x)])
+            (x_lo, x_hi), (y_lo, y_hi) = x_peer, self._to_limbs(y)
+            products = [op(x_lo, y_lo), op(x_hi, y_lo) + op(x_lo, y_hi)]
+        else:
+            x_peer = self._exchange([encryptor.encrypt_tensor(x)])
+            products = [op(x_peer[0], y)]
+
+        masks = [generate_random_ring_element(ctx, product.shape, device=y.device) for product in products]
+        masked = self._exchange([product - mask for product, mask in zip(products, masks)])
+        decryptor = cipher.get_tensor_decryptor()
+        shares = [mask + decryptor.decrypt_tensor(value) for mask, value in zip(masks, masked)]
+        if limbs:
+            return shares[0] + (shares[1] << _LIMB_BITS)
+        return shares[0]
+
+    @staticmethod
+    def _exchange(obj):
+        """Sends `obj` to the peer and returns the peer's"""
+        communicator = comm.get()
+        received = None
+        for src in range(2):
+            got = communicator.broadcast_obj(src, obj if src == communicator.get_rank() else None)
+            if src != communicator.get_rank():
+                received = got
+        return received
+
+    @staticmethod
+    def _to_limbs(x):
+        return [x & _LIMB_MASK, (x >> _LIMB_BITS) & _LIMB_MASK]
+
+    @staticmethod
+    def _to_bits(x):
+        shifts = torch.arange(_RING_BITS, device=x.device).view(-1, *([1] * x.dim()))
+        return (x.unsqueeze(0) >> shifts) & 1
+
+    @staticmethod
+    def _from_bits(bits):
+        shifts = torch.arange(_RING_BITS, device=bits.device).view(-1, *([1] * (bits.dim() - 1)))
+        return ((bits & 1) << shifts).sum(dim=0)
@@ -5,11 +5,16 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import logging
 import os
 
 import torch
 
 import fate.arch.protocol.mpc.communicator as comm
+from fate.arch.context import Context
+from fate.arch.protocol.mpc.primitives import ArithmeticSharedTensor, BinarySharedTensor
+
+logger = logging.getLogger(__name__)
 
 
 class TupleProvider:
@@ -20,13 +25,25 @@ class TupleProvider:
         "wrap_rng",
         "B2A_rng",
     ]
+    # functions taking the context as first argument, the context is not part of a request
+    CONTEXT_FUNCTIONS = ["generate_additive_triple", "square"]
+    # share types of the returned tuples: "A" for arithmetic, "B" for binary
+    RESULT_TYPES = {
+        "generate_additive_triple": "AAA",
+        "square": "AA",
+        "generate_binary_triple": "BBB",
+        "wrap_rng": "AA",
+        "B2A_rng": "AB",
+    }
 
     _DEFAULT_CACHE_PATH = os.path.normpath(os.path.join(__file__, "../tuple_cache/"))
 
     def __init__(self):
         self.tracing = False
         self.request_cache = []
+        # request -> list of stacked shares, one tensor per element of the tuple
         self.tuple_cache = {}
+        self._tuple_cursor = {}
 
     @property
     def rank(self):
@@ -54,42 +71,65 @@ class TupleProvider:
         """Sets tracing attribute True only if the request cache is empty.
         If `trace_once()` is called again, it sets tracing attribute to False
         """
-        untraced = self.request_cache.empty()
+        untraced = len(self.request_cache) == 0
         self.trace(tracing=untraced)
 
+    @staticmethod
+    def _request(func_name, args, kwargs):
+        """the context is dropped so that requests can be saved and matched across runs"""
+        return func_name, tuple(arg for arg in args if not isinstance(arg, Context)), kwargs
+
+    @classmethod
+    def _request_key(cls, func_name, args, kwargs):
+        func_name, args, kwargs = cls._request(func_name, args, kwargs)
+        return func_name, args, frozenset(kwargs.items())
+
     def _save_requests(self, filepath=None):
         # TODO: Deal with any overwrite issues
         if len(self.request_cache) == 0:
-            crypten.log("Request cache not saved - cache is empty")
+            logger.info("Request cache not saved - cache is empty")
             return
         filepath = self._get_request_path(prefix=filepath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
         torch.save(self.request_cache, filepath)
         self.request_cache = []
 
-    def _load_requests(self, filepath=None):
+    def _load_requests(self, filepath=None, remove=True):
         filepath = self._get_request_path(prefix=filepath)
         if os.path.exists(filepath):
-            self.request_cache = torch.load(filepath)
-            os.remove(filepath)
+            self.request_cache = torch.load(filepath, weights_only=False)
+            if remove:
+                os.remove(filepath)
         else:
-            crypten.log(f"Cache requests not loaded - File `{filepath}` not found")
+            logger.warning(f"Cache requests not loaded - File `{filepath}` not found")
 
     def _save_tuples(self, filepath=None):
         # TODO: Deal with any overwrite issues
-        if len(self.tuple_cache) == 0:
-            crypten.log("Tuple cache not saved - cache is empty")
+        tuples = {}
+        for request, stacked in self.tuple_cache.items():
+            cursor = self._tuple_cursor.get(request, 0)
+            if cursor < len(stacked[0]):
+                # copy out the unconsumed tuples, slicing alone would save the whole storage
+                tuples[request] = [shares[cursor:].clone() if cursor else shares for shares in stacked]
+        if len(tuples) == 0:
+            logger.info("Tuple cache not saved - cache is empty")
             return
         filepath = self._get_tuple_path(prefix=filepath)
-        torch.save(self.tuple_cache, filepath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        torch.save(tuples, filepath)
         self.tuple_cache = {}
+        self._tuple_cursor = {}
 
     def _load_tuples(self, filepath=None):
         filepath = self._get_tuple_path(prefix=filepath)
         if os.path.exists(filepath):
-            self.tuple_cache = torch.load(filepath)
+            # tuples are memory mapped and only read when consumed, the file is removed
+            # right away so that no tuple is ever used twice
+            self.tuple_cache = torch.load(filepath, mmap=True, weights_only=False)
+            self._tuple_cursor = {}
             os.remove(filepath)
         else:
-            crypten.log(f"Tuple cache not loaded - File `{filepath}` not found")
+            logger.warning(f"Tuple cache not loaded - File `{filepath}` not found")
 
     def save_cache(self, filepath=None):
         """Saves request and tuple cache to a file.
@@ -118,8 +158,7 @@ class TupleProvider:
         if self.tracing:
 
             def func_with_trace(*args, **kwargs):
-                request = (func_name, args, kwargs)
-                self.request_cache.append(request)
+                self.request_cache.append(self._request(func_name, args, kwargs))
                 return object.__getattribute__(self, func_name)(*args, **kwargs)
 
             return func_with_trace
@@ -130,29 +169,79 @@ class TupleProvider:
 
         # Return results from cache if available
         def func_from_cache(*args, **kwargs):
-            hashable_kwargs = frozenset(kwargs.items())
-            request = (func_name, args, hashable_kwargs)
-            # Read from cache
-            if request in self.tuple_cache.keys():
-                return self.tuple_cache[request].pop()
+            shares = self._pop_tuple(self._request_key(func_name, args, kwargs))
+            if shares is not None:
+                ctx = next((arg for arg in args if isinstance(arg, Context)), None)
+                return self._from_shares(func_name, shares, ctx)
             # Cache miss
             return object.__getattribute__(self, func_name)(*args, **kwargs)
 
         return func_from_cache
 
-    def fill_cache(self):
-        """Fills tuple_cache with tuples requested in the request_cache"""
+    def _pop_tuple(self, request):
+        if request not in self.tuple_cache:
+            return None
+        stacked = self.tuple_cache[request]
+        cursor = self._tuple_cursor.get(request, 0)
+        if cursor >= len(stacked[0]):
+            return None
+        self._tuple_cursor[request] = cursor + 1
+        return [shares[cursor].clone() for shares in stacked]
+
+    def _from_shares(self, func_name, shares, ctx=None):
+        if ctx is None:
+            ctx = comm.get().ctx
+        result = []
+        for share_type, share in zip(self.RESULT_TYPES[func_name], shares):
+            if share_type == "A":
+                result.append(ArithmeticSharedTensor.from_shares(ctx, share, precision=0))
+            else:
+                result.append(BinarySharedTensor.from_shares(share))
+        return tuple(result)
+
+    def fill_cache(self, ctx=None):
+        """Fills tuple_cache with tuples requested in the request_cache
+
+        args:
+            ctx - context passed to the functions taking one (default: the communicator's context)
+        """
+        if ctx is None:
+            ctx = comm.get().ctx
         # TODO: parallelize / async this
+        filled = {}
         for request in self.request_cache:
             func_name, args, kwargs = request
+            if func_name in TupleProvider.CONTEXT_FUNCTIONS:
+                args = (ctx, *args)
             result = object.__getattribute__(self, func_name)(*args, **kwargs)
+            shares = [tensor.share for tensor in result]
+            filled.setdefault(self._request_key(func_name, args, kwargs), []).append(shares)
 
-            hashable_kwargs = frozenset(kwargs.items())
-            hashable_request = (func_name, args, hashable_kwargs)
-            if hashable_request in self.tuple_cache.keys():
-                self.tuple_cache[hashable_request].append(result)
-            else:
-                self.tuple_cache[hashable_request] = [result]
+        for request, tuples in filled.items():
+            stacked = [torch.stack(shares) for shares in zip(*tuples)]
+            cursor = self._tuple_cursor.pop(request, 0)
+            if request in self.tuple_cache:
+                stacked = [
+                    torch.cat([cached[cursor:], shares]) for cached, shares in zip(self.tuple_cache[request], stacked)
+                ]
+            self.tuple_cache[request] = stacked
+
+    def preprocess(self, ctx=None, filepath=None, repeats=1):
+        """Offline phase: generates the tuples of a traced run ahead of the online phase.
+
+        Loads the requests saved by `save_cache` after a traced run, generates the tuples
+        for `repeats` such runs and saves them to the tuple cache read by `load_cache`.
+
+        args:
+            ctx - context passed to the functions taking one (default: the communicator's context)
+            filepath - base filepath for cache folder (default: "provider/tuple_cache/")
+            repeats - number of times the traced requests are generated
+        """
+        self._load_requests(filepath=filepath, remove=False)
+        self.request_cache = self.request_cache * repeats
+        self.fill_cache(ctx)
+        self.request_cache = []
+        self._save_tuples(filepath=filepath)
 
     def generate_additive_triple(self, size0, size1, op, device=None, *args, **kwargs):
         """Generate multiplicative triples of given sizes"""
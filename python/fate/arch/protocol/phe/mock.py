@@ -45,6 +45,9 @@ class SK:
     def __init__(self):
         ...
 
+    def set_num_threads(self, num_threads: int):
+        ...
+
     def decrypt_to_encoded(self, vec: EV) -> FV:
         return FV(vec.data)
 
@@ -53,12 +56,24 @@ class PK:
     def __init__(self):
         ...
 
+    def set_num_threads(self, num_threads: int):
+        ...
+
     def encrypt_encoded(self, vec: FV, obfuscate: bool) -> EV:
         return EV(vec.data)
 
     def encrypt_encoded_scalar(self, val, obfuscate) -> EV:
         return EV(val)
 
+    def start_obfuscator_pool(self, pool_size: int, num_threads: int):
+        ...
+
+    def stop_obfuscator_pool(self):
+        ...
+
+    def obfuscator_pool_stats(self) -> Optional[Tuple[int, int, int]]:
+        return None
+
 
 class Coder:
     def __init__(self):
@@ -23,7 +23,7 @@ from fate_utils.paillier import PK as _PK
 from fate_utils.paillier import SK as _SK
 from fate_utils.paillier import keygen as _keygen
 
-from .type import TensorEvaluator
+from .type import MIN_PARALLEL_CHUNK_SIZE, TensorEvaluator
 
 V = torch.Tensor
 EV = CiphertextVector
@@ -31,23 +31,50 @@ FV = PlaintextVector
 
 
 class SK:
-    def __init__(self, sk: _SK):
+    def __init__(self, sk: _SK, num_threads: int = 1):
         self.sk = sk
+        self.num_threads = num_threads
+
+    def set_num_threads(self, num_threads: int):
+        """
+        number of threads used to decrypt a vector, 0 means all cores, 1 means sequential
+        """
+        self.num_threads = num_threads
 
     def decrypt_to_encoded(self, vec: EV) -> FV:
+        if self.num_threads != 1:
+            return self.sk.decrypt_to_encoded_par(vec, self.num_threads, MIN_PARALLEL_CHUNK_SIZE)
         return self.sk.decrypt_to_encoded(vec)
 
 
 class PK:
-    def __init__(self, pk: _PK):
+    def __init__(self, pk: _PK, num_threads: int = 1):
         self.pk = pk
+        self.num_threads = num_threads
+
+    def set_num_threads(self, num_threads: int):
+        """
+        number of threads used to encrypt a vector, 0 means all cores, 1 means sequential
+        """
+        self.num_threads = num_threads
 
     def encrypt_encoded(self, vec: FV, obfuscate: bool) -> EV:
+        if self.num_threads != 1:
+            return self.pk.encrypt_encoded_par(vec, obfuscate, self.num_threads, MIN_PARALLEL_CHUNK_SIZE)
         return self.pk.encrypt_encoded(vec, obfuscate)
 
     def encrypt_encoded_scalar(self, val, obfuscate) -> EV:
         return self.pk.encrypt_encoded_scalar(val, obfuscate)
 
+    def start_obfuscator_pool(self, pool_size: int, num_threads: int):
+        self.pk.start_obfuscator_pool(pool_size, num_threads)
+
+    def stop_obfuscator_pool(self):
+        self.pk.stop_obfuscator_pool()
+
+    def obfuscator_pool_stats(self) -> Optional[Tuple[int, int, int]]:
+        return self.pk.obfuscator_pool_stats()
+
 
 class Coder:
     def __init__(self, coder: _Coder):
@@ -20,6 +20,9 @@ V = TypeVar("V")
 PK = TypeVar("PK")
 Coder = TypeVar("Coder")
 
+# vectors shorter than this are not worth splitting across threads
+MIN_PARALLEL_CHUNK_SIZE = 64
+
 
 class TensorEvaluator(Generic[EV, V, PK, Coder]):
     @staticmethod
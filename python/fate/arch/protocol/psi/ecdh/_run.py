@@ -95,7 +95,7 @@ def guest_run(ctx, df: DataFrame, curve_type="curve25519", **kwargs):
     guest_first_sign_match_id = match_id.mapValues(encrypt_func)
     ctx.hosts.put(GUEST_FIRST_SIGN, guest_first_sign_match_id)
 
-    host_first_sign_match_ids = ctx.hosts.get(HOST_FIRST_SIGN)
+    host_first_sign_match_ids = ctx.hosts.gather(HOST_FIRST_SIGN)
     host_second_sign_match_ids = []
 
     dh_func = functools.partial(_diffie_hellman, curve=curve)
@@ -14,3 +14,4 @@
 #  limitations under the License.
 
 from ._op_quantile import GKSummary
+from ._op_moments import MomentSummary
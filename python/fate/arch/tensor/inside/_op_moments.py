@@ -0,0 +1,171 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import List, Union
+
+import numpy
+import torch
+
+
+class MomentSummary:
+    """
+    MomentSummary is a mergeable summary of columns: count, nan count, sum, min, max and the central moments
+    up to the 4th order. NaN values are skipped.
+
+    Summaries of disjoint row blocks are merged with the pairwise update formulas of Chan et al. and Pébay,
+    which stay numerically stable where the naive power sums cancel catastrophically.
+
+    Examples:
+        >>> summary = MomentSummary(2)
+        >>> summary += torch.tensor([[1.0, 2.0], [3.0, 4.0]])
+        >>> summary2 = MomentSummary(2)
+        >>> summary2 += torch.tensor([[5.0, float("nan")]])
+        >>> summary = summary + summary2
+        >>> summary.mean
+        array([3., 3.])
+    """
+
+    def __init__(self, num_columns: int) -> None:
+        self.count = numpy.zeros(num_columns, dtype=numpy.int64)
+        self.nan_count = numpy.zeros(num_columns, dtype=numpy.int64)
+        self.sum = numpy.zeros(num_columns, dtype=numpy.float64)
+        self.min = numpy.full(num_columns, numpy.inf)
+        self.max = numpy.full(num_columns, -numpy.inf)
+        self.mean = numpy.zeros(num_columns, dtype=numpy.float64)
+        self.m2 = numpy.zeros(num_columns, dtype=numpy.float64)
+        self.m3 = numpy.zeros(num_columns, dtype=numpy.float64)
+        self.m4 = numpy.zeros(num_columns, dtype=numpy.float64)
+
+    @classmethod
+    def from_array(cls, array: Union[torch.Tensor, numpy.ndarray]) -> "MomentSummary":
+        """summary of a 2-D array with shape (num_rows, num_columns)."""
+        if isinstance(array, torch.Tensor):
+            array = array.detach().numpy()
+        array = numpy.asarray(array, dtype=numpy.float64)
+        summary = cls(array.shape[1])
+        mask = ~numpy.isnan(array)
+        summary.count = mask.sum(axis=0)
+        summary.nan_count = array.shape[0] - summary.count
+        summary.sum = numpy.where(mask, array, 0.0).sum(axis=0)
+        summary.min = numpy.where(mask, array, numpy.inf).min(axis=0, initial=numpy.inf)
+        summary.max = numpy.where(mask, array, -numpy.inf).max(axis=0, initial=-numpy.inf)
+        summary.mean = summary.sum / numpy.maximum(summary.count, 1)
+        delta = numpy.where(mask, array - summary.mean, 0.0)
+        delta2 = delta * delta
+        summary.m2 = delta2.sum(axis=0)
+        summary.m3 = (delta2 * delta).sum(axis=0)
+        summary.m4 = (delta2 * delta2).sum(axis=0)
+        return summary
+
+    @classmethod
+    def from_csr(cls, matrix) -> "MomentSummary":
+        """
+        summary of a scipy sparse matrix, implicit entries are counted as zeros without densifying:
+        every central moment is the sum over stored values plus `num_zeros * (-mean) ** k`.
+        """
+        matrix = matrix.tocsr()
+        num_rows, num_columns = matrix.shape
+        summary = cls(num_columns)
+        data = numpy.asarray(matrix.data, dtype=numpy.float64)
+        columns = matrix.indices
+        mask = ~numpy.isnan(data)
+        data, columns = data[mask], columns[mask]
+
+        stored = numpy.bincount(columns, minlength=num_columns)
+        summary.nan_count = numpy.bincount(matrix.indices[~mask], minlength=num_columns)
+        summary.count = num_rows - summary.nan_count
+        num_zeros = summary.count - stored
+        summary.sum = numpy.bincount(columns, weights=data, minlength=num_columns)
+        summary.min = numpy.full(num_columns, numpy.inf)
+        numpy.minimum.at(summary.min, columns, data)
+        summary.max = numpy.full(num_columns, -numpy.inf)
+        numpy.maximum.at(summary.max, columns, data)
+        summary.min = numpy.where(num_zeros > 0, numpy.minimum(summary.min, 0.0), summary.min)
+        summary.max = numpy.where(num_zeros > 0, numpy.maximum(summary.max, 0.0), summary.max)
+        summary.mean = summary.sum / numpy.maximum(summary.count, 1)
+
+        delta = data - summary.mean[columns]
+        delta2 = delta * delta
+        zero_delta = -summary.mean
+        zero_delta2 = zero_delta * zero_delta
+        summary.m2 = numpy.bincount(columns, weights=delta2, minlength=num_columns) + num_zeros * zero_delta2
+        summary.m3 = (
+            numpy.bincount(columns, weights=delta2 * delta, minlength=num_columns)
+            + num_zeros * zero_delta2 * zero_delta
+        )
+        summary.m4 = (
+            numpy.bincount(columns, weights=delta2 * delta2, minlength=num_columns)
+            + num_zeros * zero_delta2 * zero_delta2
+        )
+        return summary
+
+    @classmethod
+    def concat(cls, summaries: List["MomentSummary"]) -> "MomentSummary":
+        """concat summaries of disjoint column sets, columns keep the order of `summaries`."""
+        summary = cls(0)
+        for name in summary.__dict__:
+            setattr(summary, name, numpy.concatenate([getattr(s, name) for s in summaries]))
+        return summary
+
+    def take(self, indices) -> "MomentSummary":
+        """summary of the columns at `indices`."""
+        summary = MomentSummary(0)
+        for name, value in self.__dict__.items():
+            setattr(summary, name, value[indices])
+        return summary
+
+    def merge(self, other: "MomentSummary") -> "MomentSummary":
+        """merge other summary into a new one."""
+        na, nb = self.count.astype(numpy.float64), other.count.astype(numpy.float64)
+        n = na + nb
+        n_safe = numpy.maximum(n, 1)
+        delta = other.mean - self.mean
+        delta_n = delta / n_safe
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * na * nb
+
+        merged = MomentSummary(len(self.count))
+        merged.count = self.count + other.count
+        merged.nan_count = self.nan_count + other.nan_count
+        merged.sum = self.sum + other.sum
+        merged.min = numpy.minimum(self.min, other.min)
+        merged.max = numpy.maximum(self.max, other.max)
+        merged.mean = self.mean + delta_n * nb
+        merged.m2 = self.m2 + other.m2 + term
+        merged.m3 = self.m3 + other.m3 + term * delta_n * (na - nb) + 3.0 * delta_n * (na * other.m2 - nb * self.m2)
+        merged.m4 = (
+            self.m4
+            + other.m4
+            + term * delta_n2 * (na * na - na * nb + nb * nb)
+            + 6.0 * delta_n2 * (na * na * other.m2 + nb * nb * self.m2)
+            + 4.0 * delta_n * (na * other.m3 - nb * self.m3)
+        )
+        return merged
+
+    def push(self, array: Union[torch.Tensor, numpy.ndarray]):
+        """push rows of a 2-D array into summary."""
+        merged = self.merge(MomentSummary.from_array(array))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    def __add__(self, other: "MomentSummary"):
+        if isinstance(other, MomentSummary):
+            return self.merge(other)
+        return NotImplemented
+
+    def __iadd__(self, other: Union[torch.Tensor, numpy.ndarray]):
+        if isinstance(other, torch.Tensor) or isinstance(other, numpy.ndarray):
+            return self.push(other)
+        return NotImplemented
@@ -133,6 +133,23 @@ class PHETensorEncryptor:
         coded = self._coder.encode(tensor)
         return self.encrypt_encoded(coded, obfuscate)
 
+    def start_obfuscator_pool(self, pool_size: int, num_threads: int = 1):
+        """
+        precompute up to `pool_size` obfuscators in `num_threads` background threads,
+        obfuscated encryptions of this party take them from the pool instead of computing them inline
+        """
+        self._pk.start_obfuscator_pool(pool_size, num_threads)
+
+    def stop_obfuscator_pool(self):
+        self._pk.stop_obfuscator_pool()
+
+    def obfuscator_pool_stats(self) -> typing.Optional[dict]:
+        stats = self._pk.obfuscator_pool_stats()
+        if stats is None:
+            return None
+        hits, misses, pooled = stats
+        return {"hits": hits, "misses": misses, "pooled": pooled}
+
     def lift(self, data, shape, dtype, device):
         from ._tensor import PHETensor
 
@@ -12,6 +12,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import functools
 import logging
 from typing import Dict
 from fate.arch import Context
@@ -20,6 +21,7 @@ import pandas as pd
 from fate.arch import Context
 from fate.components.core import ARBITER, GUEST, HOST, Role, cpn
 from fate.components.core.params import string_choice
+from fate.ml.evaluation.classification import ScoreHistogram
 from fate.ml.evaluation.tool import (
     get_binary_metrics,
     get_multi_metrics,
@@ -97,7 +99,44 @@ def evaluation(
     ctx.metrics.log_metrics(eval_rs, name="evaluation", type="evaluation")
 
 
+def score_histograms_by_type(input_datas, predict_col, label_col) -> Dict[str, ScoreHistogram]:
+    columns = [predict_col, label_col]
+    if "type" in input_datas.schema.columns:
+        columns.append("type")
+    fields_loc = input_datas.data_manager.loc_block(columns)
+    block_func = functools.partial(_block_score_histograms, fields_loc=fields_loc)
+    return input_datas.block_table.mapValues(block_func).reduce(_merge_score_histograms)
+
+
+def _block_score_histograms(blocks, fields_loc):
+    columns = [blocks[bid][:, offset] for bid, offset in fields_loc]
+    scores, labels = np.asarray(columns[0], dtype=np.float64), np.asarray(columns[1], dtype=np.float64)
+    if len(columns) == 2:
+        return {"origin": ScoreHistogram.from_scores(labels, scores)}
+
+    dataset_types = np.asarray(columns[2])
+    ret = {}
+    for dataset_type in np.unique(dataset_types):
+        mask = dataset_types == dataset_type
+        ret[dataset_type] = ScoreHistogram.from_scores(labels[mask], scores[mask])
+
+    return ret
+
+
+def _merge_score_histograms(histograms1, histograms2):
+    ret = dict(histograms1)
+    for dataset_type, histogram in histograms2.items():
+        ret[dataset_type] = ret[dataset_type].merge(histogram) if dataset_type in ret else histogram
+
+    return ret
+
+
 def evaluate(input_datas, metrics, predict_col, label_col):
+    if metrics.accept_score_histogram():
+        # binary metrics only need per score label counts, which are reduced over partitions instead of collected
+        histograms = score_histograms_by_type(input_datas, predict_col, label_col)
+        return {name: metrics(predict=histogram, label=None) for name, histogram in histograms.items()}
+
     data = input_datas.as_pd_df()
     split_dict = split_dataframe_by_type(data)
     rs_dict = {}
@@ -35,7 +35,10 @@ logger = logging.getLogger(__name__)
 
 
 class DataframeWriter(_ArtifactTypeWriter[DataOutputMetadata]):
-    def write(self, df: "DataFrame", name=None, namespace=None):
+    def write(self, df: "DataFrame", name=None, namespace=None, serialize_format="columnar"):
+        """
+        serialize_format: "columnar" keeps the raw buffers of blocks, "list" exports rows for external readers
+        """
         self.artifact.consumed()
         logger.debug(f"start writing dataframe to artifact: {self.artifact}, name={name}, namespace={namespace}")
         from fate.arch import dataframe
@@ -45,7 +48,7 @@ class DataframeWriter(_ArtifactTypeWriter[DataOutputMetadata]):
         if namespace is not None:
             self.artifact.metadata.namespace = namespace
 
-        table = dataframe.serialize(self.ctx, df)
+        table = dataframe.serialize(self.ctx, df, serialize_format=serialize_format)
         if "schema" not in self.artifact.metadata.metadata:
             self.artifact.metadata.metadata["schema"] = {}
         table.save(
@@ -22,6 +22,9 @@ from ._fields import string_choice
 class HEParam(pydantic.BaseModel):
     kind: string_choice(["paillier", "ou", "mock"])
     key_length: int = 1024
+    obfuscator_pool_size: int = 0
+    obfuscator_pool_threads: int = 1
+    num_threads: int = 1
 
 
 def he_param():
@@ -18,7 +18,13 @@ from typing import List
 from fate.arch import Context
 from fate.arch.dataframe import DataFrame
 import copy
-from fate.ml.ensemble.learner.decision_tree.tree_core.decision_tree import DecisionTree, _make_decision, Node
+from fate.ml.ensemble.learner.decision_tree.tree_core.decision_tree import (
+    DecisionTree,
+    _make_decision,
+    Node,
+    CompiledTree,
+    get_feature_matrix,
+)
 import functools
 from logging import getLogger
 
@@ -88,6 +94,38 @@ def traverse_tree(s: pd.Series, trees: List[List[Node]], sitename: str):
     return [new_sample_pos]
 
 
+def compile_trees(trees: List[List[Node]], sitename: str):
+    feature_names = []
+    for tree in trees:
+        feature_names.extend(CompiledTree.get_split_features(tree, sitename))
+    feature_names = list(dict.fromkeys(feature_names))
+    feature_index = dict(zip(feature_names, range(len(feature_names))))
+
+    return [CompiledTree(tree, sitename, feature_index) for tree in trees], feature_index
+
+
+def _get_pos_matrix(df: pd.DataFrame, name: str):
+    return np.array(df[name].tolist(), dtype=np.int64)
+
+
+def traverse_tree_block(df: pd.DataFrame, trees: List[CompiledTree], feature_index: dict, dtype=np.int64):
+    """
+    block version of `traverse_tree`, all samples of the block go down each tree at once
+    """
+    sample_pos = _get_pos_matrix(df, "sample_pos")
+    X = get_feature_matrix(df, feature_index)
+    new_sample_pos = np.empty_like(sample_pos)
+    for tree_idx, tree in enumerate(trees):
+        new_sample_pos[:, tree_idx] = tree.traverse(X, sample_pos[:, tree_idx])
+
+    return pd.DataFrame({"sample_pos": list(new_sample_pos.astype(dtype))})
+
+
+def _reach_leaf_block(df: pd.DataFrame):
+    all_reach_leaf = np.all(_get_pos_matrix(df, "sample_pos") < 0, axis=1)
+    return pd.DataFrame({"done": all_reach_leaf, "not_finished": ~all_reach_leaf})
+
+
 def _merge_pos_arr(s: pd.Series):
     arr_1 = s["sample_pos"]
     arr_2 = s["host_sample_pos"]
@@ -102,13 +140,24 @@ def _merge_pos_arr(s: pd.Series):
     return [merge_rs]
 
 
+def _merge_pos_arr_block(df: pd.DataFrame):
+    """
+    block version of `_merge_pos_arr`
+    """
+    arr_1 = _get_pos_matrix(df, "sample_pos")
+    arr_2 = _get_pos_matrix(df, "host_sample_pos")
+    updated = (arr_1 >= 0) & ((arr_2 < 0) | (arr_2 > arr_1))
+    merge_rs = np.where(updated, arr_2, arr_1)
+    return pd.DataFrame({"sample_pos": list(merge_rs)})
+
+
 def _merge_pos(guest_pos: DataFrame, host_pos: List[DataFrame]):
     for host_df in host_pos:
         # assert alignment
         indexer = guest_pos.get_indexer(target="sample_id")
         host_df = host_df.loc(indexer=indexer, preserve_order=True)
         stack_df = DataFrame.hstack([guest_pos, host_df])
-        guest_pos["sample_pos"] = stack_df.apply_row(_merge_pos_arr)
+        guest_pos["sample_pos"] = stack_df.apply_block(_merge_pos_arr_block)
 
     return guest_pos
 
@@ -124,6 +173,8 @@ def predict_leaf_guest(ctx: Context, trees: List[DecisionTree], data: DataFrame)
     result_sample_pos = sample_pos.empty_frame()
 
     sitename = ctx.local.name
+    compiled_trees, feature_index = compile_trees(tree_list, sitename)
+    pos_dtype = get_dtype(max_node_num)
 
     # start loop here
     comm_round = 0
@@ -136,16 +187,15 @@ def predict_leaf_guest(ctx: Context, trees: List[DecisionTree], data: DataFrame)
 
         sample_with_pos = DataFrame.hstack([predict_data, sample_pos])
         logger.info("predict round {} has {} samples to predict".format(comm_round, len(sample_with_pos)))
-        map_func = functools.partial(traverse_tree, trees=tree_list, sitename=sitename)
+        map_func = functools.partial(
+            traverse_tree_block, trees=compiled_trees, feature_index=feature_index, dtype=pos_dtype
+        )
         new_pos = sample_with_pos.create_frame()
-        new_pos["sample_pos"] = sample_with_pos.apply_row(map_func)
-        done_sample_idx = new_pos.apply_row(
-            lambda x: all_reach_leaf(x["sample_pos"])
-        )  # samples that reach leaf node in all trees
-        # not_finished_sample_idx = ~done_sample_idx
-        not_finished_sample_idx = new_pos.apply_row(
-            lambda x: not_finished(x["sample_pos"])
-        )  # samples that not reach leaf node in all trees
+        new_pos["sample_pos"] = sample_with_pos.apply_block(map_func)
+        # samples that reach leaf node in all trees, and samples that not
+        reach_leaf = new_pos.apply_block(_reach_leaf_block, columns=["done", "not_finished"])
+        done_sample_idx = reach_leaf.create_frame(columns=["done"])
+        not_finished_sample_idx = reach_leaf.create_frame(columns=["not_finished"])
 
         done_sample = new_pos.iloc(done_sample_idx)
         result_sample_pos = DataFrame.vstack([result_sample_pos, done_sample])
@@ -174,7 +224,11 @@ def predict_leaf_guest(ctx: Context, trees: List[DecisionTree], data: DataFrame)
 def predict_leaf_host(ctx: Context, trees: List[DecisionTree], data: DataFrame):
     tree_list = [tree.get_nodes() for tree in trees]
     sitename = ctx.local.name
-    map_func = functools.partial(traverse_tree, trees=tree_list, sitename=sitename)
+    max_node_num = max([len(tree) for tree in tree_list])
+    compiled_trees, feature_index = compile_trees(tree_list, sitename)
+    map_func = functools.partial(
+        traverse_tree_block, trees=compiled_trees, feature_index=feature_index, dtype=get_dtype(max_node_num)
+    )
 
     # help guest to traverse tree
     comm_round = 0
@@ -190,7 +244,7 @@ def predict_leaf_host(ctx: Context, trees: List[DecisionTree], data: DataFrame):
         sample_features = data.loc(pending_samples.get_indexer("sample_id"), preserve_order=True)
         sample_with_pos = DataFrame.hstack([sample_features, pending_samples])
         new_pos = sample_with_pos.create_frame()
-        new_pos["host_sample_pos"] = sample_with_pos.apply_row(map_func)
+        new_pos["host_sample_pos"] = sample_with_pos.apply_block(map_func)
         sub_ctx.guest.put("updated_pos", (new_pos))
         comm_round += 1
 
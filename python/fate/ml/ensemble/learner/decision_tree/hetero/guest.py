@@ -15,8 +15,8 @@
 from fate.ml.ensemble.learner.decision_tree.tree_core.decision_tree import (
     DecisionTree,
     Node,
-    _update_sample_pos_on_local_nodes,
-    _merge_sample_pos,
+    _update_sample_pos_on_local_nodes_block,
+    _merge_sample_pos_block,
 )
 from fate.ml.ensemble.learner.decision_tree.tree_core.hist import SBTHistogramBuilder
 from fate.ml.ensemble.learner.decision_tree.tree_core.splitter import SBTSplitter
@@ -164,22 +164,21 @@ class HeteroDecisionTreeGuest(DecisionTree):
         sitename = ctx.local.name
         data_with_pos = DataFrame.hstack([data, sample_pos])
         map_func = functools.partial(
-            _update_sample_pos_on_local_nodes, cur_layer_node=cur_layer_nodes, node_map=node_map, sitename=sitename
+            _update_sample_pos_on_local_nodes_block, cur_layer_node=cur_layer_nodes, sitename=sitename
         )
 
         if local_update:
-            updated_sample_pos = data_with_pos.apply_row(map_func, columns=["g_on_local", "node_idx"])
+            updated_sample_pos = data_with_pos.apply_block(map_func, columns=["g_on_local", "node_idx"])
             return updated_sample_pos["node_idx"]
         else:
-            updated_sample_pos = data_with_pos.apply_row(map_func, columns=["g_on_local", "g_node_idx"])
+            updated_sample_pos = data_with_pos.apply_block(map_func, columns=["g_on_local", "g_node_idx"])
 
         # synchronize sample pos
         host_update_sample_pos = ctx.hosts.get("updated_data")
 
-        merge_func = functools.partial(_merge_sample_pos)
         for host_data in host_update_sample_pos:
-            updated_sample_pos = DataFrame.hstack([updated_sample_pos, host_data]).apply_row(
-                merge_func, columns=["g_on_local", "g_node_idx"]
+            updated_sample_pos = DataFrame.hstack([updated_sample_pos, host_data]).apply_block(
+                _merge_sample_pos_block, columns=["g_on_local", "g_node_idx"]
             )
 
         new_sample_pos = updated_sample_pos.create_frame(columns=["g_node_idx"])
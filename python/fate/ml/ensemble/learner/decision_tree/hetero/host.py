@@ -15,7 +15,7 @@
 from fate.ml.ensemble.learner.decision_tree.tree_core.decision_tree import (
     DecisionTree,
     Node,
-    _update_sample_pos_on_local_nodes,
+    _update_sample_pos_on_local_nodes_block,
     FeatureImportance,
 )
 from fate.ml.ensemble.learner.decision_tree.tree_core.hist import SBTHistogramBuilder, DistributedHistogram
@@ -111,9 +111,9 @@ class HeteroDecisionTreeHost(DecisionTree):
         sitename = ctx.local.party[0] + "_" + ctx.local.party[1]
         data_with_pos = DataFrame.hstack([data, sample_pos])
         map_func = functools.partial(
-            _update_sample_pos_on_local_nodes, cur_layer_node=cur_layer_nodes, node_map=node_map, sitename=sitename
+            _update_sample_pos_on_local_nodes_block, cur_layer_node=cur_layer_nodes, sitename=sitename
         )
-        update_sample_pos = data_with_pos.apply_row(map_func, columns=["h_on_local", "h_node_idx"])
+        update_sample_pos = data_with_pos.apply_block(map_func, columns=["h_on_local", "h_node_idx"])
 
         ctx.guest.put("updated_data", update_sample_pos)
         new_sample_pos = ctx.guest.get("new_sample_pos")
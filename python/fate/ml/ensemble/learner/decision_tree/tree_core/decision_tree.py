@@ -235,6 +235,123 @@ def _convert_sample_pos_to_score(s: pd.Series, tree_nodes: List[Node]):
     return target_node.weight
 
 
+class CompiledTree(object):
+    """
+    flat array representation of decision tree nodes, nodes are indexed by their positions in `nodes`:
+    fid, split value, left/right child nid, leaf mask, local-site mask and leaf weight.
+    All samples of a block advance together by gathering the split feature of their current nodes
+    and comparing them with the split values at once.
+
+    Parameters:
+        -----------
+        nodes : list of Node
+            nodes to compile, may be a whole tree or the nodes of one layer
+        sitename : str
+            split nodes of this site are local ones that can be evaluated
+        feature_index : dict
+            feature name to column index of the feature matrix passed to `step` and `traverse`
+    """
+
+    def __init__(self, nodes: List[Node], sitename: str, feature_index: dict):
+        node_num = len(nodes)
+        max_nid = max([n.nid for n in nodes] + [-1])
+        self.nid_to_pos = np.full(max_nid + 1, -1, dtype=np.int64)
+        self.nid = np.array([n.nid for n in nodes], dtype=np.int64)
+        self.nid_to_pos[self.nid] = np.arange(node_num, dtype=np.int64)
+
+        self.is_leaf = np.array([n.is_leaf for n in nodes], dtype=bool)
+        self.on_local = np.array([n.sitename == sitename for n in nodes], dtype=bool)
+        self.weight = np.array([n.weight if n.is_leaf else 0.0 for n in nodes], dtype=np.float64)
+        self.fid = np.full(node_num, -1, dtype=np.int64)
+        self.split = np.zeros(node_num, dtype=np.float64)
+        self.left = np.full(node_num, -1, dtype=np.int64)
+        self.right = np.full(node_num, -1, dtype=np.int64)
+        for pos, n in enumerate(nodes):
+            if n.is_leaf or n.sitename != sitename:
+                continue
+            self.fid[pos] = feature_index[n.fid]
+            self.split[pos] = n.bid
+            self.left[pos] = n.l
+            self.right[pos] = n.r
+
+    @staticmethod
+    def get_split_features(nodes: List[Node], sitename: str):
+        return list(dict.fromkeys(n.fid for n in nodes if not n.is_leaf and n.sitename == sitename))
+
+    def _decide(self, X: np.ndarray, rows: np.ndarray, pos: np.ndarray):
+        feat_val = X[rows, self.fid[pos]]
+        go_left = feat_val <= self.split[pos] + FLOAT_ZERO
+        return np.where(go_left, self.left[pos], self.right[pos])
+
+    def step(self, X: np.ndarray, node_ids: np.ndarray):
+        """
+        move samples one layer down, same as `_update_sample_pos_on_local_nodes` on each row:
+        returns (on_local mask, new node ids), samples on leaves get -(nid + 1), samples on other sites' nodes get -1
+        """
+        pos = self.nid_to_pos[node_ids]
+        on_local = self.on_local[pos]
+        new_node_ids = np.full(len(node_ids), -1, dtype=np.int64)
+
+        leaf = on_local & self.is_leaf[pos]
+        new_node_ids[leaf] = -(self.nid[pos[leaf]] + 1)
+        rows = np.nonzero(on_local & ~self.is_leaf[pos])[0]
+        new_node_ids[rows] = self._decide(X, rows, pos[rows])
+
+        return on_local, new_node_ids
+
+    def traverse(self, X: np.ndarray, node_ids: np.ndarray):
+        """
+        move samples down until they reach leaves or split nodes of other sites, same as `go_deep` on each row:
+        samples on leaves get -(nid + 1), negative node ids are samples already on leaves and are kept
+        """
+        new_node_ids = np.copy(node_ids).astype(np.int64)
+        rows = np.nonzero(new_node_ids >= 0)[0]
+        pos = self.nid_to_pos[new_node_ids[rows]]
+        while len(rows):
+            leaf = self.is_leaf[pos]
+            new_node_ids[rows[leaf]] = -(self.nid[pos[leaf]] + 1)
+            remote = ~leaf & ~self.on_local[pos]
+            new_node_ids[rows[remote]] = self.nid[pos[remote]]
+
+            moving = ~leaf & ~remote
+            rows, pos = rows[moving], pos[moving]
+            pos = self.nid_to_pos[self._decide(X, rows, pos)]
+
+        return new_node_ids
+
+
+def get_feature_matrix(df: pd.DataFrame, feature_index: dict):
+    features = sorted(feature_index, key=feature_index.get)
+    if not features:
+        return np.empty((len(df), 0), dtype=np.float64)
+    return df[features].to_numpy(dtype=np.float64)
+
+
+def _update_sample_pos_on_local_nodes_block(df: pd.DataFrame, cur_layer_node: List[Node], sitename):
+    """
+    block version of `_update_sample_pos_on_local_nodes`
+    """
+    feature_names = CompiledTree.get_split_features(cur_layer_node, sitename)
+    feature_index = dict(zip(feature_names, range(len(feature_names))))
+    layer = CompiledTree(cur_layer_node, sitename, feature_index)
+    on_local, node_idx = layer.step(get_feature_matrix(df, feature_index), df["node_idx"].to_numpy(dtype=np.int64))
+
+    return pd.DataFrame({"on_local": on_local, "node_idx": node_idx.astype(np.int32)})
+
+
+def _merge_sample_pos_block(df: pd.DataFrame):
+    """
+    block version of `_merge_sample_pos`
+    """
+    g_on_local = df["g_on_local"].to_numpy(dtype=bool)
+    return pd.DataFrame(
+        {
+            "on_local": g_on_local | df["h_on_local"].to_numpy(dtype=bool),
+            "node_idx": np.where(g_on_local, df["g_node_idx"], df["h_node_idx"]).astype(np.int32),
+        }
+    )
+
+
 class DecisionTree(object):
     def __init__(self, max_depth=3, use_missing=False, zero_as_missing=False, valid_features=None):
         """
@@ -302,6 +302,8 @@ class SBTSplitter(Splitter):
         if sk is None or coder is None:
             raise ValueError("sk or coder is None, not able to decode host split points")
 
+        # receive host histograms in background while finding local best splits
+        host_histogram_futures = ctx.hosts.get_async("hist")
         histogram = stat_rs.decrypt({}, {}, None)
         sitename = ctx.local.name
         reverse_node_map = {v: k for k, v in node_map.items()}
@@ -311,7 +313,7 @@ class SBTSplitter(Splitter):
             histogram, sitename, cur_layer_node, reverse_node_map, recover_bucket=True
         )
         # find best splits from host parties
-        host_histograms = ctx.hosts.get("hist")
+        host_histograms = [future.result() for future in host_histogram_futures]
 
         host_splits = []
         if gh_pack:
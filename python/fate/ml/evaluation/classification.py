@@ -19,11 +19,14 @@ Single Value Metrics
 class AUC(Metric):
 
     metric_name = "auc"
+    accept_score_histogram = True
 
     def __init__(self):
         super().__init__()
 
     def __call__(self, predict, label, **kwargs) -> Dict:
+        if isinstance(predict, ScoreHistogram):
+            return EvalResult(self.metric_name, predict.auc())
         predict = self.to_np_format(predict)
         label = self.to_np_format(label)
         auc_score = roc_auc_score(label, predict)
@@ -168,6 +171,84 @@ def sort_score_and_label(labels: np.ndarray, pred_scores: np.ndarray):
     return sorted_labels, sorted_scores
 
 
+class ScoreHistogram(object):
+    """
+    positive and negative sample counts of every distinct predict score, in descending score order.
+    confusion matrices, order statistics and auc at any threshold are read from its cumulative sums, and
+    histograms of data partitions merge into the histogram of the whole data
+    """
+
+    def __init__(self, scores: np.ndarray, pos_counts: np.ndarray, neg_counts: np.ndarray):
+        self.scores = scores
+        self.pos_counts = pos_counts
+        self.neg_counts = neg_counts
+        self._cum_pos = np.concatenate([[0], np.cumsum(pos_counts)])
+        self._cum_count = np.concatenate([[0], np.cumsum(pos_counts + neg_counts)])
+
+    @classmethod
+    def from_scores(cls, labels, pred_scores, pos_label=1):
+        labels = np.asarray(labels)
+        pred_scores = np.asarray(pred_scores, dtype=np.float64)
+        scores, inverse = np.unique(-pred_scores, return_inverse=True)
+        is_pos = (labels == pos_label).astype(np.int64)
+        pos_counts = np.bincount(inverse, weights=is_pos, minlength=len(scores)).astype(np.int64)
+        neg_counts = np.bincount(inverse, minlength=len(scores)) - pos_counts
+        return cls(-scores, pos_counts, neg_counts)
+
+    def merge(self, other: "ScoreHistogram") -> "ScoreHistogram":
+        scores, inverse = np.unique(-np.concatenate([self.scores, other.scores]), return_inverse=True)
+        pos_counts = np.bincount(inverse, weights=np.concatenate([self.pos_counts, other.pos_counts]))
+        neg_counts = np.bincount(inverse, weights=np.concatenate([self.neg_counts, other.neg_counts]))
+        return ScoreHistogram(-scores, pos_counts.astype(np.int64), neg_counts.astype(np.int64))
+
+    @property
+    def count(self):
+        return int(self._cum_count[-1])
+
+    @property
+    def pos_num(self):
+        return int(self._cum_pos[-1])
+
+    @property
+    def neg_num(self):
+        return self.count - self.pos_num
+
+    def score_at(self, indexes):
+        """
+        scores at positions `indexes` of the descending sorted predict scores
+        """
+        return self.scores[np.searchsorted(self._cum_count[1:], indexes, side="right")]
+
+    def quantile(self, quantile_list):
+        """
+        same as np.quantile(scores, quantile_list, interpolation="nearest")
+        """
+        indexes = np.around(np.asarray(quantile_list) * (self.count - 1)).astype(np.int64)
+        return self.score_at(self.count - 1 - indexes)
+
+    def confusion_matrix(self, score_thresholds, ret):
+        # samples predicted positive by threshold t are the prefix of scores > t
+        num = np.searchsorted(-self.scores, -np.asarray(score_thresholds, dtype=np.float64), side="left")
+        tp = self._cum_pos[num]
+        fp = self._cum_count[num] - tp
+        confusion_mat = {"tp": tp, "fp": fp, "fn": self.pos_num - tp, "tn": self.neg_num - fp}
+        return {ret_type: confusion_mat[ret_type] for ret_type in ret}
+
+    def auc(self):
+        if self.pos_num == 0 or self.neg_num == 0:
+            raise ValueError("Only one class present in labels, auc is not defined in that case")
+
+        # each negative sample ranks below all positives of higher scores and ties half of the equal ones
+        higher_pos = self._cum_pos[:-1]
+        return float((self.neg_counts * (higher_pos + 0.5 * self.pos_counts)).sum() / (self.pos_num * self.neg_num))
+
+
+def to_score_histogram(metric: Metric, predict, label, pos_label=1) -> ScoreHistogram:
+    if isinstance(predict, ScoreHistogram):
+        return predict
+    return ScoreHistogram.from_scores(metric.to_np_format(label), metric.to_np_format(predict), pos_label=pos_label)
+
+
 class _ConfusionMatrix(object):
     @staticmethod
     def compute(sorted_labels: list, sorted_pred_scores: list, score_thresholds: list, ret: list, pos_label=1):
@@ -175,33 +256,8 @@ class _ConfusionMatrix(object):
         for ret_type in ret:
             assert ret_type in ["tp", "tn", "fp", "fn"]
 
-        sorted_labels = np.array(sorted_labels)
-        sorted_scores = np.array(sorted_pred_scores)
-        sorted_labels[sorted_labels != pos_label] = 0
-        sorted_labels[sorted_labels == pos_label] = 1
-        score_thresholds = np.array([score_thresholds]).transpose()
-        pred_labels = (sorted_scores > score_thresholds) + 0
-
-        ret_dict = {}
-        if "tp" in ret or "tn" in ret:
-            match_arr = pred_labels + sorted_labels
-            if "tp" in ret:
-                tp_num = (match_arr == 2).sum(axis=-1)
-                ret_dict["tp"] = tp_num
-            if "tn" in ret:
-                tn_num = (match_arr == 0).sum(axis=-1)
-                ret_dict["tn"] = tn_num
-
-        if "fp" in ret or "fn" in ret:
-            match_arr = sorted_labels - pred_labels
-            if "fp" in ret:
-                fp_num = (match_arr == -1).sum(axis=-1)
-                ret_dict["fp"] = fp_num
-            if "fn" in ret:
-                fn_num = (match_arr == 1).sum(axis=-1)
-                ret_dict["fn"] = fn_num
-
-        return ret_dict
+        score_histogram = ScoreHistogram.from_scores(sorted_labels, sorted_pred_scores, pos_label=pos_label)
+        return score_histogram.confusion_matrix(score_thresholds, ret)
 
 
 class ThresholdCutter(object):
@@ -223,6 +279,10 @@ class ThresholdCutter(object):
     @staticmethod
     def cut_by_index(sorted_scores):
         cuts = np.array([c / 100 for c in range(100)])
+        if isinstance(sorted_scores, ScoreHistogram):
+            indexs = [int(sorted_scores.count * cut) for cut in cuts]
+            return list(sorted_scores.score_at(indexs)), cuts
+
         data_size = len(sorted_scores)
         indexs = [int(data_size * cut) for cut in cuts]
         score_threshold = [sorted_scores[idx] for idx in indexs]
@@ -243,14 +303,20 @@ class ThresholdCutter(object):
 
         if quantile_list is None:  # default is 20 intervals
             quantile_list = [round(i * 0.05, 3) for i in range(20)] + [1.0]
-        quantile_val = np.quantile(scores, quantile_list, interpolation=interpolation)
+        if isinstance(scores, ScoreHistogram):
+            assert interpolation == "nearest", "score histogram only supports nearest interpolation"
+            quantile_val = scores.quantile(quantile_list)
+            min_val, max_val = scores.scores[-1], scores.scores[0]
+        else:
+            quantile_val = np.quantile(scores, quantile_list, interpolation=interpolation)
+            min_val, max_val = np.min(scores), np.max(scores)
         if remove_duplicate:
             quantile_val = sorted(list(set(quantile_val)))
         else:
             quantile_val = sorted(list(quantile_val))
 
         if len(quantile_val) == 1:
-            quantile_val = [np.min(scores), np.max(scores)]
+            quantile_val = [min_val, max_val]
 
         return quantile_val
 
@@ -268,23 +334,27 @@ class BiClassMetric(object):
         scores,
         add_to_end=True,
     ):
-        sorted_labels, sorted_scores = sort_score_and_label(labels, scores)
+        """
+        scores can be a ScoreHistogram in place of labels and scores
+        """
+        if isinstance(scores, ScoreHistogram):
+            score_histogram = scores
+        else:
+            score_histogram = ScoreHistogram.from_scores(labels, scores, pos_label=self.pos_label)
 
         score_threshold, cuts = None, None
 
         if self.cut_method == "step":
-            score_threshold, cuts = ThresholdCutter.cut_by_step(sorted_scores, steps=0.01)
+            score_threshold, cuts = ThresholdCutter.cut_by_step(score_histogram.scores, steps=0.01)
             if add_to_end:
                 score_threshold.append(min(score_threshold) - 0.001)
                 cuts.append(1)
 
         elif self.cut_method == "quantile":
-            score_threshold = ThresholdCutter.cut_by_quantile(sorted_scores, remove_duplicate=self.remove_duplicate)
+            score_threshold = ThresholdCutter.cut_by_quantile(score_histogram, remove_duplicate=self.remove_duplicate)
             score_threshold = list(np.flip(score_threshold))
 
-        confusion_mat = _ConfusionMatrix.compute(
-            sorted_labels, sorted_scores, score_threshold, ret=["tp", "fp", "fn", "tn"], pos_label=self.pos_label
-        )
+        confusion_mat = score_histogram.confusion_matrix(score_threshold, ret=["tp", "fp", "fn", "tn"])
 
         return confusion_mat, score_threshold, cuts
 
@@ -312,20 +382,16 @@ Metrics with Cruve/Table Results
 class KS(Metric):
 
     metric_name = "ks"
+    accept_score_histogram = True
 
     def __init__(self):
         super().__init__()
 
     def __call__(self, predict, label, **kwargs) -> Dict:
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
-
-        sorted_labels, sorted_scores = sort_score_and_label(label, predict)
-        threshold, cuts = ThresholdCutter.cut_by_index(sorted_scores)
-        confusion_mat = _ConfusionMatrix.compute(
-            sorted_labels, sorted_scores, threshold, ret=["tp", "fp"], pos_label=1
-        )
-        pos_num, neg_num = neg_pos_count(sorted_labels, pos_label=1)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=1)
+        threshold, cuts = ThresholdCutter.cut_by_index(score_histogram)
+        confusion_mat = score_histogram.confusion_matrix(threshold, ret=["tp", "fp"])
+        pos_num, neg_num = score_histogram.pos_num, score_histogram.neg_num
 
         assert pos_num > 0 and neg_num > 0, (
             "error when computing KS metric, pos sample number and neg sample number" "must be larger than 0"
@@ -349,20 +415,16 @@ class KS(Metric):
 class ConfusionMatrix(Metric):
 
     metric_name = "confusion_matrix"
+    accept_score_histogram = True
 
     def __init__(self):
         super().__init__()
 
     def __call__(self, predict, label, **kwargs):
 
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
-
-        sorted_labels, sorted_scores = sort_score_and_label(label, predict)
-        threshold, cuts = ThresholdCutter.cut_by_index(sorted_scores)
-        confusion_mat = _ConfusionMatrix.compute(
-            sorted_labels, sorted_scores, threshold, ret=["tp", "tn", "fp", "fn"], pos_label=1
-        )
+        score_histogram = to_score_histogram(self, predict, label, pos_label=1)
+        threshold, cuts = ThresholdCutter.cut_by_index(score_histogram)
+        confusion_mat = score_histogram.confusion_matrix(threshold, ret=["tp", "tn", "fp", "fn"])
         confusion_mat["cuts"] = cuts
         confusion_mat["threshold"] = threshold
         return EvalResult(self.metric_name, pd.DataFrame(confusion_mat))
@@ -371,6 +433,7 @@ class ConfusionMatrix(Metric):
 class Lift(Metric, BiClassMetric):
 
     metric_name = "lift"
+    accept_score_histogram = True
 
     def __init__(self, *args, **kwargs):
         Metric.__init__(self)
@@ -432,17 +495,16 @@ class Lift(Metric, BiClassMetric):
 
     def __call__(self, predict, label, **kwargs):
 
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=self.pos_label)
         confusion_mat, score_threshold, cuts = self.prepare_confusion_mat(
-            label,
-            predict,
+            None,
+            score_histogram,
             add_to_end=False,
         )
 
         lifts_y, lifts_x = self.compute_metric_from_confusion_mat(
             confusion_mat,
-            len(label),
+            score_histogram.count,
         )
 
         return EvalResult(
@@ -453,6 +515,7 @@ class Lift(Metric, BiClassMetric):
 class Gain(Metric, BiClassMetric):
 
     metric_name = "gain"
+    accept_score_histogram = True
 
     def __init__(self, *args, **kwargs):
         Metric.__init__(self)
@@ -504,15 +567,14 @@ class Gain(Metric, BiClassMetric):
 
     def __call__(self, predict, label, **kwargs):
 
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=self.pos_label)
         confusion_mat, score_threshold, cuts = self.prepare_confusion_mat(
-            label,
-            predict,
+            None,
+            score_histogram,
             add_to_end=False,
         )
 
-        gain_y, gain_x = self.compute_metric_from_confusion_mat(confusion_mat, len(label))
+        gain_y, gain_x = self.compute_metric_from_confusion_mat(confusion_mat, score_histogram.count)
 
         return EvalResult(
             self.metric_name, pd.DataFrame({"gainx": gain_x, "gainy": gain_y, "threshold": list(score_threshold)})
@@ -525,6 +587,7 @@ class BiClassPrecisionTable(Metric, BiClassMetric):
     """
 
     metric_name = "biclass_precision_table"
+    accept_score_histogram = True
 
     def __init__(self, *args, **kwargs):
         Metric.__init__(self)
@@ -541,9 +604,8 @@ class BiClassPrecisionTable(Metric, BiClassMetric):
         return precision_scores
 
     def __call__(self, predict, label, **kwargs) -> Dict:
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
-        p, threshold, cuts = self.compute(label, predict)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=self.pos_label)
+        p, threshold, cuts = self.compute(None, score_histogram)
         return EvalResult(self.metric_name, pd.DataFrame({"p": p, "threshold": threshold, "cuts": cuts}))
 
 
@@ -553,6 +615,7 @@ class BiClassRecallTable(Metric, BiClassMetric):
     """
 
     metric_name = "biclass_recall_table"
+    accept_score_histogram = True
 
     def __init__(self, *args, **kwargs):
         Metric.__init__(self)
@@ -563,9 +626,8 @@ class BiClassRecallTable(Metric, BiClassMetric):
         return recall_scores
 
     def __call__(self, predict, label, **kwargs) -> Dict:
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
-        r, threshold, cuts = self.compute(label, predict)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=self.pos_label)
+        r, threshold, cuts = self.compute(None, score_histogram)
         return EvalResult(self.metric_name, pd.DataFrame({"r": r, "threshold": threshold, "cuts": cuts}))
 
 
@@ -575,6 +637,7 @@ class BiClassAccuracyTable(Metric, BiClassMetric):
     """
 
     metric_name = "biclass_accuracy_table"
+    accept_score_histogram = True
 
     def __init__(self, *args, **kwargs):
         Metric.__init__(self)
@@ -595,9 +658,8 @@ class BiClassAccuracyTable(Metric, BiClassMetric):
         return rs[:-1]
 
     def __call__(self, predict, label, **kwargs) -> Dict:
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
-        accuracy, threshold, cuts = self.compute(label, predict)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=self.pos_label)
+        accuracy, threshold, cuts = self.compute(None, score_histogram)
         return EvalResult(self.metric_name, pd.DataFrame({"accuracy": accuracy, "threshold": threshold, "cuts": cuts}))
 
 
@@ -607,18 +669,14 @@ class FScoreTable(Metric):
     """
 
     metric_name = "fscore_table"
+    accept_score_histogram = True
 
     def __call__(self, predict, label, beta=1):
 
-        predict = self.to_np_format(predict)
-        label = self.to_np_format(label)
-
-        sorted_labels, sorted_scores = sort_score_and_label(label, predict)
-        _, cuts = ThresholdCutter.cut_by_step(sorted_scores, steps=0.01)
+        score_histogram = to_score_histogram(self, predict, label, pos_label=1)
+        _, cuts = ThresholdCutter.cut_by_step(score_histogram.scores, steps=0.01)
         fixed_interval_threshold = ThresholdCutter.fixed_interval_threshold()
-        confusion_mat = _ConfusionMatrix.compute(
-            sorted_labels, sorted_scores, fixed_interval_threshold, ret=["tp", "fp", "fn", "tn"]
-        )
+        confusion_mat = score_histogram.confusion_matrix(fixed_interval_threshold, ret=["tp", "fp", "fn", "tn"])
         precision_computer = BiClassPrecisionTable()
         recall_computer = BiClassRecallTable()
         p_score = precision_computer.compute_metric_from_confusion_mat(confusion_mat)
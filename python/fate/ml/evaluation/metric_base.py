@@ -71,6 +71,8 @@ class EvalResult(object):
 
 class Metric(object):
     metric_name = None
+    # whether __call__ takes a ScoreHistogram as predict in place of predict scores and labels
+    accept_score_histogram = False
 
     def __init__(self, *args, **kwargs):
         pass
@@ -104,6 +106,9 @@ class MetricEnsemble(object):
         self._metrics.append(metric)
         return self
 
+    def accept_score_histogram(self):
+        return len(self._metrics) > 0 and all(metric.accept_score_histogram for metric in self._metrics)
+
     def _parse_input(self, eval_rs):
         if isinstance(eval_rs, EvalPrediction):
             # parse hugging face format
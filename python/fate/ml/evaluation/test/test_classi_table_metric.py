@@ -59,6 +59,21 @@ class TestMetric(unittest.TestCase):
         result = bi_acc_metric(predict, label)
         print(result.to_dict())
 
+    def test_score_histogram(self):
+        predict, label = generate_predict_and_label(1000)
+        predict = np.round(predict, 2)
+        histogram = ScoreHistogram.from_scores(label[:300], predict[:300]).merge(
+            ScoreHistogram.from_scores(label[300:], predict[300:])
+        )
+        self.assertAlmostEqual(AUC()(histogram, None).get_raw_data(), roc_auc_score(label, predict))
+        for metric in [KS(), ConfusionMatrix(), Gain(), Lift(), BiClassAccuracyTable(), FScoreTable()]:
+            result = metric(predict, label)
+            histogram_result = metric(histogram, None)
+            result = result if isinstance(result, tuple) else (result,)
+            histogram_result = histogram_result if isinstance(histogram_result, tuple) else (histogram_result,)
+            for r1, r2 in zip(result, histogram_result):
+                self.assertEqual(r1.to_json(), r2.to_json())
+
     def test_psi(self):
         psi_metric = PSI()
         predict, label = generate_predict_and_label(1000)
@@ -13,10 +13,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import functools
 import logging
 
+import numpy as np
 import pandas as pd
 import torch
+from scipy import sparse as sp
 
 from fate.arch import Context
 from fate.arch.dataframe import DataFrame
@@ -24,6 +27,8 @@ from ..abc.module import Module
 
 logger = logging.getLogger(__name__)
 
+MPC_MATMUL_CHUNK_ROWS = 100000
+
 
 class PearsonCorrelation(Module):
     def __init__(self, local_only=False, calc_local_vif=True, select_cols=None):
@@ -43,13 +48,11 @@ class PearsonCorrelation(Module):
         if self.select_cols is None:
             self.select_cols = input_data.schema.columns
         to_compute_data = input_data[self.select_cols]
-        data = to_compute_data.as_tensor()
-        n = data.shape[0]
-        num_features = data.shape[1]
-        data_mean = torch.mean(data, dim=0)
-        data_std = torch.std(data, dim=0)
-        data = (data - data_mean) / data_std
-        local_corr = torch.matmul(data.T, data) / (n - 1)
+        fields_loc = to_compute_data.data_manager.loc_block(self.select_cols)
+        block_table = to_compute_data.block_table
+        n, data_mean, comoment = _moments(block_table, fields_loc)
+        data_std = np.sqrt(np.diag(comoment) / (n - 1))
+        local_corr = torch.from_numpy(comoment / np.outer(data_std, data_std) / (n - 1))
         # remainds_index = [i for i in range(data_std.shape[0]) if data_std[i] > 0]
         self.local_corr = pd.DataFrame(local_corr, columns=self.select_cols, index=self.select_cols)
 
@@ -78,10 +81,17 @@ class PearsonCorrelation(Module):
                 a_header = ctx.guest.get("anonymous_header")
                 b_header = input_data.schema.columns
 
+            standardize_func = functools.partial(
+                _standardize_block, fields_loc=fields_loc, mean=data_mean, std=data_std
+            )
             with ctx.mpc.communicator.new_group(ranks=[rank_a, rank_b], name="pearson_correlation"):
-                x = ctx.mpc.lazy_encrypt(lambda: data.T, src=rank_a)
-                y = ctx.mpc.lazy_encrypt(lambda: data, src=rank_b)
-                remote_corr = x.matmul(y).get_plain_text() / (n - 1)
+                remote_comoment = None
+                for data in _iter_chunk_rows(block_table, MPC_MATMUL_CHUNK_ROWS, standardize_func):
+                    x = ctx.mpc.lazy_encrypt(lambda: data.T, src=rank_a)
+                    y = ctx.mpc.lazy_encrypt(lambda: data, src=rank_b)
+                    chunk_comoment = x.matmul(y)
+                    remote_comoment = chunk_comoment if remote_comoment is None else remote_comoment + chunk_comoment
+                remote_corr = remote_comoment.get_plain_text() / (n - 1)
                 self.remote_corr = pd.DataFrame(remote_corr, columns=b_header, index=a_header)
                 # ctx.mpc.info(f"pearson correlation={out / n}")
 
@@ -121,9 +131,98 @@ class PearsonCorrelation(Module):
             },
             "meta": {
                 "model_type": "feature_correlation",
-                "column_anonymous_map": dict(zip(self.select_cols, self.select_anonymous_cols))
-                if self.select_anonymous_cols
-                else None,
+                "column_anonymous_map": (
+                    dict(zip(self.select_cols, self.select_anonymous_cols)) if self.select_anonymous_cols else None
+                ),
             },
         }
         return output_model
+
+
+def _block_to_numpy(blocks, fields_loc):
+    n = len(blocks[0])
+    ret = np.empty((n, len(fields_loc)), dtype=np.float64)
+    columns_by_block = dict()
+    for idx, (bid, offset) in enumerate(fields_loc):
+        columns_by_block.setdefault(bid, []).append((idx, offset))
+
+    for bid, columns in columns_by_block.items():
+        sub_block = blocks[bid][:, [offset for _, offset in columns]]
+        if sp.issparse(sub_block):
+            sub_block = sub_block.toarray()
+        elif isinstance(sub_block, torch.Tensor):
+            sub_block = sub_block.numpy()
+        ret[:, [idx for idx, _ in columns]] = sub_block
+
+    return ret
+
+
+def _partition_moments(kvs, fields_loc):
+    """
+    count, column sums and gram matrix of the blocks in one partition, so the driver only holds features x features
+    """
+    n, x_sum, gram = 0, 0.0, 0.0
+    for _, blocks in kvs:
+        data = _block_to_numpy(blocks, fields_loc)
+        n += data.shape[0]
+        x_sum = x_sum + data.sum(axis=0)
+        gram = gram + data.T @ data
+    return [(0, (n, x_sum, gram))]
+
+
+def _merge_moments(moments1, moments2):
+    return tuple(m1 + m2 for m1, m2 in zip(moments1, moments2))
+
+
+def _moments(block_table, fields_loc):
+    """
+    count, column means and centered comoment matrix of all rows, computed in one pass over the table
+    """
+    moments = block_table.mapReducePartitions(
+        functools.partial(_partition_moments, fields_loc=fields_loc), _merge_moments
+    ).collect()
+    _, (n, x_sum, gram) = next(iter(moments))
+    mean = x_sum / n
+    return n, mean, gram - n * np.outer(mean, mean)
+
+
+def _standardize_block(blocks, fields_loc, mean, std):
+    return (_block_to_numpy(blocks, fields_loc) - mean) / std
+
+
+def _chunk_block_keys(block_table, chunk_rows):
+    """
+    group block keys in order into chunks of about chunk_rows rows, aligned parties get the same grouping
+    """
+    block_rows = sorted(block_table.mapValues(lambda blocks: len(blocks[0])).collect())
+    chunk_keys, rows = [], 0
+    for key, num in block_rows:
+        chunk_keys.append(key)
+        rows += num
+        if rows >= chunk_rows:
+            yield chunk_keys
+            chunk_keys, rows = [], 0
+
+    if chunk_keys:
+        yield chunk_keys
+
+
+def _iter_chunk_rows(block_table, chunk_rows, block_func):
+    """
+    rows of block_func applied to every block, chunk by chunk in the order of _chunk_block_keys.
+    blocks are grouped by chunk in one shuffle, the driver then streams the chunks holding one at a time
+    """
+    chunk_of_key = {
+        key: chunk_idx
+        for chunk_idx, chunk_keys in enumerate(_chunk_block_keys(block_table, chunk_rows))
+        for key in chunk_keys
+    }
+
+    def _mapper(kvs):
+        for k, v in kvs:
+            yield chunk_of_key[k], [(k, block_func(v))]
+
+    # chunks come out in key order, which is the same on aligned parties
+    chunks = block_table.mapReducePartitions(_mapper, lambda x, y: x + y).collect()
+    for _, chunk in chunks:
+        yield torch.from_numpy(np.vstack([data for _, data in sorted(chunk, key=lambda kv: kv[0])]))
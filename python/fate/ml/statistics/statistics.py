@@ -68,19 +68,21 @@ class StatisticsSummary(Module):
 
     def get_from_describe(self, data, metric):
         if self._describe is None:
-            self._describe = data.describe(ddof=self.ddof, unbiased=~self.bias)
+            # quantiles are sketched in the same pass as the moments
+            self._describe = data.describe(
+                ddof=self.ddof, unbiased=~self.bias, q=self._q_pts or None, relative_error=self.relative_error
+            )
         return self._describe[metric]
 
     def get_from_quantile_summary(self, data, metric):
-        query_q = int(metric[:-1]) / 100
-        if self._quantile is None:
-            self._quantile = data.quantile(q=self._q_pts, relative_error=self.relative_error)
-        return self._quantile.loc[query_q]
+        return self.get_from_describe(data, f"{int(metric[:-1]):g}%")
 
     def compute_metrics(self, data, metrics):
         res = pd.DataFrame(columns=data.schema.columns)
         q_metrics = [metric for metric in metrics if re.match(r"^(100|\d{1,2})%$", metric)]
         self._q_pts = [int(metric[:-1]) / 100 for metric in q_metrics]
+        if "median" in metrics and 0.5 not in self._q_pts:
+            self._q_pts.append(0.5)
         for metric in metrics:
             metric_val = None
             """if metric == "describe":
@@ -97,8 +99,7 @@ class StatisticsSummary(Module):
                     self._count = data.count()
                 metric_val = self._count
             elif metric == "median":
-                metric_val = data.quantile(q=0.5, relative_error=self.relative_error)
-                metric_val = metric_val.loc[0.5]
+                metric_val = self.get_from_describe(data, "50%")
             elif metric == "coefficient_of_variation":
                 metric_val = self.get_from_describe(data, "variation")
             elif metric == "missing_count":
@@ -0,0 +1,28 @@
+import pickle
+import random
+
+import pytest
+
+from fate.arch.federation.api._codec import compress, decompress
+
+random.seed(0)
+# mimic a pickled gradient/histogram payload: mostly random big integers with some structure
+payload = pickle.dumps([[random.getrandbits(2048) for _ in range(8)] + [0] * 8 for _ in range(2000)])
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib", "lz4", "zstd"])
+def test_encode(benchmark, codec):
+    if codec in {"lz4", "zstd"}:
+        pytest.importorskip({"lz4": "lz4.frame", "zstd": "zstandard"}[codec])
+    codec_id, encoded = benchmark(lambda: compress(payload, codec, 0))
+    benchmark.extra_info["raw_bytes"] = len(payload)
+    benchmark.extra_info["wire_bytes"] = len(encoded)
+    benchmark.extra_info["ratio"] = len(encoded) / len(payload)
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib", "lz4", "zstd"])
+def test_decode(benchmark, codec):
+    if codec in {"lz4", "zstd"}:
+        pytest.importorskip({"lz4": "lz4.frame", "zstd": "zstandard"}[codec])
+    codec_id, encoded = compress(payload, codec, 0)
+    assert benchmark(lambda: decompress(encoded, codec_id)) == payload
@@ -0,0 +1,28 @@
+import pytest
+import torch
+
+from fate.arch.histogram import Histogram
+
+# wide dataset: hundreds of features with 32 bins each
+num_node, num_feature, num_bin, num_row = 8, 400, 32, 2000
+feature_bin_sizes = [num_bin] * num_feature
+g = torch.Generator().manual_seed(0)
+fids = torch.randint(0, num_bin, (num_row, num_feature), generator=g)
+nids = torch.randint(0, num_node, (num_row, 1), generator=g)
+targets = {"gh": torch.rand(num_row, 2, generator=g, dtype=torch.float64)}
+schema = {"gh": {"type": "plaintext", "stride": 2, "dtype": torch.float64}}
+node_mapping = {nid: nid // 2 for nid in range(0, num_node, 2)}
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+@pytest.mark.parametrize("mapping", [None, node_mapping])
+def test_i_update(benchmark, vectorized, mapping):
+    def build():
+        hist = Histogram.create(num_node, feature_bin_sizes, schema)
+        if vectorized:
+            hist.i_update_vectorized(fids, nids, targets, mapping)
+        else:
+            hist.i_update(fids, nids, targets, mapping)
+        return hist
+
+    benchmark(build)
@@ -0,0 +1,40 @@
+import tempfile
+import threading
+
+import pytest
+
+from fate.arch.computing.backends.standalone._standalone import _FederationMetaManager
+
+GUEST = ("guest", "9999")
+HOST = ("host", "10000")
+ROUNDS = 100
+
+
+def _ping_pong(guest_meta, host_meta, rounds, round_offset):
+    def _host():
+        for i in range(round_offset, round_offset + rounds):
+            key = f"ping-{i}".encode()
+            host_meta.wait_status_set(key)
+            host_meta.ack_status(key)
+            host_meta.set_status(GUEST, f"pong-{i}".encode(), b"1")
+
+    thread = threading.Thread(target=_host)
+    thread.start()
+    for i in range(round_offset, round_offset + rounds):
+        guest_meta.set_status(HOST, f"ping-{i}".encode(), b"1")
+        key = f"pong-{i}".encode()
+        guest_meta.wait_status_set(key)
+        guest_meta.ack_status(key)
+    thread.join()
+
+
+@pytest.mark.parametrize("notify", [True, False], ids=["notify", "polling"])
+def test_round_trip_latency(benchmark, notify):
+    with tempfile.TemporaryDirectory() as data_dir:
+        guest_meta = _FederationMetaManager(data_dir=data_dir, session_id="bench", party=GUEST, notify=notify)
+        host_meta = _FederationMetaManager(data_dir=data_dir, session_id="bench", party=HOST, notify=notify)
+        counter = iter(range(0, 1 << 30, ROUNDS))
+        benchmark(lambda: _ping_pong(guest_meta, host_meta, ROUNDS, next(counter)))
+        benchmark.extra_info["rounds_per_call"] = ROUNDS
+        guest_meta.close()
+        host_meta.close()
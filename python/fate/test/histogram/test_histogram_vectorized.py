@@ -0,0 +1,86 @@
+import pytest
+import torch
+
+from fate.arch.histogram import Histogram
+from fate.arch.histogram.indexer import HistogramIndexer
+
+
+def _random_block(num_row, num_node, feature_bin_sizes, stride, seed=0):
+    g = torch.Generator().manual_seed(seed)
+    fids = torch.stack([torch.randint(0, size, (num_row,), generator=g) for size in feature_bin_sizes], dim=1)
+    nids = torch.randint(0, num_node, (num_row, 1), generator=g)
+    targets = {
+        "g": torch.rand(num_row, generator=g, dtype=torch.float64),
+        "gh": torch.rand(num_row, stride, generator=g, dtype=torch.float64),
+    }
+    return fids, nids, targets
+
+
+def _schema(stride):
+    return {
+        "g": {"type": "plaintext", "stride": 1, "dtype": torch.float64},
+        "gh": {"type": "plaintext", "stride": stride, "dtype": torch.float64},
+    }
+
+
+def _assert_hist_equal(a: Histogram, b: Histogram):
+    for name, values in a._data._data.items():
+        assert torch.allclose(values.data, b._data._data[name].data)
+
+
+class TestHistogramIndexerVectorized:
+    @pytest.fixture
+    def indexer(self):
+        return HistogramIndexer(3, [3, 2, 4])
+
+    def test_get_positions_array(self, indexer):
+        fids, nids, _ = _random_block(50, 3, [3, 2, 4], 1)
+        expect = indexer.get_positions(nids.flatten().tolist(), fids.tolist())
+        assert indexer.get_positions_array(nids.flatten().numpy(), fids.numpy()).tolist() == expect
+
+    @pytest.mark.parametrize("node_mapping", [{}, {0: 1}, {2: 0, 0: 2}, {5: 1, 1: 0}])
+    def test_get_positions_array_with_node_mapping(self, indexer, node_mapping):
+        fids, nids, _ = _random_block(50, 3, [3, 2, 4], 1)
+        expect_positions, expect_masks = indexer.get_positions_with_node_mapping(
+            nids.flatten().tolist(), fids.tolist(), node_mapping
+        )
+        positions, masks = indexer.get_positions_array_with_node_mapping(
+            nids.flatten().numpy(), fids.numpy(), node_mapping
+        )
+        assert positions.tolist() == expect_positions
+        assert masks.tolist() == expect_masks
+
+
+@pytest.mark.parametrize("stride", [1, 2])
+@pytest.mark.parametrize("node_mapping", [None, {0: 1, 2: 0}])
+def test_i_update_vectorized(stride, node_mapping):
+    feature_bin_sizes = [4, 32, 7, 1]
+    fids, nids, targets = _random_block(200, 3, feature_bin_sizes, stride)
+    expect = Histogram.create(3, feature_bin_sizes, _schema(stride))
+    expect.i_update(fids, nids, targets, node_mapping)
+    hist = Histogram.create(3, feature_bin_sizes, _schema(stride))
+    hist.i_update_vectorized(fids, nids, targets, node_mapping)
+    _assert_hist_equal(expect, hist)
+
+
+def test_i_update_vectorized_empty_block():
+    hist = Histogram.create(2, [3, 2], _schema(2))
+    fids, nids, targets = _random_block(10, 2, [3, 2], 2)
+    hist.i_update_vectorized(fids, nids, targets, {7: 0})
+    for values in hist._data._data.values():
+        assert torch.count_nonzero(values.data) == 0
+
+
+@pytest.mark.parametrize("stride", [1, 2])
+@pytest.mark.parametrize("node_mapping", [None, {0: 1, 2: 0}])
+def test_i_update_sparse(stride, node_mapping):
+    from scipy import sparse as sp
+
+    feature_bin_sizes = [4, 32, 7, 1]
+    fids, nids, targets = _random_block(200, 3, feature_bin_sizes, stride)
+    fids[torch.rand(fids.shape, generator=torch.Generator().manual_seed(1)) < 0.8] = 0
+    expect = Histogram.create(3, feature_bin_sizes, _schema(stride))
+    expect.i_update(fids, nids, targets, node_mapping)
+    hist = Histogram.create(3, feature_bin_sizes, _schema(stride))
+    hist.i_update_sparse(sp.csr_matrix(fids.numpy()), nids, targets, node_mapping)
+    _assert_hist_equal(expect, hist)
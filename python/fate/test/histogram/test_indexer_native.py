@@ -0,0 +1,125 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+import torch
+
+from fate.arch.histogram import indexer
+from fate.arch.histogram.indexer import _indexer as py_indexer
+from fate.arch.histogram.values._plain import HistogramPlainValues
+
+# set where fate_utils is built with the histogram array api, a missing native module then fails instead of skipping
+NATIVE_EXPECTED = os.environ.get("FATE_HISTOGRAM_NATIVE_INDEXER") == "1"
+
+try:
+    from fate_utils import histogram as native
+
+    if not hasattr(native.HistogramIndexer, "get_positions_array"):
+        native = None
+except ImportError:
+    native = None
+
+node_size, feature_bin_sizes = 3, [3, 2, 4, 1]
+
+
+@pytest.fixture
+def native_module():
+    if native is None:
+        if NATIVE_EXPECTED:
+            pytest.fail("fate_utils is not built with the histogram array api")
+        pytest.skip("fate_utils is built without the histogram array api")
+    return native
+
+
+@pytest.fixture
+def indexers(native_module):
+    return (
+        native_module.HistogramIndexer(node_size, feature_bin_sizes),
+        py_indexer.HistogramIndexer(node_size, feature_bin_sizes),
+    )
+
+
+@pytest.fixture
+def block():
+    rng = np.random.default_rng(0)
+    nids = rng.integers(0, node_size, 100, dtype=np.int64)
+    bids = np.stack([rng.integers(0, size, 100, dtype=np.int64) for size in feature_bin_sizes], axis=1)
+    return nids, bids
+
+
+def test_get_positions(indexers, block):
+    nids, bids = block
+    native_indexer, python_indexer = indexers
+    assert native_indexer.get_positions(nids.tolist(), bids.tolist()) == python_indexer.get_positions(
+        nids.tolist(), bids.tolist()
+    )
+    np.testing.assert_array_equal(
+        native_indexer.get_positions_array(nids, bids), python_indexer.get_positions_array(nids, bids)
+    )
+
+
+@pytest.mark.parametrize("node_mapping", [{}, {1: 0}, {2: 1, 0: 2}])
+def test_get_positions_with_node_mapping(indexers, block, node_mapping):
+    nids, bids = block
+    native_indexer, python_indexer = indexers
+    assert native_indexer.get_positions_with_node_mapping(nids.tolist(), bids.tolist(), node_mapping) == tuple(
+        python_indexer.get_positions_with_node_mapping(nids.tolist(), bids.tolist(), node_mapping)
+    )
+    native_positions, native_masks = native_indexer.get_positions_array_with_node_mapping(nids, bids, node_mapping)
+    python_positions, python_masks = python_indexer.get_positions_array_with_node_mapping(nids, bids, node_mapping)
+    np.testing.assert_array_equal(native_positions, python_positions)
+    np.testing.assert_array_equal(native_masks, python_masks)
+
+
+def test_reverse_position_and_splits(indexers):
+    native_indexer, python_indexer = indexers
+    for position in range(python_indexer.total_data_size()):
+        assert native_indexer.get_reverse_position(position) == python_indexer.get_reverse_position(position)
+    for k in [1, 3, 7]:
+        assert list(native_indexer.splits_into_k(k)) == list(python_indexer.splits_into_k(k))
+
+
+def test_pickle(indexers):
+    native_indexer, _ = indexers
+    restored = pickle.loads(pickle.dumps(native_indexer))
+    assert restored.feature_bin_sizes == feature_bin_sizes
+    assert restored.node_size == node_size
+
+
+@pytest.mark.parametrize("step", [1, 2])
+def test_shuffler(native_module, step):
+    # native permutations come from a different rng, so only the shuffle/reverse contract is compared
+    shuffler = native_module.Shuffler(node_size, sum(feature_bin_sizes), 42)
+    size = node_size * sum(feature_bin_sizes) * step
+    data = np.arange(size)
+    shuffled = data[shuffler.get_shuffle_index_array(step, False)]
+    assert sorted(shuffled.tolist()) == data.tolist()
+    np.testing.assert_array_equal(shuffled[shuffler.get_shuffle_index_array(step, True)], data)
+    assert shuffler.get_reverse_indexes(step, list(range(size))) == shuffled.tolist()
+    assert pickle.loads(pickle.dumps(shuffler)).get_shuffle_index(step, False) == shuffled.tolist()
+
+
+def test_exported_indexer():
+    expected = native if NATIVE_EXPECTED else py_indexer
+    assert expected is not None
+    assert indexer.HistogramIndexer is expected.HistogramIndexer
+    assert indexer.Shuffler is expected.Shuffler
+
+
+@pytest.mark.parametrize("impl", ["python", "native"])
+def test_reverse_indexes_recover_shuffled_positions(request, impl):
+    # split points found on a shuffled histogram are mapped back to bins of the original one with step 1
+    module = py_indexer if impl == "python" else request.getfixturevalue("native_module")
+    node_data_size, stride = sum(feature_bin_sizes), 2
+    shuffler = module.Shuffler(node_size, node_data_size, 42)
+    data = torch.rand(node_size * node_data_size * stride, dtype=torch.float64)
+    values = HistogramPlainValues(data.clone(), torch.float64, node_size * node_data_size, stride)
+    values.i_shuffle(shuffler)
+
+    shuffled_bins, bins = values.data.view(-1, stride), data.view(-1, stride)
+    positions = list(range(node_size * node_data_size))
+    reversed_positions = shuffler.get_reverse_indexes(1, positions)
+    assert sorted(reversed_positions) == positions
+    for position, reversed_position in zip(positions, reversed_positions):
+        torch.testing.assert_close(shuffled_bins[position], bins[reversed_position])
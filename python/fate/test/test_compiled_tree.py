@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fate.ml.ensemble.algo.secureboost.common.predict import compile_trees, go_deep
+from fate.ml.ensemble.learner.decision_tree.tree_core.decision_tree import (
+    CompiledTree,
+    Node,
+    _update_sample_pos_on_local_nodes,
+    get_feature_matrix,
+)
+
+
+def _random_tree(depth, feature_names, sitenames, seed):
+    rng = np.random.default_rng(seed)
+    nodes = []
+    for nid in range(2 ** (depth + 1) - 1):
+        if nid >= 2**depth - 1:
+            nodes.append(Node(nid=nid, sitename=sitenames[0], is_leaf=True, weight=float(rng.normal())))
+        else:
+            nodes.append(
+                Node(
+                    nid=nid,
+                    sitename=sitenames[rng.integers(len(sitenames))],
+                    fid=feature_names[rng.integers(len(feature_names))],
+                    bid=float(rng.integers(0, 8)),
+                    l=2 * nid + 1,
+                    r=2 * nid + 2,
+                )
+            )
+    return nodes
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.integers(0, 8, size=(300, 4)).astype(np.float64), columns=["x0", "x1", "x2", "x3"])
+
+
+@pytest.mark.parametrize("sitenames", [["guest"], ["guest", "host"]])
+def test_traverse(data, sitenames):
+    trees = [_random_tree(4, data.columns.tolist(), sitenames, seed) for seed in range(3)]
+    compiled_trees, feature_index = compile_trees(trees, "guest")
+    X = get_feature_matrix(data, feature_index)
+    start = np.zeros(len(data), dtype=np.int64)
+    for tree, compiled_tree in zip(trees, compiled_trees):
+        expect = [go_deep(row, tree, "guest", 0) for _, row in data.iterrows()]
+        assert compiled_tree.traverse(X, start).tolist() == expect
+
+
+def test_step(data):
+    tree = _random_tree(3, data.columns.tolist(), ["guest", "host"], 7)
+    layer = tree[3:7] + [tree[8]]
+    node_map = {n.nid: idx for idx, n in enumerate(layer)}
+    node_ids = np.array([layer[i % len(layer)].nid for i in range(len(data))])
+
+    feature_names = CompiledTree.get_split_features(layer, "guest")
+    feature_index = dict(zip(feature_names, range(len(feature_names))))
+    on_local, new_node_ids = CompiledTree(layer, "guest", feature_index).step(
+        get_feature_matrix(data, feature_index), node_ids
+    )
+
+    rows = data.assign(node_idx=node_ids)
+    expect = [_update_sample_pos_on_local_nodes(row, layer, node_map, "guest") for _, row in rows.iterrows()]
+    assert on_local.tolist() == [e[0] for e in expect]
+    assert new_node_ids.tolist() == [e[1] for e in expect]
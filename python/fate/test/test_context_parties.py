@@ -0,0 +1,106 @@
+import tempfile
+import threading
+
+import pytest
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from pytest import fixture
+
+GUEST = ("guest", "9999")
+HOST_0 = ("host", "10000")
+HOST_1 = ("host", "10001")
+PARTIES = [GUEST, HOST_0, HOST_1]
+
+
+@fixture
+def ctxs():
+    with tempfile.TemporaryDirectory() as data_dir:
+        ctxs = []
+        for party in PARTIES:
+            computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+            federation = StandaloneFederation(computing, "parties", party, PARTIES)
+            ctxs.append(Context(computing=computing, federation=federation))
+        yield ctxs
+        for ctx in ctxs:
+            ctx.computing.destroy()
+
+
+def _run_hosts(*targets):
+    errors = []
+
+    def _wrap(target):
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_wrap, args=(target,), daemon=True) for target in targets]
+    for thread in threads:
+        thread.start()
+
+    def _join():
+        for thread in threads:
+            thread.join(10)
+            assert not thread.is_alive()
+        assert not errors, errors
+
+    return _join
+
+
+def test_gather_keeps_party_order(ctxs):
+    guest, host_0, host_1 = ctxs
+    arrived = threading.Event()
+
+    def _host_0():
+        arrived.wait(10)
+        host_0.guest.put("value", "from host 0")
+
+    def _host_1():
+        host_1.guest.put("value", "from host 1")
+        arrived.set()
+
+    join = _run_hosts(_host_0, _host_1)
+    assert guest.hosts.gather("value") == ["from host 0", "from host 1"]
+    join()
+
+
+def test_get_async_receives_concurrently(ctxs):
+    guest, host_0, host_1 = ctxs
+
+    def _host_0():
+        # only sends after the guest received from host 1, a sequential get would never return
+        host_0.guest.get("host_1_received")
+        host_0.guest.put("value", 0)
+
+    def _host_1():
+        host_1.guest.put("value", 1)
+
+    join = _run_hosts(_host_0, _host_1)
+    future_0, future_1 = guest.hosts.get_async("value")
+    assert future_1.result(10) == 1
+    assert not future_0.done()
+    guest.hosts[0].put("host_1_received", True)
+    assert future_0.result(10) == 0
+    join()
+
+
+def test_put_async_then_get(ctxs):
+    guest, host_0, host_1 = ctxs
+    futures = [guest.hosts.put_async(f"value_{i}", i) for i in range(3)]
+    for future in futures:
+        future.result(10)
+    for host in [host_0, host_1]:
+        futures = {i: host.guest.get_async(f"value_{i}") for i in reversed(range(3))}
+        assert {i: future.result(10) for i, future in futures.items()} == {0: 0, 1: 1, 2: 2}
+
+
+class _Unpicklable:
+    def __reduce__(self):
+        raise ValueError("can not pickle")
+
+
+def test_put_async_propagates_exception(ctxs):
+    guest = ctxs[0]
+    with pytest.raises(ValueError, match="can not pickle"):
+        guest.hosts[0].put_async("value", _Unpicklable()).result(10)
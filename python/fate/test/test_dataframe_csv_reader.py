@@ -0,0 +1,61 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.dataframe import CSVReader, PandasReader
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from pytest import fixture
+
+GUEST = ("guest", "10000")
+NUM_ROWS = 50
+
+
+@fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        yield data_dir
+
+
+@fixture
+def ctx(data_dir):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 2})
+    yield Context(computing=computing, federation=StandaloneFederation(computing, "reader", GUEST, [GUEST]))
+    computing.destroy()
+
+
+@fixture
+def csv_path(data_dir):
+    path = f"{data_dir}/data.csv"
+    with open(path, "w") as f:
+        f.write("id,mid,y,w,a,b\n")
+        for i in range(NUM_ROWS):
+            # b is integral in the first chunks and has a missing value in a later one
+            f.write(f"s{i},m{i},{i % 2},{i / 10},{i * 1.5},{'' if i == 41 else i}\n")
+    return path
+
+
+def _sorted_pd_df(df):
+    return df.as_pd_df().sort_values("id").reset_index(drop=True)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, NUM_ROWS, 10 * NUM_ROWS])
+def test_chunked_read_matches_whole_file(ctx, csv_path, chunk_size):
+    kwargs = dict(sample_id_name="id", match_id_name="mid", label_name="y", weight_name="w")
+    streamed = CSVReader(chunk_size=chunk_size, **kwargs).to_frame(ctx, csv_path)
+    # the reading path before streaming: the whole file parsed by pandas at once, with CSVReader's defaults
+    whole = PandasReader(label_type="int", **kwargs).to_frame(ctx, pd.read_csv(csv_path))
+
+    assert streamed.shape == whole.shape == (NUM_ROWS, 2)
+    assert streamed.dtypes.to_dict() == whole.dtypes.to_dict()
+    pd.testing.assert_frame_equal(_sorted_pd_df(streamed), _sorted_pd_df(whole))
+
+    expected = pd.read_csv(csv_path).sort_values("id").reset_index(drop=True)
+    actual = _sorted_pd_df(streamed)
+    assert actual["id"].tolist() == expected["id"].tolist()
+    assert actual["mid"].tolist() == expected["mid"].tolist()
+    assert actual["y"].astype(int).tolist() == expected["y"].tolist()
+    np.testing.assert_allclose(actual["w"], expected["w"], rtol=1e-6)
+    np.testing.assert_allclose(actual["b"], expected["b"], rtol=1e-6)
@@ -0,0 +1,138 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.dataframe import PandasReader
+from fate.arch.dataframe.ops._indexer import _loc_by_flatten
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from pytest import fixture
+
+GUEST = ("guest", "10000")
+NUM_ROWS = 50
+IDS = [f"s{i}" for i in range(NUM_ROWS)]
+
+
+@fixture
+def ctx():
+    with tempfile.TemporaryDirectory() as data_dir:
+        computing = CSession(data_dir=data_dir, options={"task_cores": 2})
+        yield Context(computing=computing, federation=StandaloneFederation(computing, "loc", GUEST, [GUEST]))
+        computing.destroy()
+
+
+def _frame(ctx, ids, match_ids=None):
+    values = [int(sample_id[1:]) for sample_id in ids]
+    pdf = pd.DataFrame(
+        {
+            "id": ids,
+            "mid": match_ids if match_ids is not None else ids,
+            "y": [v % 2 for v in values],
+            "a": [v * 0.5 for v in values],
+            "k": [v * 3 for v in values],
+        }
+    )
+    reader = PandasReader(
+        sample_id_name="id",
+        match_id_name="mid",
+        label_name="y",
+        block_row_size=8,
+        dtype={"a": "float64", "k": "int64"},
+    )
+    return reader.to_frame(ctx, pdf)
+
+
+def _shuffled(ids, n, seed=0):
+    return [str(sample_id) for sample_id in np.random.default_rng(seed).permutation(ids)[:n]]
+
+
+def _sorted_pd_df(df):
+    return df.as_pd_df().sort_values("id").reset_index(drop=True)
+
+
+def _assert_same_rows(actual, expected, ordered):
+    assert actual.shape == expected.shape
+    assert actual.dtypes.to_dict() == expected.dtypes.to_dict()
+    if ordered:
+        pd.testing.assert_frame_equal(actual.as_pd_df(), expected.as_pd_df())
+    else:
+        pd.testing.assert_frame_equal(_sorted_pd_df(actual), _sorted_pd_df(expected))
+
+
+@pytest.mark.parametrize("preserve_order", [False, True])
+def test_loc_matches_row_path(ctx, preserve_order):
+    df = _frame(ctx, IDS)
+    other = _frame(ctx, _shuffled(IDS, 20))
+    indexer = other.get_indexer("sample_id")
+    selected = df.loc(indexer, preserve_order=preserve_order)
+    # the row by row path is what loc did before gathering whole blocks
+    _assert_same_rows(selected, _loc_by_flatten(df, indexer, preserve_order=preserve_order), ordered=preserve_order)
+    if preserve_order:
+        assert selected.as_pd_df()["id"].tolist() == other.as_pd_df()["id"].tolist()
+    assert selected.as_pd_df().set_index("id")["k"].to_dict() == {i: int(i[1:]) * 3 for i in other.as_pd_df()["id"]}
+
+
+@pytest.mark.parametrize("preserve_order", [False, True])
+def test_loc_all_rows(ctx, preserve_order):
+    df = _frame(ctx, IDS)
+    selected = df.loc(df.get_indexer("sample_id"), preserve_order=preserve_order)
+    _assert_same_rows(selected, df, ordered=preserve_order)
+
+
+@pytest.mark.parametrize("preserve_order", [False, True])
+def test_loc_missing_ids(ctx, preserve_order):
+    df = _frame(ctx, IDS)
+    other = _frame(ctx, ["s1", "x5", "s7", "x9", "s48"])
+    selected = df.loc(other.get_indexer("sample_id"), preserve_order=preserve_order)
+    found = [i for i in other.as_pd_df()["id"] if i in IDS]
+    # missing ids leave holes in the destination positions, the row path failed on them with preserve_order
+    _assert_same_rows(selected, _frame(ctx, found), ordered=False)
+    if preserve_order:
+        assert selected.as_pd_df()["id"].tolist() == found
+    else:
+        assert sorted(selected.as_pd_df()["id"]) == sorted(found)
+
+    none_found = df.loc(_frame(ctx, ["x1", "x2"]).get_indexer("sample_id"), preserve_order=preserve_order)
+    assert none_found.shape == (0, 2)
+
+
+@pytest.mark.parametrize("preserve_order", [False, True])
+def test_loc_duplicate_ids(ctx, preserve_order):
+    # repeated sample ids of the indexer select the row once
+    df = _frame(ctx, IDS)
+    indexer = _frame(ctx, ["s3", "s3", "s10", "s3"]).get_indexer("sample_id")
+    selected = df.loc(indexer, preserve_order=preserve_order)
+    _assert_same_rows(selected, _loc_by_flatten(df, indexer, preserve_order=preserve_order), ordered=preserve_order)
+    assert sorted(selected.as_pd_df()["id"]) == ["s10", "s3"]
+
+    # rows sharing a match id are distinct samples and are all kept
+    df = _frame(ctx, IDS, match_ids=[f"m{i // 2}" for i in range(NUM_ROWS)])
+    indexer = _frame(ctx, ["s0", "s1", "s2"], match_ids=["m0", "m0", "m1"]).get_indexer("sample_id")
+    selected = df.loc(indexer, preserve_order=preserve_order)
+    _assert_same_rows(selected, _loc_by_flatten(df, indexer, preserve_order=preserve_order), ordered=preserve_order)
+    assert _sorted_pd_df(selected)["mid"].tolist() == ["m0", "m0", "m1"]
+
+
+def test_drop(ctx):
+    df = _frame(ctx, IDS)
+    dropped_ids = _shuffled(IDS, 20)
+    dropped = df.drop(_frame(ctx, dropped_ids))
+    expected = _frame(ctx, sorted(set(IDS) - set(dropped_ids)))
+    _assert_same_rows(dropped, expected, ordered=False)
+
+
+def test_drop_missing_and_duplicate_ids(ctx):
+    df = _frame(ctx, IDS)
+    dropped = df.drop(_frame(ctx, ["s1", "x5", "s7", "s7"]))
+    _assert_same_rows(dropped, _frame(ctx, [i for i in IDS if i not in ["s1", "s7"]]), ordered=False)
+
+    nothing_dropped = df.drop(_frame(ctx, ["x1", "x2"]))
+    _assert_same_rows(nothing_dropped, df, ordered=False)
+
+
+def test_drop_all_and_none(ctx):
+    df = _frame(ctx, IDS)
+    assert df.drop(df).shape == (0, 2)
+    _assert_same_rows(df.drop(df.empty_frame()), df, ordered=False)
@@ -0,0 +1,143 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.dataframe import PandasReader, deserialize, serialize
+from fate.arch.dataframe.manager.block_manager import Block
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from fate.arch.unify import URI
+from pytest import fixture
+from scipy import sparse as sp
+
+GUEST = ("guest", "10000")
+NUM_ROWS = 30
+
+
+@fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        yield data_dir
+
+
+def _ctx(data_dir):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 2})
+    return Context(computing=computing, federation=StandaloneFederation(computing, "serde", GUEST, [GUEST]))
+
+
+def _frame(ctx):
+    ids = [f"s{i}" for i in range(NUM_ROWS)]
+    pdf = pd.DataFrame(
+        {
+            "id": ids,
+            "mid": [f"m{i}" for i in range(NUM_ROWS)],
+            "y": [i % 3 for i in range(NUM_ROWS)],
+            "w": [i * 0.25 for i in range(NUM_ROWS)],
+            "a": [i * 1.5 for i in range(NUM_ROWS)],
+            "b": [-i for i in range(NUM_ROWS)],
+            "c": [i / 7 for i in range(NUM_ROWS)],
+        }
+    )
+    reader = PandasReader(
+        sample_id_name="id",
+        match_id_name="mid",
+        label_name="y",
+        weight_name="w",
+        block_row_size=8,
+        dtype={"a": "float32", "b": "int64", "c": "float64"},
+    )
+    return reader.to_frame(ctx, pdf)
+
+
+def _sorted_pd_df(df):
+    return df.as_pd_df().sort_values("id").reset_index(drop=True)
+
+
+def _save_and_load(ctx, data_dir, table, name):
+    uri = URI.from_string(f"standalone://{data_dir}/serde/{name}")
+    schema = table.schema
+    table.save(uri, schema=schema, options={})
+    return ctx.computing.load(uri, schema=schema)
+
+
+def _assert_same_frame(actual, expected):
+    assert actual.shape == expected.shape
+    assert actual.schema.columns.tolist() == expected.schema.columns.tolist()
+    assert actual.dtypes.to_dict() == expected.dtypes.to_dict()
+    assert actual.partition_order_mappings == expected.partition_order_mappings
+    pd.testing.assert_frame_equal(_sorted_pd_df(actual), _sorted_pd_df(expected))
+
+
+@pytest.mark.parametrize("serialize_format", ["columnar", "list"])
+def test_round_trip(data_dir, serialize_format):
+    ctx = _ctx(data_dir)
+    try:
+        df = _frame(ctx)
+        table = serialize(ctx, df, serialize_format=serialize_format)
+        assert table.schema["format"] == serialize_format
+        _assert_same_frame(deserialize(ctx, _save_and_load(ctx, data_dir, table, serialize_format)), df)
+    finally:
+        ctx.computing.destroy()
+
+
+def test_columnar_stores_raw_buffers(data_dir):
+    ctx = _ctx(data_dir)
+    try:
+        table = serialize(ctx, _frame(ctx), serialize_format="columnar")
+        for _, buffers in table.collect():
+            assert all(kind != "object" and isinstance(raw[0], bytes) for kind, _, _, raw in buffers)
+    finally:
+        ctx.computing.destroy()
+
+
+def test_load_list_format_saved_before_columnar(data_dir):
+    ctx = _ctx(data_dir)
+    try:
+        df = _frame(ctx)
+        table = serialize(ctx, df, serialize_format="list")
+        # schemas written before the columnar format have no format entry
+        schema = dict(table.schema)
+        del schema["format"]
+        table.schema = schema
+        _assert_same_frame(deserialize(ctx, _save_and_load(ctx, data_dir, table, "old")), df)
+    finally:
+        ctx.computing.destroy()
+
+
+def test_unknown_format(data_dir):
+    ctx = _ctx(data_dir)
+    try:
+        with pytest.raises(ValueError, match="serialize format"):
+            serialize(ctx, _frame(ctx), serialize_format="parquet")
+    finally:
+        ctx.computing.destroy()
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        pd.Index(["s1", "sample_22", ""]),
+        torch.tensor([[1.5, 2.0], [3.0, -4.25]], dtype=torch.float32),
+        torch.tensor([[1], [2], [3]], dtype=torch.int64),
+        torch.tensor([[True], [False]]),
+    ],
+    ids=["index", "float32", "int64", "bool"],
+)
+def test_block_buffer_round_trip(block):
+    restored = Block.from_buffer(Block.to_buffer(block))
+    assert type(restored) is type(block)
+    if isinstance(block, pd.Index):
+        assert restored.tolist() == block.tolist()
+    else:
+        assert restored.dtype == block.dtype
+        torch.testing.assert_close(restored, block)
+
+
+def test_csr_block_buffer_round_trip():
+    block = sp.csr_matrix(np.array([[0, 1.5, 0], [0, 0, 0], [2.0, 0, -3.0]]))
+    restored = Block.from_buffer(Block.to_buffer(block))
+    assert sp.issparse(restored) and restored.shape == block.shape
+    np.testing.assert_array_equal(restored.toarray(), block.toarray())
@@ -0,0 +1,186 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.dataframe import PandasReader, TableReader
+from fate.arch.dataframe._frame_reader import _parse_tag_line
+from fate.arch.dataframe.manager.block_manager import SparseFloat32Block, SparseInt64Block
+from fate.arch.dataframe.ops._encoder import _bucketize_csr, _get_sparse_boundaries
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from pytest import fixture
+from scipy import sparse as sp
+
+GUEST = ("guest", "10000")
+
+
+@fixture
+def ctx():
+    with tempfile.TemporaryDirectory() as data_dir:
+        computing = CSession(data_dir=data_dir, options={"task_cores": 2})
+        yield Context(computing=computing, federation=StandaloneFederation(computing, "sparse", GUEST, [GUEST]))
+        computing.destroy()
+
+
+def _sparse_frame(ctx, lines, input_format="sparse"):
+    table = ctx.computing.parallelize(lines, include_key=True, partition=2)
+    reader = TableReader(
+        sample_id_name="id",
+        match_id_name="mid",
+        label_name="y",
+        header="id,mid,y",
+        input_format=input_format,
+        block_row_size=3,
+    )
+    return reader.to_frame(ctx, table)
+
+
+def _dense_frame(ctx, pdf):
+    reader = PandasReader(sample_id_name="id", match_id_name="mid", label_name="y", block_row_size=3, dtype="float32")
+    return reader.to_frame(ctx, pdf)
+
+
+def _sorted_pd_df(df):
+    return df.as_pd_df().sort_values("id").reset_index(drop=True)
+
+
+def test_parse_tag_line():
+    assert _parse_tag_line("m0,1,a:1.5, b:2", meta_num=2, with_value=True) == (["m0", "1"], ["a", "b"], [1.5, 2.0])
+    assert _parse_tag_line("m0 1 a b", delimiter=" ", meta_num=2) == (["m0", "1"], ["a", "b"], [1.0, 1.0])
+    assert _parse_tag_line("m0|x=3", delimiter="|", meta_num=1, with_value=True, tag_value_delimiter="=") == (
+        ["m0"],
+        ["x"],
+        [3.0],
+    )
+
+
+def test_parse_tag_line_empty_rows():
+    assert _parse_tag_line("m0,1", meta_num=2, with_value=True) == (["m0", "1"], [], [])
+    assert _parse_tag_line("m0,1,", meta_num=2, with_value=True) == (["m0", "1"], [], [])
+    assert _parse_tag_line("m0,1,, ,", meta_num=2) == (["m0", "1"], [], [])
+    assert _parse_tag_line("", meta_num=0) == ([], [], [])
+
+
+def test_parse_tag_line_duplicate_tags():
+    # values of repeated tags are kept for the block to sum up, repeated tags without value count once
+    assert _parse_tag_line("m0,a:1,a:2.5", meta_num=1, with_value=True) == (["m0"], ["a", "a"], [1.0, 2.5])
+    assert _parse_tag_line("m0,a,b,a", meta_num=1) == (["m0"], ["a", "b"], [1.0, 1.0])
+
+
+@pytest.mark.parametrize("line", ["m0,a", "m0,a:1,b", "m0,:1", "m0,a:x", "m0,a:"])
+def test_parse_tag_line_malformed(line):
+    with pytest.raises(ValueError, match="tag"):
+        _parse_tag_line(line, meta_num=1, with_value=True)
+
+
+def test_sparse_format_to_frame(ctx):
+    lines = [
+        ("s0", "m0,1,1:1.5,3:2"),
+        ("s1", "m1,0,2:3,2:1"),
+        ("s2", "m2,1,"),
+        ("s3", "m3,0"),
+        ("s4", "m4,1,10:-1,1:0.5"),
+    ]
+    df = _sparse_frame(ctx, lines)
+    # numeric tags are sorted as numbers
+    assert df.schema.columns.tolist() == ["1", "2", "3", "10"]
+    assert df.shape == (5, 4)
+    expected = pd.DataFrame(
+        {
+            "1": [1.5, 0, 0, 0, 0.5],
+            "2": [0, 4.0, 0, 0, 0],
+            "3": [2.0, 0, 0, 0, 0],
+            "10": [0, 0, 0, 0, -1.0],
+        },
+        dtype="float32",
+    )
+    actual = _sorted_pd_df(df)
+    assert actual["id"].tolist() == [f"s{i}" for i in range(5)]
+    assert actual["mid"].tolist() == [f"m{i}" for i in range(5)]
+    pd.testing.assert_frame_equal(actual[expected.columns], expected)
+
+
+def test_tag_format_to_frame(ctx):
+    df = _sparse_frame(ctx, [("s0", "m0,1,b,a,b"), ("s1", "m1,0,c"), ("s2", "m2,1")], input_format="tag")
+    assert df.schema.columns.tolist() == ["a", "b", "c"]
+    expected = pd.DataFrame({"a": [1.0, 0, 0], "b": [1.0, 0, 0], "c": [0, 1.0, 0]}, dtype="float32")
+    pd.testing.assert_frame_equal(_sorted_pd_df(df)[expected.columns], expected)
+
+
+def test_sparse_format_malformed_line(ctx):
+    with pytest.raises(Exception, match="malformed tag"):
+        _sparse_frame(ctx, [("s0", "m0,1,a:1"), ("s1", "m1,0,b")])
+
+
+@pytest.mark.parametrize("block_cls, dtype", [(SparseFloat32Block, np.float32), (SparseInt64Block, np.int64)])
+def test_sparse_block_convert_block(block_cls, dtype):
+    block = block_cls(field_indexes=[0, 1, 2, 3])
+    dense = np.array([[0, 1, 0, 2], [0, 0, 0, 0], [3, 0, 4, 0]], dtype=np.float64)
+
+    for source in [sp.coo_matrix(dense), torch.tensor(dense), dense, dense.tolist()]:
+        converted = block.convert_block(source)
+        assert sp.isspmatrix_csr(converted) and converted.dtype == dtype
+        np.testing.assert_array_equal(converted.toarray(), dense.astype(dtype))
+
+    # rows of (column offsets, values), repeated offsets are summed up and empty rows are kept
+    converted = block.convert_block([([3, 1, 3], [1, 1, 1]), ([], []), ([0, 2], [3, 4])])
+    assert sp.isspmatrix_csr(converted) and converted.dtype == dtype
+    assert converted.shape == (3, 4)
+    np.testing.assert_array_equal(converted.toarray(), dense.astype(dtype))
+
+    empty = block.convert_block([])
+    assert sp.issparse(empty) and empty.shape == (0, 4)
+
+
+def test_bucketize_csr_matches_dense():
+    rng = np.random.default_rng(0)
+    dense = rng.integers(0, 10, size=(50, 4)).astype(np.float64)
+    dense[rng.random(dense.shape) < 0.6] = 0
+    boundaries = {name: sorted(rng.choice(np.arange(0.0, 10.0), 3, replace=False).tolist()) for name in "abcd"}
+    boundaries["d"] = [0.0, 4.0, 8.0]
+
+    sparse_boundaries = _get_sparse_boundaries(dict(enumerate("abcd")), boundaries)
+    actual = _bucketize_csr(sp.csr_matrix(dense), *sparse_boundaries)
+    assert sp.isspmatrix_csr(actual)
+
+    expected = []
+    for i, name in enumerate("abcd"):
+        boundary = torch.tensor(boundaries[name], dtype=torch.float64)
+        boundary[-1] = torch.inf
+        expected.append(torch.bucketize(torch.tensor(dense[:, i]), boundary).numpy())
+    np.testing.assert_array_equal(actual.toarray(), np.stack(expected, axis=1))
+
+
+def test_bucketize_sparse_frame_matches_dense(ctx):
+    lines = [("s0", "m0,1,a:1.5,c:7"), ("s1", "m1,0,b:3,a:4"), ("s2", "m2,1"), ("s3", "m3,0,c:2,b:0.5")]
+    df = _sparse_frame(ctx, lines)
+    dense_df = _dense_frame(ctx, _sorted_pd_df(df))
+    boundaries = {"a": [1.0, 2.0, 5.0], "b": [0.5, 3.0, 4.0], "c": [2.5, 6.0, 10.0]}
+    actual = _sorted_pd_df(df.bucketize(boundaries))
+    expected = _sorted_pd_df(dense_df.bucketize(boundaries))
+    for name in boundaries:
+        assert actual[name].astype(int).tolist() == expected[name].astype(int).tolist()
+
+
+def _tensor_rows_by_id(df):
+    # shards follow the block order, the same as rows of as_pd_df
+    shards = [shard for _, shard in sorted(df.as_tensor().shardings._data.collect())]
+    ids = df.as_pd_df()["id"].tolist()
+    return shards, torch.vstack([shard.to_dense() for shard in shards])[np.argsort(ids)]
+
+
+def test_as_tensor_matches_dense(ctx):
+    lines = [("s0", "m0,1,a:1.5,c:7"), ("s1", "m1,0,b:3,a:4"), ("s2", "m2,1"), ("s3", "m3,0,c:2,b:0.5")]
+    df = _sparse_frame(ctx, lines)
+    sparse_shards, sparse_rows = _tensor_rows_by_id(df)
+    _, dense_rows = _tensor_rows_by_id(_dense_frame(ctx, df.as_pd_df()))
+    torch.testing.assert_close(sparse_rows, dense_rows)
+
+    w = torch.arange(3, dtype=torch.float32).reshape(-1, 1)
+    for shard in sparse_shards:
+        assert shard.layout == torch.sparse_coo
+        # X @ w runs on the sparse shard as on its dense form
+        torch.testing.assert_close(torch.sparse.mm(shard, w), shard.to_dense() @ w)
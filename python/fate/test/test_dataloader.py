@@ -0,0 +1,118 @@
+import random
+import tempfile
+import threading
+
+import pandas as pd
+import pytest
+import torch
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.dataframe import DataLoader, PandasReader
+from fate.arch.federation.backends.standalone import StandaloneFederation
+
+GUEST = ("guest", "10000")
+HOST = ("host", "9999")
+NUM_ROWS = 50
+IDS = [f"s{i}" for i in range(NUM_ROWS)]
+
+
+def _ctx(data_dir, party, parties):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 2})
+    return Context(computing=computing, federation=StandaloneFederation(computing, "dataloader", party, parties))
+
+
+def _frame(ctx, with_label=True):
+    values = [int(sample_id[1:]) for sample_id in IDS]
+    pdf = pd.DataFrame({"id": IDS, "mid": IDS, "a": [v * 0.5 for v in values], "b": [-v for v in values]})
+    kwargs = dict(sample_id_name="id", match_id_name="mid", block_row_size=8, dtype="float64")
+    if with_label:
+        pdf["y"] = [v % 2 for v in values]
+        pdf["w"] = [v * 0.1 for v in values]
+        kwargs.update(label_name="y", label_type="float64", weight_name="w", weight_type="float64")
+    return PandasReader(**kwargs).to_frame(ctx, pdf)
+
+
+def _merge(tensor):
+    return tensor.shardings.merge()
+
+
+def _batch_ids(batch):
+    # column a holds half of the numeric part of the sample id
+    return [f"s{int(a * 2)}" for a in _merge(batch.x)[:, 0].tolist()]
+
+
+def _expected_order(shuffle, random_state):
+    ids = sorted(IDS)
+    if shuffle:
+        random.Random(random_state).shuffle(ids)
+    return ids
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_local_batches(shuffle):
+    with tempfile.TemporaryDirectory() as data_dir:
+        ctx = _ctx(data_dir, GUEST, [GUEST])
+        try:
+            loader = DataLoader(
+                _frame(ctx), ctx=ctx, mode="local", role="guest", batch_size=8, shuffle=shuffle, random_state=3
+            )
+            batches = list(loader)
+            expected = _expected_order(shuffle, random_state=3)
+            assert [batch.batch_id for batch in batches] == list(range(7))
+            assert [_batch_ids(batch) for batch in batches] == [expected[i : i + 8] for i in range(0, NUM_ROWS, 8)]
+            for batch in batches:
+                values = [int(sample_id[1:]) for sample_id in _batch_ids(batch)]
+                torch.testing.assert_close(
+                    _merge(batch.x)[:, 1], torch.tensor([-v for v in values], dtype=torch.float64)
+                )
+                torch.testing.assert_close(
+                    _merge(batch.label).flatten(), torch.tensor([v % 2 for v in values]).double()
+                )
+                torch.testing.assert_close(
+                    _merge(batch.weight).flatten(), torch.tensor([v * 0.1 for v in values]).double()
+                )
+
+            # batches are gathered once and reused by later epochs
+            assert all(a is b for a, b in zip(batches, loader))
+        finally:
+            ctx.computing.destroy()
+
+
+def test_full_batch():
+    with tempfile.TemporaryDirectory() as data_dir:
+        ctx = _ctx(data_dir, GUEST, [GUEST])
+        try:
+            batches = list(DataLoader(_frame(ctx), ctx=ctx, mode="local", role="guest", batch_size=None))
+            assert len(batches) == 1
+            assert sorted(_batch_ids(batches[0])) == sorted(IDS)
+        finally:
+            ctx.computing.destroy()
+
+
+def test_hetero_host_follows_guest_plan():
+    with tempfile.TemporaryDirectory() as data_dir:
+        guest, host = _ctx(data_dir, GUEST, [GUEST, HOST]), _ctx(data_dir, HOST, [GUEST, HOST])
+        host_batches, errors = [], []
+
+        def _host():
+            try:
+                loader = DataLoader(_frame(host, with_label=False), ctx=host, mode="hetero", role="host", batch_size=8)
+                host_batches.extend(_batch_ids(batch) for batch in loader)
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=_host, daemon=True)
+        thread.start()
+        try:
+            loader = DataLoader(
+                _frame(guest), ctx=guest, mode="hetero", role="guest", batch_size=8, shuffle=True, random_state=7
+            )
+            guest_batches = [_batch_ids(batch) for batch in loader]
+            thread.join(60)
+            assert not thread.is_alive()
+            assert not errors, errors
+            assert guest_batches == host_batches
+            assert sum(guest_batches, []) == _expected_order(True, random_state=7)
+        finally:
+            guest.computing.destroy()
+            host.computing.destroy()
@@ -0,0 +1,85 @@
+import pickle
+
+import pytest
+
+from fate.arch.federation.api._codec import NoneCodec, ZlibCodec, compress, decompress, get_codec_id
+from fate.arch.federation.api._serdes import _FederationBytesCoder, _SplitTableUtil
+from fate.arch.federation.api._table_meta import TableMeta
+from fate.arch.federation.message_queue._federation import MessageQueueBasedFederation
+
+
+def test_compress_threshold():
+    v = b"a" * 1024
+    assert compress(v, "zlib", 2048) == (NoneCodec.codec_id, v)
+    codec_id, encoded = compress(v, "zlib", 1024)
+    assert codec_id == ZlibCodec.codec_id
+    assert len(encoded) < len(v)
+    assert decompress(encoded, codec_id) == v
+
+
+def test_compress_skip_incompressible():
+    v = bytes(range(256))
+    assert compress(v, "zlib", 0) == (NoneCodec.codec_id, v)
+
+
+@pytest.mark.parametrize(
+    "codec_name, module", [("zlib", "zlib"), ("lz4", "lz4.frame"), ("zstd", "zstandard")], ids=["zlib", "lz4", "zstd"]
+)
+def test_compress_skip_encoded(codec_name, module):
+    pytest.importorskip(module)
+    v = pickle.dumps(list(range(1000)))
+    codec_id, encoded = compress(v, codec_name, 0)
+    assert codec_id != NoneCodec.codec_id
+    # an encoded payload is passed through whichever codec is configured
+    for name in ["zlib", codec_name]:
+        assert compress(encoded, name, 0) == (NoneCodec.codec_id, encoded)
+    assert decompress(encoded, codec_id) == v
+
+
+def test_invalid_codec():
+    with pytest.raises(ValueError):
+        get_codec_id("snappy")
+
+
+@pytest.mark.parametrize("codec_id", [NoneCodec.codec_id, ZlibCodec.codec_id])
+def test_bytes_coder_base(codec_id):
+    v = b"payload"
+    encoded = _FederationBytesCoder.encode_base(v, codec_id)
+    assert _FederationBytesCoder.decode_mode(encoded) == (0 if codec_id == NoneCodec.codec_id else 2)
+    assert _FederationBytesCoder.decode_codec(encoded) == codec_id
+    assert _FederationBytesCoder.decode_base(encoded) == v
+
+
+@pytest.mark.parametrize("codec_id", [NoneCodec.codec_id, ZlibCodec.codec_id])
+def test_bytes_coder_split(codec_id):
+    table_meta = TableMeta(num_partitions=4, key_serdes_type=0, value_serdes_type=0, partitioner_type=0)
+    encoded = _FederationBytesCoder.encode_split(table_meta, 100, 10, 10, codec_id)
+    assert _FederationBytesCoder.decode_mode(encoded) == (1 if codec_id == NoneCodec.codec_id else 3)
+    assert _FederationBytesCoder.decode_codec(encoded) == codec_id
+    decoded_meta, total_size, num_slice, slice_size = _FederationBytesCoder.decode_split(encoded)
+    assert decoded_meta.num_partitions == 4
+    assert (total_size, num_slice, slice_size) == (100, 10, 10)
+
+
+class _Table:
+    num_partitions = 2
+
+    def mapPartitionsWithIndexNoSerdes(self, func, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize("split", [False, True])
+def test_mq_split_table_not_compressed_again(monkeypatch, split):
+    federation = MessageQueueBasedFederation.__new__(MessageQueueBasedFederation)
+    federation._local_party = ("guest", "9999")
+    federation._mq, federation._conf = None, {}
+    federation._max_message_size, federation._table_message_format = 1024, None
+    send_func_options = {}
+    monkeypatch.setattr(federation, "get_default_compress_codec", lambda: "zlib")
+    monkeypatch.setattr(federation, "get_default_compress_threshold", lambda: 0)
+    monkeypatch.setattr(federation, "_get_party_topic_infos_by_name_and_partitions", lambda *args, **kwargs: None)
+    monkeypatch.setattr(federation, "_get_partition_send_func", lambda **kwargs: send_func_options.update(kwargs))
+
+    name = _SplitTableUtil.get_split_table_key("obj") if split else "obj__table_persistent_0__"
+    federation._push_table(_Table(), name, "tag", [("host", "10000")])
+    assert send_func_options["codec"] == (None if split else "zlib")
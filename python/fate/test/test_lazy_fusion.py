@@ -0,0 +1,108 @@
+import os
+import tempfile
+
+import pytest
+from fate.arch.computing.api._table import _LazyKVTable
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.config import cfg
+from pytest import fixture
+
+
+@fixture
+def session():
+    with tempfile.TemporaryDirectory() as data_dir:
+        session = CSession(data_dir=data_dir, options={"task_cores": 2})
+        yield session
+        session.destroy()
+
+
+@fixture
+def lazy():
+    with cfg.temp_override({"computing.lazy_fusion": True}):
+        yield
+
+
+def _narrow_chain(table):
+    table = table.mapValues(lambda x: x * 3)
+    table = table.filter(lambda x: x % 2 == 0)
+    table = table.mapPartitions(lambda kvs: [(k, v + 1) for k, v in kvs], preserves_partitioning=True)
+    table = table.applyPartitions(lambda kvs: sum(v for _, v in kvs))
+    return table
+
+
+def _counted(path):
+    def _f(x):
+        # records are small, appends from several workers do not interleave
+        with open(path, "a") as f:
+            f.write(".")
+        return x
+
+    return _f
+
+
+def _num_calls(path):
+    with open(path) as f:
+        return len(f.read())
+
+
+def test_disabled_by_default(session):
+    table = session.parallelize([(i, i) for i in range(10)], partition=2)
+    assert not isinstance(table.mapValues(lambda x: x), _LazyKVTable)
+
+
+def test_fused_matches_unfused(session, lazy):
+    table = session.parallelize([(i, i) for i in range(100)], include_key=True, partition=4)
+    fused = _narrow_chain(table)
+    assert isinstance(fused, _LazyKVTable)
+    fused = sorted(fused.collect())
+    with cfg.temp_override({"computing.lazy_fusion": False}):
+        unfused = sorted(_narrow_chain(table).collect())
+    assert fused == unfused
+
+
+def test_branching_parent_computed_once(session, lazy):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "calls")
+        table = session.parallelize([(i, i) for i in range(50)], include_key=True, partition=4)
+        parent = table.mapValues(_counted(path))
+        first = parent.mapValues(lambda x: x + 1)
+        second = parent.mapValues(lambda x: x + 2)
+        assert sorted(first.collect()) == [(i, i + 1) for i in range(50)]
+        assert sorted(second.collect()) == [(i, i + 2) for i in range(50)]
+        assert sorted(parent.collect()) == [(i, i) for i in range(50)]
+        assert _num_calls(path) == 50
+
+
+def test_single_consumer_chain_fused(session, lazy):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "calls")
+        table = session.parallelize([(i, i) for i in range(50)], include_key=True, partition=4)
+        child = table.mapValues(_counted(path)).mapValues(lambda x: x + 1)
+        assert sorted(child.collect()) == [(i, i + 1) for i in range(50)]
+        assert _num_calls(path) == 50
+
+
+def test_functor_bound_at_call_time(session, lazy):
+    table = session.parallelize([(i, i) for i in range(10)], include_key=True, partition=2)
+    offset = [1]
+    shifted = table.mapValues(lambda x: x + offset[0])
+    offset[0] = 100
+    assert sorted(shifted.collect()) == [(i, i + 1) for i in range(10)]
+
+
+def test_schema_propagated(session, lazy):
+    table = session.parallelize([(i, i) for i in range(10)], include_key=True, partition=2)
+    mapped = table.mapValues(lambda x: x)
+    mapped.schema = {"header": "x"}
+    assert mapped.materialize().schema == {"header": "x"}
+    mapped.schema = {"header": "y"}
+    assert mapped.materialize().schema == {"header": "y"}
+
+
+@pytest.mark.parametrize("use_lazy", [True, False])
+def test_join_after_narrow_ops(session, use_lazy):
+    with cfg.temp_override({"computing.lazy_fusion": use_lazy}):
+        table = session.parallelize([(i, i) for i in range(20)], include_key=True, partition=2)
+        left = table.mapValues(lambda x: x + 1)
+        right = table.filter(lambda x: x < 10)
+        assert sorted(left.join(right, lambda x, y: (x, y)).collect()) == [(i, (i + 1, i)) for i in range(10)]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+import torch
+
+from fate.arch.tensor.inside import MomentSummary
+
+
+@pytest.mark.parametrize("num_blocks", [1, 3, 17])
+def test_merge_matches_full_pass(num_blocks):
+    rng = np.random.default_rng(0)
+    # large offset with small spread, where naive power sums lose all precision
+    data = rng.normal(1e6, 3, size=(500, 3))
+    data[7, 1] = np.nan
+    data[:, 2] = 5.0
+
+    summary = MomentSummary(3)
+    for block in np.array_split(data, num_blocks):
+        summary += torch.tensor(block)
+
+    for c in range(3):
+        column = data[:, c][~np.isnan(data[:, c])]
+        n = len(column)
+        centered = column - column.mean()
+        assert summary.count[c] == n
+        assert summary.nan_count[c] == len(data) - n
+        assert summary.min[c] == column.min() and summary.max[c] == column.max()
+        assert np.isclose(summary.mean[c], column.mean())
+        assert np.isclose(summary.m2[c] / n, (centered**2).mean())
+        assert np.isclose(summary.m3[c] / n, (centered**3).mean(), atol=1e-6)
+        assert np.isclose(summary.m4[c] / n, (centered**4).mean())
+
+
+def test_empty_block():
+    summary = MomentSummary.from_array(np.empty((0, 2))) + MomentSummary.from_array(np.array([[1.0, 2.0]]))
+    assert summary.count.tolist() == [1, 1]
+    assert summary.mean.tolist() == [1.0, 2.0]
+    assert summary.m2.tolist() == [0.0, 0.0]
+
+
+def test_from_csr():
+    from scipy import sparse as sp
+
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(200, 4))
+    data[rng.random(data.shape) < 0.9] = 0.0
+    data[5, 0] = np.nan
+    data[:, 3] = 0.0
+
+    summary = MomentSummary.from_csr(sp.csr_matrix(data))
+    expect = MomentSummary.from_array(data)
+    for name in ["count", "nan_count", "sum", "min", "max", "mean", "m2", "m3", "m4"]:
+        assert np.allclose(getattr(summary, name), getattr(expect, name)), name
@@ -0,0 +1,157 @@
+import multiprocessing
+import pickle
+import tempfile
+
+import pytest
+import torch
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from torch.distributed import ReduceOp
+
+GUEST = ("guest", "9999")
+HOST_0 = ("host", "10000")
+HOST_1 = ("host", "10001")
+
+
+def _local(rank):
+    return torch.arange(4, dtype=torch.int64) + 10 * rank
+
+
+def _collectives(ctx):
+    comm = ctx.mpc.communicator
+    rank, world_size = comm.get_rank(), comm.get_world_size()
+    x = _local(rank)
+    results = {}
+
+    # messages are indexed per group, point to point traffic uses a group of its two ranks
+    # so ranks outside of it stay in step on the main group
+    with comm.new_group(ranks=[0, 1], name="p2p"):
+        if rank == 0:
+            comm.send(x, dst=1)
+            comm.send_obj({"from": rank}, dst=1)
+            comm.isend(x + 1, dst=1).wait()
+        elif rank == 1:
+            results["recv"] = comm.recv(torch.empty_like(x), src=0)
+            results["recv_obj"] = comm.recv_obj(src=0)
+            received = torch.empty_like(x)
+            comm.irecv(received, src=0).wait()
+            results["irecv"] = received
+
+    results["all_gather"] = comm.all_gather(x)
+    results["all_gather_batched"] = comm.all_gather([x, x * 2], batched=True)
+    results["all_reduce"] = comm.all_reduce(x)
+    results["all_reduce_batched"] = comm.all_reduce([x, x * 2], batched=True)
+    results["all_reduce_bxor_batched"] = comm.all_reduce([x, x * 2], op=ReduceOp.BXOR, batched=True)
+    results["reduce"] = comm.reduce(x, dst=world_size - 1)
+    results["reduce_batched"] = comm.reduce([x, x * 2], dst=0, batched=True)
+    results["reduce_bxor_batched"] = comm.reduce([x, x * 2], dst=0, op=ReduceOp.BXOR, batched=True)
+    results["broadcast"] = comm.broadcast(x.clone(), src=1)
+    results["broadcast_batched"] = comm.broadcast([x.clone(), x * 2], src=1, batched=True)
+    results["broadcast_obj"] = comm.broadcast_obj(src=0, obj={"from": rank} if rank == 0 else None)
+
+    if world_size > 2:
+        # a collective of a sub group must not wait for ranks outside of it
+        group = comm.new_group(ranks=[0, world_size - 1], name="sub")
+        if rank in group.ranks:
+            with group:
+                results["group_all_gather"] = comm.all_gather(x)
+                results["group_all_reduce_batched"] = comm.all_reduce([x, x * 2], batched=True)
+        results["after_group_all_reduce"] = comm.all_reduce(x)
+
+    if world_size == 2:
+        # beaver multiplication reveals epsilon and delta in one batched round
+        a = ctx.mpc.encrypt(x.float() if rank == 0 else None, src=0, size=x.shape)
+        b = ctx.mpc.encrypt(x.float() if rank == 1 else None, src=1, size=x.shape)
+        results["mul"] = (a * b).get_plain_text()
+    return results
+
+
+def _run_party(data_dir, party, parties, queue):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    try:
+        ctx = Context(computing=computing, federation=StandaloneFederation(computing, "mpc", party, parties))
+        ctx.mpc.init()
+        # pickled by value, tensors put on a queue directly are shared through this process
+        queue.put((ctx.mpc.rank, pickle.dumps(_collectives(ctx))))
+    except BaseException as e:
+        queue.put((None, repr(e)))
+        raise
+    finally:
+        computing.destroy()
+
+
+def _run(parties):
+    # the communicator is a process singleton, each party runs in its own process
+    mp_ctx = multiprocessing.get_context("spawn")
+    queue = mp_ctx.Queue()
+    with tempfile.TemporaryDirectory() as data_dir:
+        processes = [mp_ctx.Process(target=_run_party, args=(data_dir, party, parties, queue)) for party in parties]
+        for process in processes:
+            process.start()
+        results = {}
+        for _ in processes:
+            rank, result = queue.get(timeout=300)
+            assert rank is not None, result
+            results[rank] = pickle.loads(result)
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+    return [results[rank] for rank in range(len(parties))]
+
+
+def _assert_equal(actual, expected):
+    if isinstance(expected, list):
+        assert isinstance(actual, list) and len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_equal(a, e)
+    else:
+        torch.testing.assert_close(actual, expected)
+
+
+@pytest.mark.parametrize("parties", [[GUEST, HOST_0], [GUEST, HOST_0, HOST_1]], ids=["two_parties", "three_parties"])
+def test_collectives(parties):
+    results = _run(parties)
+    world_size = len(parties)
+    xs = [_local(rank) for rank in range(world_size)]
+    total = sum(xs)
+    xor = xs[0]
+    for x in xs[1:]:
+        xor = xor ^ x
+    xor_doubled = xs[0] * 2
+    for x in xs[1:]:
+        xor_doubled = xor_doubled ^ (x * 2)
+
+    _assert_equal(results[1]["recv"], xs[0])
+    assert results[1]["recv_obj"] == {"from": 0}
+    _assert_equal(results[1]["irecv"], xs[0] + 1)
+    for rank, result in enumerate(results):
+        _assert_equal(result["all_gather"], xs)
+        _assert_equal(result["all_gather_batched"], [[x, x * 2] for x in xs])
+        _assert_equal(result["all_reduce"], total)
+        _assert_equal(result["all_reduce_batched"], [total, total * 2])
+        _assert_equal(result["all_reduce_bxor_batched"], [xor, xor_doubled])
+        _assert_equal(result["broadcast"], xs[1])
+        _assert_equal(result["broadcast_batched"], [xs[1], xs[1] * 2])
+        assert result["broadcast_obj"] == {"from": 0}
+        if world_size == 2:
+            _assert_equal(result["mul"], (xs[0] * xs[1]).float())
+        if rank == world_size - 1:
+            _assert_equal(result["reduce"], total)
+        else:
+            assert result["reduce"] is None
+        if rank == 0:
+            _assert_equal(result["reduce_batched"], [total, total * 2])
+            _assert_equal(result["reduce_bxor_batched"], [xor, xor_doubled])
+        else:
+            assert result["reduce_batched"] is None
+            assert result["reduce_bxor_batched"] is None
+
+    if world_size > 2:
+        group_xs = [xs[0], xs[-1]]
+        for rank in [0, world_size - 1]:
+            _assert_equal(results[rank]["group_all_gather"], group_xs)
+            _assert_equal(results[rank]["group_all_reduce_batched"], [sum(group_xs), sum(group_xs) * 2])
+        assert "group_all_gather" not in results[1]
+        for result in results:
+            _assert_equal(result["after_group_all_reduce"], total)
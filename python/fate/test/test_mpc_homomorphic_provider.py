@@ -0,0 +1,172 @@
+import multiprocessing
+import os
+import pickle
+import tempfile
+
+import pytest
+import torch
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from torch.distributed import ReduceOp
+
+GUEST = ("guest", "9999")
+HOST = ("host", "10000")
+SIZE0, SIZE1 = (3, 4), (4, 2)
+
+
+def _reveal(comm, share, binary=False):
+    if binary:
+        return comm.all_reduce(share.clone(), op=ReduceOp.BXOR)
+    # int64 sums wrap around, the same as the ring of the shares
+    return comm.all_reduce(share.clone())
+
+
+def _reveal_tuple(comm, result, types):
+    return [_reveal(comm, tensor.share, binary=share_type == "B") for tensor, share_type in zip(result, types)]
+
+
+def _triples(ctx, comm, provider):
+    results = {}
+    results["mul"] = _reveal_tuple(comm, provider.generate_additive_triple(ctx, SIZE0, SIZE0, "mul"), "AAA")
+    results["matmul"] = _reveal_tuple(comm, provider.generate_additive_triple(ctx, SIZE0, SIZE1, "matmul"), "AAA")
+    results["square"] = _reveal_tuple(comm, provider.square(ctx, SIZE0), "AA")
+    results["binary"] = _reveal_tuple(comm, provider.generate_binary_triple(SIZE0, SIZE0), "BBB")
+    results["b2a"] = _reveal_tuple(comm, provider.B2A_rng(SIZE0), "AB")
+    return results
+
+
+def _cache(ctx, comm, provider, cache_dir):
+    results = {}
+    # online run traced once, its requests are what the offline phase generates tuples for
+    provider.trace()
+    provider.generate_additive_triple(ctx, SIZE0, SIZE0, "mul")
+    provider.generate_binary_triple(SIZE0, SIZE0)
+    provider.trace(False)
+    provider.save_cache(cache_dir)
+    provider.preprocess(ctx, filepath=cache_dir, repeats=2)
+    tuple_path = provider._get_tuple_path(cache_dir)
+    results["tuple_file_saved"] = os.path.exists(tuple_path)
+
+    provider.load_cache(cache_dir)
+    results["tuple_file_removed"] = not os.path.exists(tuple_path)
+    cached = {key: [shares.clone() for shares in stacked] for key, stacked in provider.tuple_cache.items()}
+    results["cached"] = {
+        key[0]: [_reveal(comm, shares, binary=key[0] == "generate_binary_triple") for shares in stacked]
+        for key, stacked in cached.items()
+    }
+
+    triples = [provider.generate_additive_triple(ctx, SIZE0, SIZE0, "mul") for _ in range(3)]
+    binary = [provider.generate_binary_triple(SIZE0, SIZE0) for _ in range(3)]
+    results["mul"] = [_reveal_tuple(comm, triple, "AAA") for triple in triples]
+    results["binary"] = [_reveal_tuple(comm, triple, "BBB") for triple in binary]
+
+    # consumed tuples are not saved again
+    provider.save_cache(cache_dir)
+    results["tuple_file_resaved"] = os.path.exists(tuple_path)
+    return results
+
+
+def _run_party(data_dir, party, target, queue):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    try:
+        ctx = Context(computing=computing, federation=StandaloneFederation(computing, "he", party, [GUEST, HOST]))
+        ctx.mpc.init()
+        from fate.arch.protocol.mpc import communicator
+        from fate.arch.protocol.mpc.provider import HomomorphicProvider
+
+        comm = communicator.get()
+        provider = HomomorphicProvider()
+        if target == "triples":
+            results = _triples(ctx, comm, provider)
+        else:
+            results = _cache(ctx, comm, provider, os.path.join(data_dir, "tuple_cache"))
+        # pickled by value, tensors put on a queue directly are shared through this process
+        queue.put((comm.get_rank(), pickle.dumps(results)))
+    except BaseException as e:
+        queue.put((None, repr(e)))
+        raise
+    finally:
+        computing.destroy()
+
+
+def _run(target):
+    # the communicator is a process singleton, each party runs in its own process
+    mp_ctx = multiprocessing.get_context("spawn")
+    queue = mp_ctx.Queue()
+    with tempfile.TemporaryDirectory() as data_dir:
+        processes = [
+            mp_ctx.Process(target=_run_party, args=(data_dir, party, target, queue)) for party in [GUEST, HOST]
+        ]
+        for process in processes:
+            process.start()
+        results = {}
+        for _ in processes:
+            rank, result = queue.get(timeout=600)
+            assert rank is not None, result
+            results[rank] = pickle.loads(result)
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+    # both parties see the same cache files
+    for key in results[0]:
+        if isinstance(results[0][key], bool):
+            assert results[0][key] == results[1][key]
+    return results[0]
+
+
+def _assert_triple(a, b, c, op):
+    # products wrap around in int64 the same as in the ring
+    assert torch.equal(c, op(a, b))
+
+
+@pytest.fixture(scope="module")
+def triples():
+    return _run("triples")
+
+
+def test_additive_triples(triples):
+    _assert_triple(*triples["mul"], torch.mul)
+    _assert_triple(*triples["matmul"], torch.matmul)
+    a, b, _ = triples["matmul"]
+    assert a.shape == SIZE0 and b.shape == SIZE1
+    r, r2 = triples["square"]
+    assert torch.equal(r2, r * r)
+
+
+def test_binary_triple(triples):
+    a, b, c = triples["binary"]
+    assert torch.equal(c, a & b)
+
+
+def test_b2a_rng(triples):
+    r_arithmetic, r_binary = triples["b2a"]
+    assert torch.equal(r_arithmetic, r_binary)
+    assert set(r_binary.flatten().tolist()) <= {0, 1}
+
+
+def test_cache_round_trip():
+    results = _run("cache")
+    assert results["tuple_file_saved"]
+    assert results["tuple_file_removed"]
+    assert not results["tuple_file_resaved"]
+
+    # the cache holds the tuples of both repeats of the traced run
+    cached_mul = results["cached"]["generate_additive_triple"]
+    cached_binary = results["cached"]["generate_binary_triple"]
+    assert all(len(stacked) == 2 for stacked in cached_mul + cached_binary)
+
+    for i, (a, b, c) in enumerate(results["mul"]):
+        _assert_triple(a, b, c, torch.mul)
+        if i < 2:
+            # cached tuples are handed out in order
+            assert all(torch.equal(x, cached[i]) for x, cached in zip((a, b, c), cached_mul))
+    for i, (a, b, c) in enumerate(results["binary"]):
+        _assert_triple(a, b, c, torch.bitwise_and)
+        if i < 2:
+            assert all(torch.equal(x, cached[i]) for x, cached in zip((a, b, c), cached_binary))
+
+    # each tuple is handed out once, the call after the cache runs out generates a fresh one
+    for tuples in [results["mul"], results["binary"]]:
+        firsts = [a for a, _, _ in tuples]
+        assert not any(torch.equal(firsts[i], firsts[j]) for i in range(3) for j in range(i + 1, 3))
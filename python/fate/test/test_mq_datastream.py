@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from fate.arch.federation.message_queue._datastream import BinaryDatastream, Datastream
+from fate.arch.federation.message_queue._federation import (
+    TABLE_MESSAGE_FORMAT_BINARY,
+    TABLE_MESSAGE_FORMAT_JSON,
+    _decode_table_message,
+)
+
+KVS = [(b"k1", b"v1"), (b"", b"empty key"), (b"\x00\xff" * 100, b""), (b"key", bytes(range(256)))]
+
+
+def test_binary_datastream_roundtrip():
+    datastream = BinaryDatastream()
+    for k, v in KVS:
+        datastream.append(k, v)
+    assert datastream.get_size() == sum(BinaryDatastream.frame_size(k, v) for k, v in KVS)
+    assert list(BinaryDatastream.iter_kv(datastream.get_data())) == KVS
+
+    datastream.clear()
+    assert datastream.get_size() == 0
+    assert list(BinaryDatastream.iter_kv(datastream.get_data())) == []
+
+
+def test_binary_datastream_truncated():
+    datastream = BinaryDatastream()
+    datastream.append(b"key", b"value")
+    with pytest.raises(ValueError):
+        list(BinaryDatastream.iter_kv(datastream.get_data()[:-1]))
+
+
+@pytest.mark.parametrize("table_message_format", [TABLE_MESSAGE_FORMAT_JSON, TABLE_MESSAGE_FORMAT_BINARY])
+def test_decode_table_message(table_message_format):
+    if table_message_format == TABLE_MESSAGE_FORMAT_BINARY:
+        datastream = BinaryDatastream()
+        for k, v in KVS:
+            datastream.append(k, v)
+        body = datastream.get_data()
+    else:
+        datastream = Datastream()
+        for k, v in KVS:
+            datastream.append({"k": k.hex(), "v": v.hex()})
+        body = datastream.get_data().encode()
+    assert _decode_table_message(body, table_message_format) == KVS
+
+
+def test_decode_table_message_unknown_format():
+    with pytest.raises(ValueError):
+        _decode_table_message(json.dumps([]).encode(), "unknown")
@@ -0,0 +1,71 @@
+import multiprocessing
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.dataframe import PandasReader
+from fate.arch.federation.backends.standalone import StandaloneFederation
+
+GUEST = ("guest", "10000")
+HOST = ("host", "9999")
+NUM_ROWS = 300
+NUM_FEATURES = 3
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(NUM_ROWS, 2 * NUM_FEATURES))
+    # correlated columns within and across parties
+    data[:, 1] += data[:, 0]
+    data[:, 4] += data[:, 0]
+    data[:, 3] -= 2 * data[:, 2]
+    return data
+
+
+def _fit(data_dir, party, chunk_rows, queue):
+    import fate.ml.statistics.pearson_correlation as pearson_correlation
+
+    pearson_correlation.MPC_MATMUL_CHUNK_ROWS = chunk_rows
+    computing = CSession(data_dir=data_dir, options={"task_cores": 2})
+    try:
+        ctx = Context(computing=computing, federation=StandaloneFederation(computing, "pearson", party, [GUEST, HOST]))
+        columns = slice(0, NUM_FEATURES) if party == GUEST else slice(NUM_FEATURES, 2 * NUM_FEATURES)
+        df = pd.DataFrame(_data()[:, columns], columns=[f"x{i}" for i in range(NUM_FEATURES)])
+        ids = [f"s{i}" for i in range(NUM_ROWS)]
+        df.insert(0, "id", ids)
+        df.insert(1, "mid", ids)
+        data = PandasReader(sample_id_name="id", match_id_name="mid", block_row_size=16).to_frame(ctx, df)
+        model = pearson_correlation.PearsonCorrelation()
+        model.fit(ctx, data)
+        queue.put((party, model.local_corr.values, model.vif.values, model.remote_corr.values))
+    finally:
+        computing.destroy()
+
+
+@pytest.mark.parametrize("chunk_rows", [50, 100000], ids=["chunked", "one_chunk"])
+def test_fit_matches_numpy(chunk_rows):
+    # the mpc communicator is a process singleton, each party runs in its own process
+    mp_ctx = multiprocessing.get_context("spawn")
+    queue = mp_ctx.Queue()
+    with tempfile.TemporaryDirectory() as data_dir:
+        processes = [mp_ctx.Process(target=_fit, args=(data_dir, party, chunk_rows, queue)) for party in [GUEST, HOST]]
+        for process in processes:
+            process.start()
+        results = {}
+        for _ in processes:
+            party, local_corr, vif, remote_corr = queue.get(timeout=300)
+            results[party] = local_corr, vif, remote_corr
+        for process in processes:
+            process.join(60)
+            assert process.exitcode == 0
+
+    expected = np.corrcoef(_data(), rowvar=False)
+    guest_features, host_features = slice(0, NUM_FEATURES), slice(NUM_FEATURES, 2 * NUM_FEATURES)
+    for party, features in [(GUEST, guest_features), (HOST, host_features)]:
+        local_corr, vif, remote_corr = results[party]
+        np.testing.assert_allclose(local_corr, expected[features, features], atol=1e-6)
+        np.testing.assert_allclose(vif.ravel(), np.diag(np.linalg.inv(expected[features, features])), rtol=1e-4)
+        np.testing.assert_allclose(remote_corr, expected[guest_features, host_features], atol=1e-4)
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+import torch
+from fate.arch.protocol.phe import ou, paillier
+
+POOL_SIZE = 8
+
+
+@pytest.fixture(params=[paillier, ou], ids=["paillier", "ou"])
+def keys(request):
+    sk, pk, coder = request.param.keygen(1024)
+    if not hasattr(pk.pk, "start_obfuscator_pool"):
+        pytest.skip("fate_utils is built without the obfuscator pool")
+    yield sk, pk, coder
+    pk.stop_obfuscator_pool()
+
+
+def _wait_filled(pk, size, timeout=30):
+    deadline = time.time() + timeout
+    while pk.obfuscator_pool_stats()[2] < size:
+        assert time.time() < deadline, "obfuscator pool is not filled in time"
+        time.sleep(0.01)
+
+
+def test_pooled_encryption_decrypts(keys):
+    sk, pk, coder = keys
+    assert pk.obfuscator_pool_stats() is None
+    pk.start_obfuscator_pool(POOL_SIZE, 2)
+    _wait_filled(pk, POOL_SIZE)
+
+    # more encryptions than pooled obfuscators, the rest fall back to inline obfuscation
+    data = torch.randint(0, 1 << 40, (POOL_SIZE * 4,), dtype=torch.int64)
+    encrypted = pk.encrypt_encoded(coder.encode_tensor(data), obfuscate=True)
+    decrypted = coder.decode_tensor(sk.decrypt_to_encoded(encrypted), torch.int64, data.shape)
+    assert torch.equal(decrypted, data)
+
+    hits, misses, _ = pk.obfuscator_pool_stats()
+    assert hits >= POOL_SIZE
+    assert hits + misses == len(data)
+
+
+def test_pooled_encryption_adds_homomorphically(keys):
+    sk, pk, coder = keys
+    pk.start_obfuscator_pool(POOL_SIZE, 1)
+    _wait_filled(pk, POOL_SIZE)
+    a, b = torch.arange(POOL_SIZE, dtype=torch.int64), torch.arange(POOL_SIZE, dtype=torch.int64) * 3
+    ea = pk.encrypt_encoded(coder.encode_tensor(a), obfuscate=True)
+    eb = pk.encrypt_encoded(coder.encode_tensor(b), obfuscate=False)
+    decrypted = coder.decode_tensor(sk.decrypt_to_encoded(ea.add(pk.pk, eb)), torch.int64, a.shape)
+    assert torch.equal(decrypted, a + b)
+    # only obfuscated encryptions take from the pool
+    hits, misses, _ = pk.obfuscator_pool_stats()
+    assert hits + misses == POOL_SIZE
+
+
+def test_stop_obfuscator_pool(keys):
+    sk, pk, coder = keys
+    pk.start_obfuscator_pool(POOL_SIZE, 1)
+    pk.stop_obfuscator_pool()
+    assert pk.obfuscator_pool_stats() is None
+    data = torch.arange(4, dtype=torch.int64)
+    encrypted = pk.encrypt_encoded(coder.encode_tensor(data), obfuscate=True)
+    assert torch.equal(coder.decode_tensor(sk.decrypt_to_encoded(encrypted), torch.int64, data.shape), data)
@@ -0,0 +1,45 @@
+import pytest
+import torch
+from fate.arch.protocol.phe import ou, paillier
+from fate.arch.protocol.phe.type import MIN_PARALLEL_CHUNK_SIZE
+
+
+@pytest.fixture(scope="module", params=[paillier, ou], ids=["paillier", "ou"])
+def keys(request):
+    sk, pk, coder = request.param.keygen(1024)
+    if not hasattr(sk.sk, "decrypt_to_encoded_par"):
+        pytest.skip("fate_utils is built without parallel decryption")
+    return sk, pk, coder
+
+
+def _decrypt(sk, coder, encrypted, num_threads, shape):
+    sk.set_num_threads(num_threads)
+    try:
+        return coder.decode_tensor(sk.decrypt_to_encoded(encrypted), torch.int64, shape)
+    finally:
+        sk.set_num_threads(1)
+
+
+# vectors shorter than a chunk stay on one thread, longer ones are split with a ragged last chunk
+@pytest.mark.parametrize("size", [1, MIN_PARALLEL_CHUNK_SIZE - 1, MIN_PARALLEL_CHUNK_SIZE * 5 + 3])
+@pytest.mark.parametrize("num_threads", [2, 0])
+def test_parallel_decrypt_matches_serial(keys, size, num_threads):
+    sk, pk, coder = keys
+    data = torch.randint(0, 1 << 40, (size,), dtype=torch.int64)
+    encrypted = pk.encrypt_encoded(coder.encode_tensor(data), obfuscate=True)
+    serial = _decrypt(sk, coder, encrypted, 1, data.shape)
+    parallel = _decrypt(sk, coder, encrypted, num_threads, data.shape)
+    assert torch.equal(serial, data)
+    assert torch.equal(parallel, serial)
+
+
+@pytest.mark.parametrize("num_threads", [2, 0])
+def test_parallel_encrypt_decrypts_serially(keys, num_threads):
+    sk, pk, coder = keys
+    data = torch.randint(0, 1 << 40, (MIN_PARALLEL_CHUNK_SIZE * 3 + 1,), dtype=torch.int64)
+    pk.set_num_threads(num_threads)
+    try:
+        encrypted = pk.encrypt_encoded(coder.encode_tensor(data), obfuscate=True)
+    finally:
+        pk.set_num_threads(1)
+    assert torch.equal(_decrypt(sk, coder, encrypted, 1, data.shape), data)
@@ -0,0 +1,96 @@
+import tempfile
+import threading
+
+import pytest
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.computing.backends.standalone._standalone import _FederationMetaManager, _FederationNotifier
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from pytest import fixture
+
+GUEST = ("guest", "9999")
+HOST = ("host", "10000")
+
+
+@fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        yield data_dir
+
+
+def _create_ctx(data_dir, party):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    return Context(computing=computing, federation=StandaloneFederation(computing, "federation", party, [GUEST, HOST]))
+
+
+def _run_host(target):
+    errors = []
+
+    def _target():
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=_target, daemon=True)
+    thread.start()
+    return thread, errors
+
+
+@pytest.mark.parametrize("notify", [True, False], ids=["notify", "polling"])
+def test_meta_ping_pong(data_dir, notify):
+    guest_meta = _FederationMetaManager(data_dir=data_dir, session_id="meta", party=GUEST, notify=notify)
+    host_meta = _FederationMetaManager(data_dir=data_dir, session_id="meta", party=HOST, notify=notify)
+
+    def _host():
+        for i in range(20):
+            host_meta.wait_status_set(f"ping-{i}".encode())
+            host_meta.ack_status(f"ping-{i}".encode())
+            host_meta.set_status(GUEST, f"pong-{i}".encode(), b"1")
+
+    thread, errors = _run_host(_host)
+    for i in range(20):
+        guest_meta.set_status(HOST, f"ping-{i}".encode(), b"1")
+        guest_meta.wait_status_set(f"pong-{i}".encode())
+        guest_meta.ack_status(f"pong-{i}".encode())
+    thread.join(10)
+    assert not thread.is_alive() and not errors
+    guest_meta.close()
+    host_meta.close()
+
+
+def test_same_party_shares_notifier(data_dir):
+    first = _FederationMetaManager(data_dir=data_dir, session_id="meta", party=GUEST)
+    second = _FederationMetaManager(data_dir=data_dir, session_id="meta", party=GUEST)
+    if not _FederationNotifier.is_supported():
+        pytest.skip("unix socket not supported")
+    assert first._notifier is second._notifier
+    path = first._notifier._path
+
+    # the socket stays live as long as one of them is open
+    second.close()
+    assert first._notifier._is_live()
+    first.close()
+    probe = _FederationMetaManager(data_dir=data_dir, session_id="meta", party=HOST)
+    assert probe._notifier._path != path
+    probe.close()
+
+
+def test_two_party_round_trip(data_dir):
+    guest = _create_ctx(data_dir, GUEST)
+    host = _create_ctx(data_dir, HOST)
+
+    def _host():
+        value = host.guest.get("value")
+        table = host.guest.get("table")
+        host.guest.put("echo", (value, sorted(table.mapValues(lambda x: x + 1).collect())))
+
+    thread, errors = _run_host(_host)
+    guest.hosts.put("value", {"a": 1})
+    guest.hosts.put("table", guest.computing.parallelize([(i, i) for i in range(10)], partition=2))
+    (echo,) = guest.hosts.get("echo")
+    thread.join(10)
+    assert not thread.is_alive() and not errors
+    assert echo == ({"a": 1}, [(i, i + 1) for i in range(10)])
+    guest.computing.destroy()
+    host.computing.destroy()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+
+import pytest
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.unify import URI
+from pytest import fixture
+
+
+@fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        yield data_dir
+
+
+@fixture
+def session(data_dir):
+    session = CSession(data_dir=data_dir, options={"task_cores": 3})
+    yield session
+    session.destroy()
+
+
+def _write(data_dir, name, content):
+    path = os.path.join(data_dir, name)
+    with open(path, "w", newline="") as f:
+        f.write(content)
+    return path
+
+
+def _load(session, path, **options):
+    return session.load(URI.from_string(f"file://{path}"), schema={}, options=options)
+
+
+def _load_sequentially(path, id_delimiter=",", has_header=True):
+    # the layout a line by line upload produces: first column as key, the rest as value
+    with open(path, "r", newline="") as f:
+        lines = [line.rstrip("\r\n") for line in f]
+    header = None
+    if has_header and lines:
+        header, lines = lines[0], lines[1:]
+    records = []
+    for line in lines:
+        if line:
+            k, _, v = line.partition(id_delimiter)
+            records.append((k, v))
+    return header, sorted(records)
+
+
+def _csv(num_rows, id_delimiter=",", line_end="\n"):
+    lines = [id_delimiter.join(["id", "x0", "x1", "x2"])]
+    lines.extend(id_delimiter.join([f"sample_{i}", str(i), str(i * 0.5), "x" * (i % 13)]) for i in range(num_rows))
+    return line_end.join(lines) + line_end
+
+
+def test_header_only_file(data_dir, session):
+    for content in ["id,x0,x1\n", "id,x0,x1"]:
+        table = _load(session, _write(data_dir, "header_only.csv", content), partitions=3)
+        assert table.schema == {"header": "id,x0,x1"}
+        assert table.count() == 0
+        assert list(table.collect()) == []
+        assert table.num_partitions == 3
+
+
+def test_empty_file(data_dir, session):
+    path = _write(data_dir, "empty.csv", "")
+    table = _load(session, path, partitions=2)
+    assert "header" not in table.schema
+    assert table.count() == 0
+    assert table.num_partitions == 2
+
+    table = _load(session, path, partitions=2, has_header=False)
+    assert table.count() == 0
+
+
+@pytest.mark.parametrize("splits", [1, 3, 7, 64])
+@pytest.mark.parametrize("partitions", [1, 4])
+def test_multi_partition_file_matches_sequential_load(data_dir, session, splits, partitions):
+    path = _write(data_dir, "data.csv", _csv(500))
+    table = _load(session, path, partitions=partitions, splits=splits)
+    header, records = _load_sequentially(path)
+    assert table.schema["header"] == header
+    assert table.num_partitions == partitions
+    assert sorted(table.collect()) == records
+
+
+@pytest.mark.parametrize("line_end", ["\n", "\r\n"])
+def test_split_boundaries_and_line_endings(data_dir, session, line_end):
+    # more splits than lines puts split boundaries inside of most lines, blank lines are skipped
+    content = _csv(40, id_delimiter="\t", line_end=line_end)
+    content = content.replace(f"{line_end}sample_7\t", f"{line_end}{line_end}sample_7\t").rstrip(line_end)
+    assert f"{line_end}{line_end}" in content
+    path = _write(data_dir, "data.tsv", content)
+    table = _load(session, path, format="csv", id_delimiter="\t", partitions=3, splits=len(content))
+    header, records = _load_sequentially(path, id_delimiter="\t")
+    assert table.schema["header"] == header
+    assert sorted(table.collect()) == records
+    assert len(records) == 40
+
+
+def test_file_without_header(data_dir, session):
+    path = _write(data_dir, "data.csv", _csv(30))
+    table = _load(session, path, partitions=2, splits=4, has_header=False)
+    header, records = _load_sequentially(path, has_header=False)
+    assert "header" not in table.schema
+    assert sorted(table.collect()) == records
+    assert ("id", "x0,x1,x2") in records
+
+
+def test_loaded_table_joins_with_parallelized_table(data_dir, session):
+    path = _write(data_dir, "data.csv", _csv(100))
+    table = _load(session, path, partitions=4, splits=5)
+    other = session.parallelize([(f"sample_{i}", i) for i in range(0, 100, 3)], include_key=True, partition=4)
+    joined = table.join(other, lambda v, i: (v.split(",")[0], i))
+    assert sorted(joined.collect()) == sorted((f"sample_{i}", (str(i), i)) for i in range(0, 100, 3))
+
+
+def test_parquet_matches_csv(data_dir, session):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    csv_path = _write(data_dir, "data.csv", _csv(200))
+    parquet_path = os.path.join(data_dir, "data.parquet")
+    pd.read_csv(csv_path, dtype=str, keep_default_na=False).to_parquet(parquet_path, row_group_size=17)
+    table = _load(session, parquet_path, partitions=3, splits=4)
+    header, records = _load_sequentially(csv_path)
+    assert table.schema["header"] == header
+    assert sorted(table.collect()) == records
+
+
+def test_missing_file(data_dir, session):
+    with pytest.raises(ValueError, match="not found"):
+        _load(session, os.path.join(data_dir, "missing.csv"))
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.unify import URI
+from pytest import fixture
+
+
+@fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        yield data_dir
+
+
+def _session(data_dir):
+    return CSession(data_dir=data_dir, options={"task_cores": 2})
+
+
+def _uri(data_dir, name="saved"):
+    return URI.from_string(f"standalone://{data_dir}/saved_namespace/{name}")
+
+
+def test_saved_table_outlives_session(data_dir):
+    session = _session(data_dir)
+    table = session.parallelize([(i, i) for i in range(100)], include_key=True, partition=4)
+    table = table.mapValues(lambda x: x * 2)
+    table.save(_uri(data_dir), schema={}, options={})
+    raw = table.table
+    raw.destroy()
+    session.destroy()
+    # the saved table does not depend on anything left in the session's directory
+    shutil.rmtree(os.path.join(data_dir, session.session_id), ignore_errors=True)
+
+    for _ in range(2):
+        session = _session(data_dir)
+        try:
+            loaded = session.load(_uri(data_dir), schema={})
+            assert sorted(loaded.collect()) == [(i, i * 2) for i in range(100)]
+            assert loaded.num_partitions == 4
+        finally:
+            session.destroy()
+
+
+def test_save_over_existing_table(data_dir):
+    session = _session(data_dir)
+    try:
+        session.parallelize([(i, i) for i in range(10)], include_key=True, partition=2).save(
+            _uri(data_dir), schema={}, options={}
+        )
+        session.parallelize([(i, -i) for i in range(5)], include_key=True, partition=3).save(
+            _uri(data_dir), schema={}, options={}
+        )
+        loaded = session.load(_uri(data_dir), schema={})
+        assert loaded.num_partitions == 3
+        assert sorted(loaded.collect()) == [(i, -i) for i in range(5)]
+    finally:
+        session.destroy()
+
+
+def test_save_over_loaded_table_fails(data_dir):
+    session = _session(data_dir)
+    try:
+        session.parallelize([(i, i) for i in range(10)], include_key=True, partition=2).save(
+            _uri(data_dir), schema={}, options={}
+        )
+        loaded = session.load(_uri(data_dir), schema={})
+        with pytest.raises(RuntimeError, match="still referenced"):
+            session.parallelize([(0, 0)], include_key=True, partition=2).save(_uri(data_dir), schema={}, options={})
+        assert loaded.count() == 10
+    finally:
+        session.destroy()
@@ -0,0 +1,85 @@
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.computing.backends.standalone._standalone import _ShuffleWriter, _iter_shuffle_run
+from pytest import fixture
+
+NUM_PARTITIONS = 4
+
+
+@fixture(params=[1, 512, None], ids=["spill_every_record", "spill_some_runs", "in_memory"])
+def session(request):
+    with tempfile.TemporaryDirectory() as data_dir:
+        session = CSession(data_dir=data_dir, options={"task_cores": 2, "shuffle_memory_budget": request.param})
+        yield session
+        session.destroy()
+
+
+def _mapper(kvs):
+    for k, v in kvs:
+        yield k % 7, f"{v}."
+        yield k, f"{v}"
+
+
+def _old_shuffle(table, data, reducer):
+    """
+    the result of the lmdb shuffle this replaced: within a source partition values are combined in
+    map output order, without reducer the first one wins; source partitions are combined in order
+    """
+    partitions = [[] for _ in range(table.num_partitions)]
+    for k, v in data:
+        k_bytes = table.key_serdes.serialize(k)
+        partitions[table.partitioner(k_bytes, table.num_partitions)].append((k_bytes, k, v))
+    output = {}
+    for partition in partitions:
+        combined = {}
+        for k, v in _mapper((k, v) for _, k, v in sorted(partition)):
+            if k not in combined:
+                combined[k] = v
+            elif reducer is not None:
+                combined[k] = reducer(combined[k], v)
+        for k, v in combined.items():
+            output[k] = reducer(output[k], v) if reducer is not None and k in output else v
+    return output
+
+
+@pytest.mark.parametrize("reducer", [None, lambda x, y: x + y], ids=["no_reducer", "reducer"])
+def test_map_reduce_partitions_matches_old_shuffle(session, reducer):
+    data = [(i, i) for i in range(3000)]
+    table = session.parallelize(data, include_key=True, partition=NUM_PARTITIONS)
+    output = table.mapReducePartitions(_mapper, reducer)
+    assert dict(output.collect()) == _old_shuffle(table, data, reducer)
+
+
+def test_repartition(session):
+    data = [(i, str(i)) for i in range(1000)]
+    table = session.parallelize(data, include_key=True, partition=NUM_PARTITIONS)
+    output = table.repartition(NUM_PARTITIONS + 3)
+    assert output.num_partitions == NUM_PARTITIONS + 3
+    assert sorted(output.collect()) == data
+    # keys land in the partitions of the output partitioner, so joins with co-partitioned tables work
+    other = session.parallelize(data, include_key=True, partition=NUM_PARTITIONS + 3)
+    assert output.join(other, lambda x, y: x == y).count() == len(data)
+
+
+def test_growing_reduced_value_spills(tmp_path):
+    output_info = SimpleNamespace(data_dir=str(tmp_path), namespace="ns", name="shuffle", shuffle_memory_budget=4096)
+    p = SimpleNamespace(
+        output_info=output_info,
+        partition_id=0,
+        get_output_partition_num=lambda: 1,
+        get_output_partition_id=lambda k: 0,
+    )
+    # a single key whose combined value grows with every record, the way list accumulators do
+    writer = _ShuffleWriter(p, lambda x, y: x + y)
+    for _ in range(100):
+        writer.write(b"k", b"v" * 100)
+    writer.spill()
+
+    runs = sorted((tmp_path / "ns" / "shuffle" / "0_0").iterdir(), key=lambda x: int(x.name))
+    assert len(runs) > 1
+    values = [v for run in runs for _, _, v in _iter_shuffle_run(run, 0)]
+    assert all(len(v) <= output_info.shuffle_memory_budget for v in values)
+    assert b"".join(values) == b"v" * 100 * 100
@@ -0,0 +1,119 @@
+import itertools
+import os
+import tempfile
+
+import pytest
+from fate.arch import Context
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.computing.backends.standalone._standalone import _TableRefManager
+from fate.arch.computing.serdes import get_serdes_by_type
+from fate.arch.federation.backends.standalone import StandaloneFederation
+from pytest import fixture
+
+GUEST = ("guest", "9999")
+HOSTS = [("host", "10000"), ("host", "10001"), ("host", "10002")]
+PARTIES = [GUEST, *HOSTS]
+RECORDS = [(i, i * 2) for i in range(20)]
+
+
+@fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as data_dir:
+        yield data_dir
+
+
+def _ctx(computing, party):
+    return Context(computing=computing, federation=StandaloneFederation(computing, "refs", party, PARTIES))
+
+
+def _storage_path(raw):
+    return os.path.join(raw._data_dir, raw.namespace, raw.name)
+
+
+def _records(raw):
+    key_serdes, value_serdes = get_serdes_by_type(raw.key_serdes_type), get_serdes_by_type(raw.value_serdes_type)
+    return sorted((key_serdes.deserialize(k), value_serdes.deserialize(v)) for k, v in raw.collect())
+
+
+def _push(computing):
+    guest = _ctx(computing, GUEST)
+    table = computing.parallelize(RECORDS, include_key=True, partition=3)
+    guest.hosts.put("table", table)
+    received = [_ctx(computing, host).guest.get("table") for host in HOSTS]
+    return table.table, [r.table for r in received]
+
+
+@pytest.mark.parametrize("order", list(itertools.permutations(range(len(PARTIES)))))
+def test_storage_dropped_after_last_release(data_dir, order):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    try:
+        sender, receivers = _push(computing)
+        # handles in push order: the sender's first, then one per receiving party
+        handles = [sender, *receivers]
+        path = _storage_path(sender)
+        assert all(_storage_path(r) == path for r in receivers)
+        assert _TableRefManager.get_refs(data_dir, sender.namespace, sender.name) == len(handles)
+
+        for released, i in enumerate(order, start=1):
+            handles[i].destroy()
+            remaining = len(handles) - released
+            assert _TableRefManager.get_refs(data_dir, sender.namespace, sender.name) == remaining
+            if remaining:
+                assert os.path.isdir(path)
+                alive = next(handles[j] for j in order[released:])
+                assert _records(alive) == RECORDS
+            else:
+                assert not os.path.exists(path)
+    finally:
+        computing.destroy()
+
+
+def test_receiver_write_rejected(data_dir):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    try:
+        sender, receivers = _push(computing)
+        for receiver in receivers:
+            assert receiver.read_only
+            with pytest.raises(RuntimeError, match="read only"):
+                receiver.put_all([(b"k", b"v")], partitioner=lambda k, n: 0)
+            with pytest.raises(RuntimeError, match="read only"):
+                receiver.delete(b"k", partitioner=lambda k, n: 0)
+        assert _records(sender) == RECORDS
+        assert _records(receivers[0]) == RECORDS
+    finally:
+        computing.destroy()
+
+
+def test_sender_destroyed_before_receivers_read(data_dir):
+    sender_computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    receiver_computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    try:
+        guest = _ctx(sender_computing, GUEST)
+        table = sender_computing.parallelize(RECORDS, include_key=True, partition=3)
+        path = _storage_path(table.table)
+        guest.hosts.put("table", table)
+        table.table.destroy()
+        # the sender's session cleanup keeps storage still referenced by receivers as well
+        sender_computing.destroy()
+        assert os.path.isdir(path)
+
+        received = [_ctx(receiver_computing, host).guest.get("table").table for host in HOSTS]
+        for receiver in received:
+            assert _records(receiver) == RECORDS
+            receiver.destroy()
+        assert not os.path.exists(path)
+    finally:
+        receiver_computing.destroy()
+
+
+def test_ref_store_created_only_by_sharing(data_dir):
+    computing = CSession(data_dir=data_dir, options={"task_cores": 1})
+    store = os.path.join(data_dir, _TableRefManager.namespace, _TableRefManager.name)
+    try:
+        table = computing.parallelize(RECORDS, include_key=True, partition=2)
+        table.table.destroy()
+        assert _TableRefManager.get_refs(data_dir, table.table.namespace, table.table.name) == 0
+        assert not os.path.exists(store)
+    finally:
+        computing.destroy()
+    assert not os.path.exists(store)
@@ -0,0 +1,133 @@
+import os
+import tempfile
+from pathlib import Path
+
+import cloudpickle
+import pytest
+from fate.arch.computing.backends.standalone import CSession
+from fate.arch.computing.backends.standalone._standalone import _EnvCache, _FunctorCache
+from pytest import fixture
+
+
+@fixture
+def session():
+    with tempfile.TemporaryDirectory() as data_dir:
+        session = CSession(data_dir=data_dir, options={"task_cores": 1, "worker_pool": "pinned"})
+        yield session
+        session.destroy()
+
+
+def test_env_cache_evict():
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache = _EnvCache(max_size=8)
+        paths = [Path(data_dir).joinpath(*parts) for parts in [("t", "0"), ("t", "1"), ("t1", "0")]]
+        envs = [cache.get(path, write=True) for path in paths]
+        cache.evict(Path(data_dir).joinpath("t"))
+        assert cache.get(paths[2]) is envs[2]
+        # evicted envs are closed and reopened on next use
+        assert cache.get(paths[0], write=True) is not envs[0]
+        with pytest.raises(Exception):
+            envs[1].stat()
+
+
+def test_env_cache_reopens_recreated_path():
+    with tempfile.TemporaryDirectory() as data_dir:
+        cache = _EnvCache(max_size=8)
+        path = Path(data_dir).joinpath("t", "0")
+        env = cache.get(path, write=True)
+        cache.evict(path.parent)
+        os.rename(path, Path(data_dir).joinpath("moved"))
+        assert cache.get(path, write=True) is not env
+
+
+def test_functor_cache_clear():
+    cache = _FunctorCache(max_size=8, max_bytes=1 << 20)
+    state = []
+    functor_bytes = cloudpickle.dumps(lambda: state)
+    assert cache.loads(functor_bytes) is cache.loads(functor_bytes)
+    first = cache.loads(functor_bytes)
+    cache.clear()
+    assert cache.loads(functor_bytes) is not first
+
+
+def test_functor_cache_bounds():
+    cache = _FunctorCache(max_size=2, max_bytes=1 << 20)
+    functors = [cloudpickle.dumps(lambda i=i: i) for i in range(3)]
+    first = cache.loads(functors[0])
+    cache.loads(functors[1])
+    assert cache.loads(functors[0]) is first
+    # the least recently used functor is evicted past the count bound
+    cache.loads(functors[2])
+    assert cache.loads(functors[0]) is first
+    assert len(cache._functors) == 2
+
+    cache = _FunctorCache(max_size=8, max_bytes=1000)
+    large = [cloudpickle.dumps(lambda i=i, pad=b"x" * 600: (i, pad)) for i in range(2)]
+    first = cache.loads(large[0])
+    cache.loads(large[1])
+    # evicted past the size bound, the latest functor is always kept
+    assert len(cache._functors) == 1
+    assert cache.loads(large[0]) is not first
+
+
+class _CountedFunctor:
+    """
+    appends a line to `path` each time it is unpickled
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, x):
+        return x + 1
+
+    def __reduce__(self):
+        return _load_counted_functor, (self.path,)
+
+
+def _load_counted_functor(path):
+    with open(path, "a") as f:
+        f.write("loaded\n")
+    return _CountedFunctor(path)
+
+
+def test_functor_unpickled_once_across_tasks(session):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "loads")
+        functor = _CountedFunctor(path)
+        table = session.parallelize([(i, i) for i in range(20)], include_key=True, partition=4)
+        for _ in range(3):
+            assert sorted(table.mapValues(functor).collect()) == [(i, i + 1) for i in range(20)]
+        # one pinned worker runs every partition of every task
+        with open(path) as f:
+            assert f.read().splitlines() == ["loaded"]
+
+
+def _deleted_files_held_by_workers(session, path):
+    held = []
+    # noinspection PyProtectedMember
+    for worker in session.get_standalone_session()._pool._workers:
+        for pid in worker._processes:
+            fd_dir = f"/proc/{pid}/fd"
+            for fd in os.listdir(fd_dir):
+                try:
+                    target = os.readlink(os.path.join(fd_dir, fd))
+                except FileNotFoundError:
+                    continue
+                if target.startswith(path) and target.endswith(".mdb (deleted)"):
+                    held.append(target)
+    return held
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="requires procfs")
+def test_destroyed_table_envs_evicted(session):
+    table = session.parallelize([(i, i) for i in range(20)], include_key=True, partition=4)
+    mapped = table.mapValues(lambda x: x + 1)
+    assert mapped.count() == 20
+    raw = mapped.table
+    path = os.path.join(raw._data_dir, raw.namespace, raw.name)
+    assert _deleted_files_held_by_workers(session, path) == []
+    raw.destroy()
+    # eviction runs on the workers before tasks submitted later, count alone runs in the driver
+    assert table.mapValues(lambda x: x).count() == 20
+    assert _deleted_files_held_by_workers(session, path) == []
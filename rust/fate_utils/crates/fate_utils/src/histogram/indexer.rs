@@ -1,4 +1,7 @@
 use std::collections::HashMap;
+use ndarray::prelude::*;
+use numpy::{IntoPyArray, PyArray1, PyArray2, PyReadonlyArray1, PyReadonlyArray2};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use rand::rngs::StdRng;
 use rand::SeedableRng;
@@ -6,7 +9,7 @@ use rand::prelude::SliceRandom;
 
 type S = usize;
 
-#[pyclass]
+#[pyclass(module = "fate_utils.histogram")]
 pub struct HistogramIndexer {
     node_size: S,
     feature_bin_sizes: Vec<S>,
@@ -48,6 +51,68 @@ impl HistogramIndexer {
         }).collect()
     }
 
+    fn get_positions_with_node_mapping(
+        &self,
+        nids: Vec<S>,
+        bid_vec: Vec<Vec<S>>,
+        node_mapping: HashMap<S, S>,
+    ) -> (Vec<Vec<S>>, Vec<bool>) {
+        let mut positions = Vec::with_capacity(nids.len());
+        let mut masks = Vec::with_capacity(nids.len());
+        for (bids, nid) in bid_vec.iter().zip(nids.iter()) {
+            match node_mapping.get(nid) {
+                Some(&mapped_nid) => {
+                    positions.push(
+                        bids.iter().enumerate().map(|(fid, &bid)| self.get_position(mapped_nid, fid, bid)).collect(),
+                    );
+                    masks.push(true);
+                }
+                None => masks.push(false),
+            }
+        }
+        (positions, masks)
+    }
+
+    /// array version of `get_positions`: nids with shape (n,) and bids with shape (n, feature_size),
+    /// returns a contiguous (n, feature_size) array of positions
+    fn get_positions_array<'py>(
+        &self,
+        py: Python<'py>,
+        nids: PyReadonlyArray1<i64>,
+        bids: PyReadonlyArray2<i64>,
+    ) -> PyResult<&'py PyArray2<i64>> {
+        let nids = nids.as_array();
+        let bids = bids.as_array();
+        self.check_positions_array_shape(nids.len(), bids.dim())?;
+        let node_axis_stride = self.node_axis_stride as i64;
+        let positions = Array2::from_shape_fn(bids.dim(), |(i, fid)| {
+            nids[i] * node_axis_stride + self.feature_axis_stride[fid] as i64 + bids[[i, fid]]
+        });
+        Ok(positions.into_pyarray(py))
+    }
+
+    /// array version of `get_positions_with_node_mapping`: returns positions of the mapped rows
+    /// and the boolean row masks
+    fn get_positions_array_with_node_mapping<'py>(
+        &self,
+        py: Python<'py>,
+        nids: PyReadonlyArray1<i64>,
+        bids: PyReadonlyArray2<i64>,
+        node_mapping: HashMap<i64, i64>,
+    ) -> PyResult<(&'py PyArray2<i64>, &'py PyArray1<bool>)> {
+        let nids = nids.as_array();
+        let bids = bids.as_array();
+        self.check_positions_array_shape(nids.len(), bids.dim())?;
+        let masks: Array1<bool> = nids.iter().map(|nid| node_mapping.contains_key(nid)).collect();
+        let rows: Vec<usize> = (0..nids.len()).filter(|&i| masks[i]).collect();
+        let node_axis_stride = self.node_axis_stride as i64;
+        let positions = Array2::from_shape_fn((rows.len(), bids.ncols()), |(r, fid)| {
+            let i = rows[r];
+            node_mapping[&nids[i]] * node_axis_stride + self.feature_axis_stride[fid] as i64 + bids[[i, fid]]
+        });
+        Ok((positions.into_pyarray(py), masks.into_pyarray(py)))
+    }
+
     fn get_reverse_position(&self, position: S) -> (S, S, S) {
         let nid = position / self.node_axis_stride;
         let bid = position % self.node_axis_stride;
@@ -158,6 +223,9 @@ impl HistogramIndexer {
     fn get_num_nodes(&self) -> S {
         self.node_size
     }
+    fn __reduce__(&self, py: Python) -> (PyObject, (S, Vec<S>)) {
+        (py.get_type::<HistogramIndexer>().into(), (self.node_size, self.feature_bin_sizes.clone()))
+    }
     fn unflatten_indexes(&self) -> HashMap<S, HashMap<S, Vec<S>>> {
         let mut indexes = HashMap::new();
         for nid in 0..self.node_size {
@@ -172,10 +240,29 @@ impl HistogramIndexer {
     }
 }
 
-#[pyclass]
+impl HistogramIndexer {
+    fn check_positions_array_shape(&self, num_nids: usize, bids_dim: (usize, usize)) -> PyResult<()> {
+        if num_nids != bids_dim.0 {
+            return Err(PyValueError::new_err(format!(
+                "nids length {} is not equal to bids length {}",
+                num_nids, bids_dim.0
+            )));
+        }
+        if bids_dim.1 > self.feature_size {
+            return Err(PyValueError::new_err(format!(
+                "bids has {} features, but indexer has {} features",
+                bids_dim.1, self.feature_size
+            )));
+        }
+        Ok(())
+    }
+}
+
+#[pyclass(module = "fate_utils.histogram")]
 struct Shuffler {
     num_node: S,
     node_size: S,
+    seed: u64,
     perm_indexes: Vec<Vec<S>>,
 }
 
@@ -193,6 +280,7 @@ impl Shuffler {
         Shuffler {
             num_node,
             node_size,
+            seed,
             perm_indexes,
         }
     }
@@ -206,7 +294,8 @@ impl Shuffler {
     }
 
     fn get_reverse_indexes(&self, step: S, indexes: Vec<S>) -> Vec<S> {
-        let mapping = self.get_shuffle_index(step, true);
+        // position `i` of the shuffled data holds the original item `mapping[i]`
+        let mapping = self.get_shuffle_index(step, false);
         indexes.iter().map(|&x| mapping[x]).collect()
     }
     //     def get_shuffle_index(self, step, reverse=False):
@@ -239,6 +328,20 @@ impl Shuffler {
         indexes
     }
 
+    fn get_shuffle_index_array<'py>(&self, py: Python<'py>, step: S, reverse: bool) -> &'py PyArray1<i64> {
+        Array1::from(
+            self.get_shuffle_index(step, reverse)
+                .into_iter()
+                .map(|x| x as i64)
+                .collect::<Vec<i64>>(),
+        )
+            .into_pyarray(py)
+    }
+
+    fn __reduce__(&self, py: Python) -> (PyObject, (S, S, u64)) {
+        (py.get_type::<Shuffler>().into(), (self.num_node, self.node_size, self.seed))
+    }
+
     fn reverse_index(&self, index: S) -> (S, S) {
         let nid = index / self.node_size;
         let bid = index % self.node_size;
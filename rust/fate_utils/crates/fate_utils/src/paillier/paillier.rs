@@ -58,6 +58,28 @@ impl PK {
     fn encrypt_encoded_scalar(&self, plaintext: &Plaintext, obfuscate: bool) -> Ciphertext {
         Ciphertext(self.0.encrypt_encoded_scalar(&plaintext.0, obfuscate))
     }
+    /// multi-threaded `encrypt_encoded`, runs without holding the GIL
+    fn encrypt_encoded_par(
+        &self,
+        py: Python,
+        plaintext_vector: &PlaintextVector,
+        obfuscate: bool,
+        num_threads: usize,
+        min_chunk_size: usize,
+    ) -> CiphertextVector {
+        CiphertextVector(py.allow_threads(|| {
+            self.0.encrypt_encoded_par(&plaintext_vector.0, obfuscate, num_threads, min_chunk_size)
+        }))
+    }
+    fn start_obfuscator_pool(&mut self, pool_size: usize, num_threads: usize) {
+        self.0.start_obfuscator_pool(pool_size, num_threads)
+    }
+    fn stop_obfuscator_pool(&mut self) {
+        self.0.stop_obfuscator_pool()
+    }
+    fn obfuscator_pool_stats(&self) -> Option<(u64, u64, usize)> {
+        self.0.obfuscator_pool_stats()
+    }
 
     #[new]
     fn __new__() -> PyResult<Self> {
@@ -82,6 +104,16 @@ impl SK {
     fn decrypt_to_encoded_scalar(&self, data: &Ciphertext) -> Plaintext {
         Plaintext(self.0.decrypt_to_encoded_scalar(&data.0))
     }
+    /// multi-threaded `decrypt_to_encoded`, runs without holding the GIL
+    fn decrypt_to_encoded_par(
+        &self,
+        py: Python,
+        data: &CiphertextVector,
+        num_threads: usize,
+        min_chunk_size: usize,
+    ) -> PlaintextVector {
+        PlaintextVector(py.allow_threads(|| self.0.decrypt_to_encoded_par(&data.0, num_threads, min_chunk_size)))
+    }
 
     #[new]
     fn __new__() -> PyResult<Self> {
@@ -1,9 +1,12 @@
-use math::BInt;
+use math::{BInt, ObfuscatorPool};
 use ou;
 use anyhow::Result;
 use anyhow::anyhow;
 use std::ops::{AddAssign, BitAnd, Mul, ShlAssign, SubAssign};
 use rug::{self, Integer, ops::Pow, Float, Rational};
+use rayon::prelude::*;
+use std::collections::HashMap;
+use std::sync::{Arc, Mutex, OnceLock};
 use serde::{Deserialize, Serialize};
 
 mod frexp;
@@ -19,13 +22,37 @@ const LOG2_BASE: u32 = 4;
 pub struct PK {
     pub pk: ou::PK,
     // pub max_int: BInt,
+    // local to the encrypting party, never serialized
+    #[serde(skip)]
+    pub obfuscator_pool: Option<ObfuscatorPool>,
 }
 
 impl PK {
+    #[inline]
+    fn encrypt_significant(&self, significant: &ou::PT, obfuscate: bool) -> ou::CT {
+        match &self.obfuscator_pool {
+            Some(pool) => self.pk.encrypt_with_obfuscator(significant, &pool.take()),
+            None => self.pk.encrypt(significant, obfuscate),
+        }
+    }
+    /// start `num_threads` background threads precomputing up to `capacity` obfuscators,
+    /// encryptions consume them instead of computing `h^r mod n` inline
+    pub fn start_obfuscator_pool(&mut self, capacity: usize, num_threads: usize) {
+        self.obfuscator_pool = Some(self.pk.obfuscator_pool(capacity, num_threads));
+    }
+    pub fn stop_obfuscator_pool(&mut self) {
+        self.obfuscator_pool = None;
+    }
+    /// (hits, misses, pooled) of the obfuscator pool
+    pub fn obfuscator_pool_stats(&self) -> Option<(u64, u64, usize)> {
+        self.obfuscator_pool
+            .as_ref()
+            .map(|pool| (pool.hits(), pool.misses(), pool.len()))
+    }
     #[inline]
     pub fn encrypt(&self, plaintext: &Plaintext, obfuscate: bool) -> Ciphertext {
         let exp = plaintext.exp;
-        let encode = self.pk.encrypt(&plaintext.significant, obfuscate);
+        let encode = self.encrypt_significant(&plaintext.significant, obfuscate);
         Ciphertext {
             significant_encryped: encode,
             exp,
@@ -305,16 +332,44 @@ impl PK {
         let data = plaintext
             .data
             .iter()
-            .map(|x| Ciphertext { significant_encryped: self.pk.encrypt(&x.significant, obfuscate), exp: x.exp })
+            .map(|x| Ciphertext { significant_encryped: self.encrypt_significant(&x.significant, obfuscate), exp: x.exp })
             .collect();
         CiphertextVector { data }
     }
     pub fn encrypt_encoded_scalar(&self, plaintext: &Plaintext, obfuscate: bool) -> Ciphertext {
         Ciphertext {
-            significant_encryped: self.pk.encrypt(&plaintext.significant, obfuscate),
+            significant_encryped: self.encrypt_significant(&plaintext.significant, obfuscate),
             exp: plaintext.exp,
         }
     }
+    /// encrypt in chunks of at least `min_chunk_size` on a pool of `num_threads` threads, 0 for all cores
+    pub fn encrypt_encoded_par(
+        &self,
+        plaintext: &PlaintextVector,
+        obfuscate: bool,
+        num_threads: usize,
+        min_chunk_size: usize,
+    ) -> CiphertextVector {
+        let data = thread_pool(num_threads).install(|| {
+            plaintext
+                .data
+                .par_iter()
+                .with_min_len(min_chunk_size)
+                .map(|x| Ciphertext { significant_encryped: self.encrypt_significant(&x.significant, obfuscate), exp: x.exp })
+                .collect()
+        });
+        CiphertextVector { data }
+    }
+}
+
+/// pools are built once per thread count and shared by later calls, 0 for all cores
+fn thread_pool(num_threads: usize) -> Arc<rayon::ThreadPool> {
+    static POOLS: OnceLock<Mutex<HashMap<usize, Arc<rayon::ThreadPool>>>> = OnceLock::new();
+    let mut pools = POOLS.get_or_init(|| Mutex::new(HashMap::new())).lock().unwrap();
+    pools
+        .entry(num_threads)
+        .or_insert_with(|| Arc::new(rayon::ThreadPoolBuilder::new().num_threads(num_threads).build().unwrap()))
+        .clone()
 }
 
 
@@ -333,13 +388,24 @@ impl SK {
             exp: data.exp,
         }
     }
+    /// decrypt in chunks of at least `min_chunk_size` on a pool of `num_threads` threads, 0 for all cores
+    pub fn decrypt_to_encoded_par(&self, data: &CiphertextVector, num_threads: usize, min_chunk_size: usize) -> PlaintextVector {
+        let data = thread_pool(num_threads).install(|| {
+            data.data
+                .par_iter()
+                .with_min_len(min_chunk_size)
+                .map(|x| Plaintext { significant: self.sk.decrypt(&x.significant_encryped), exp: x.exp })
+                .collect()
+        });
+        PlaintextVector { data }
+    }
 }
 
 pub fn keygen(bit_length: u32) -> (SK, PK, Coder) {
     let (sk, pk) = ou::keygen(bit_length);
     let coder = Coder::new();
     // let max_int = &sk.p / MAX_INT_FRACTION;
-    (SK { sk }, PK { pk: pk }, coder)
+    (SK { sk }, PK { pk: pk, obfuscator_pool: None }, coder)
 }
 
 impl CiphertextVector {
@@ -11,3 +11,9 @@ pub use self::rug::BInt;
 
 #[cfg(feature = "rug")]
 pub use self::rug::ONE;
+
+#[cfg(feature = "rug")]
+mod pool;
+
+#[cfg(feature = "rug")]
+pub use self::pool::ObfuscatorPool;
@@ -0,0 +1,112 @@
+use super::BInt;
+use std::collections::VecDeque;
+use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
+use std::sync::{Arc, Condvar, Mutex};
+use std::thread::JoinHandle;
+
+type Generator = dyn Fn() -> BInt + Send + Sync;
+
+struct Shared {
+    queue: Mutex<VecDeque<BInt>>,
+    not_full: Condvar,
+    capacity: usize,
+    stopped: AtomicBool,
+    hits: AtomicU64,
+    misses: AtomicU64,
+}
+
+/// pool of precomputed obfuscators, such as `r^n mod n^2` of paillier or `h^r mod n` of ou
+///
+/// background threads keep the pool filled up to `capacity` and sleep while it is full,
+/// `take` pops a precomputed obfuscator and falls back to computing one inline when the pool is drained
+pub struct ObfuscatorPool {
+    shared: Arc<Shared>,
+    generator: Arc<Generator>,
+    workers: Vec<JoinHandle<()>>,
+}
+
+impl ObfuscatorPool {
+    pub fn new<F>(capacity: usize, num_threads: usize, generator: F) -> ObfuscatorPool
+    where
+        F: Fn() -> BInt + Send + Sync + 'static,
+    {
+        let shared = Arc::new(Shared {
+            queue: Mutex::new(VecDeque::with_capacity(capacity)),
+            not_full: Condvar::new(),
+            capacity,
+            stopped: AtomicBool::new(false),
+            hits: AtomicU64::new(0),
+            misses: AtomicU64::new(0),
+        });
+        let generator: Arc<Generator> = Arc::new(generator);
+        let workers = (0..num_threads)
+            .map(|_| {
+                let shared = shared.clone();
+                let generator = generator.clone();
+                std::thread::spawn(move || ObfuscatorPool::refill(&shared, generator.as_ref()))
+            })
+            .collect();
+        ObfuscatorPool {
+            shared,
+            generator,
+            workers,
+        }
+    }
+    fn refill(shared: &Shared, generator: &Generator) {
+        loop {
+            {
+                let mut queue = shared.queue.lock().unwrap();
+                while queue.len() >= shared.capacity && !shared.stopped.load(Ordering::Acquire) {
+                    queue = shared.not_full.wait(queue).unwrap();
+                }
+            }
+            if shared.stopped.load(Ordering::Acquire) {
+                return;
+            }
+            // the expensive exponentiation runs without holding the lock
+            let obfuscator = generator();
+            let mut queue = shared.queue.lock().unwrap();
+            if queue.len() < shared.capacity {
+                queue.push_back(obfuscator);
+            }
+        }
+    }
+    pub fn take(&self) -> BInt {
+        let pooled = self.shared.queue.lock().unwrap().pop_front();
+        match pooled {
+            Some(obfuscator) => {
+                self.shared.hits.fetch_add(1, Ordering::Relaxed);
+                self.shared.not_full.notify_one();
+                obfuscator
+            }
+            None => {
+                self.shared.misses.fetch_add(1, Ordering::Relaxed);
+                (self.generator)()
+            }
+        }
+    }
+    pub fn capacity(&self) -> usize {
+        self.shared.capacity
+    }
+    pub fn len(&self) -> usize {
+        self.shared.queue.lock().unwrap().len()
+    }
+    pub fn hits(&self) -> u64 {
+        self.shared.hits.load(Ordering::Relaxed)
+    }
+    pub fn misses(&self) -> u64 {
+        self.shared.misses.load(Ordering::Relaxed)
+    }
+}
+
+impl Drop for ObfuscatorPool {
+    fn drop(&mut self) {
+        self.shared.stopped.store(true, Ordering::Release);
+        // take the lock so no worker misses the wakeup between its check and its wait
+        drop(self.shared.queue.lock().unwrap());
+        self.shared.not_full.notify_all();
+        for worker in self.workers.drain(..) {
+            let _ = worker.join();
+        }
+    }
+}
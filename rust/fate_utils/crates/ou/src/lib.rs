@@ -1,4 +1,4 @@
-use math::{BInt, ONE};
+use math::{BInt, ObfuscatorPool, ONE};
 use serde::{Deserialize, Serialize};
 use std::fmt::{Display, Formatter};
 use std::ops::AddAssign;
@@ -101,8 +101,20 @@ impl PK {
     /// g^plaintext \cdot h^r \pmod{n}
     /// ```
     pub fn encrypt(&self, plaintext: &PT, _obfuscate: bool) -> CT {
+        self.encrypt_with_obfuscator(plaintext, &self.random_hr())
+    }
+    pub fn random_hr(&self) -> BInt {
         let r = BInt::gen_positive_integer(&self.n);
-        let c = self.g.pow_mod_ref(&plaintext.0, &self.n) * self.h.pow_mod_ref(&r, &self.n);
+        self.h.pow_mod_ref(&r, &self.n)
+    }
+    /// pool of `h^r mod n` precomputed by `num_threads` background threads
+    pub fn obfuscator_pool(&self, capacity: usize, num_threads: usize) -> ObfuscatorPool {
+        let pk = self.clone();
+        ObfuscatorPool::new(capacity, num_threads, move || pk.random_hr())
+    }
+    /// encrypt plaintext with a precomputed obfuscator `hr`, which should be taken from an `ObfuscatorPool`
+    pub fn encrypt_with_obfuscator(&self, plaintext: &PT, hr: &BInt) -> CT {
+        let c = self.g.pow_mod_ref(&plaintext.0, &self.n) * hr;
         CT(c)
     }
 }
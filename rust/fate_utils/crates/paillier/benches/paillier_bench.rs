@@ -29,11 +29,47 @@ fn paillier_benchmark(c: &mut Criterion) {
     group.bench_function("obfuscate", |b| {
         b.iter(|| black_box(&ciphertext).to_owned().obfuscate(black_box(&pk)))
     });
+    let rn = pk.random_rn();
+    group.bench_function("encrypt with precomputed obfuscator", |b| {
+        b.iter(|| black_box(&pk).encrypt_with_obfuscator(black_box(&plaintext), black_box(&rn)))
+    });
+}
+
+fn obfuscator_pool_benchmark(c: &mut Criterion) {
+    let (_sk, pk) = paillier::keygen(1024);
+    let plaintext = paillier::PT(BInt::from_str_radix("1234567890987654321", 10));
+    let batch_size = 256;
+    let mut group = c.benchmark_group("obfuscator pool");
+    group.sample_size(10);
+
+    group.bench_function("encrypt batch without pool", |b| {
+        b.iter(|| {
+            for _ in 0..batch_size {
+                black_box(black_box(&pk).encrypt(black_box(&plaintext), true));
+            }
+        })
+    });
+    for num_threads in [1, 4] {
+        let pool = pk.obfuscator_pool(batch_size, num_threads);
+        group.bench_function(format!("encrypt batch with pool, {} threads", num_threads), |b| {
+            b.iter(|| {
+                for _ in 0..batch_size {
+                    black_box(black_box(&pk).encrypt_with_obfuscator(black_box(&plaintext), &pool.take()));
+                }
+            })
+        });
+        println!(
+            "obfuscator pool with {} threads: hits={}, misses={}",
+            num_threads,
+            pool.hits(),
+            pool.misses()
+        );
+    }
 }
 
 criterion_group! {
     name = benches;
     config = Criterion::default().measurement_time(Duration::from_secs(10));
-    targets = paillier_benchmark
+    targets = paillier_benchmark, obfuscator_pool_benchmark
 }
 criterion_main!(benches);
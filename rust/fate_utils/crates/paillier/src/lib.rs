@@ -1,4 +1,4 @@
-use math::{BInt, ONE};
+use math::{BInt, ObfuscatorPool, ONE};
 use serde::{Deserialize, Serialize};
 use std::fmt::{Display, Formatter};
 use std::ops::AddAssign;
@@ -91,26 +91,32 @@ impl PK {
         let ns = &n * &n;
         PK { n, ns }
     }
-    fn random_rn(&self) -> BInt {
+    pub fn random_rn(&self) -> BInt {
         let mut r = BInt::gen_positive_integer(&self.n);
         r.pow_mod_mut(&self.n, &self.ns);
         r
     }
+    /// pool of `r^n mod n^2` precomputed by `num_threads` background threads
+    pub fn obfuscator_pool(&self, capacity: usize, num_threads: usize) -> ObfuscatorPool {
+        let pk = self.clone();
+        ObfuscatorPool::new(capacity, num_threads, move || pk.random_rn())
+    }
+    fn encrypt_nude(&self, plaintext: &PT) -> BInt {
+        if plaintext.0 > self.n.clone() >> 2u32 {
+            let neg_plaintext = &self.n - &plaintext.0;
+            let neg_ciphertext = (&self.n * neg_plaintext + ONE) % &self.ns;
+            neg_ciphertext.invert(&self.ns)
+        } else {
+            (&plaintext.0 * &self.n + 1) % &self.ns
+        }
+    }
     /// encrypt plaintext
     ///
     /// ```math
     /// (plaintext \cdot n + 1)r^n \pmod{n^2}
     /// ```
     pub fn encrypt(&self, plaintext: &PT, obfuscate: bool) -> CT {
-        let nude_ciphertext = {
-            if plaintext.0 > self.n.clone() >> 2u32 {
-                let neg_plaintext = &self.n - &plaintext.0;
-                let neg_ciphertext = (&self.n * neg_plaintext + ONE) % &self.ns;
-                neg_ciphertext.invert(&self.ns)
-            } else {
-                (&plaintext.0 * &self.n + 1) % &self.ns
-            }
-        };
+        let nude_ciphertext = self.encrypt_nude(plaintext);
         let e = if obfuscate {
             let rn = self.random_rn();
             nude_ciphertext * rn % &self.ns
@@ -119,6 +125,10 @@ impl PK {
         };
         CT(e)
     }
+    /// encrypt plaintext with a precomputed obfuscator `rn`, which should be taken from an `ObfuscatorPool`
+    pub fn encrypt_with_obfuscator(&self, plaintext: &PT, rn: &BInt) -> CT {
+        CT(self.encrypt_nude(plaintext) * rn % &self.ns)
+    }
 }
 
 impl SK {
@@ -195,3 +205,15 @@ fn decrypt() {
     let decrypted = private.decrypt(&ciphertext);
     assert_eq!(plaintext, decrypted)
 }
+
+#[test]
+fn decrypt_with_obfuscator_pool() {
+    let (private, public) = keygen(1024);
+    let pool = public.obfuscator_pool(4, 2);
+    for i in 0..8u32 {
+        let plaintext = PT(BInt::from(i));
+        let ciphertext = public.encrypt_with_obfuscator(&plaintext, &pool.take());
+        assert_eq!(plaintext, private.decrypt(&ciphertext))
+    }
+    assert_eq!(pool.hits() + pool.misses(), 8)
+}
@@ -6,6 +6,12 @@ class PK:
     def __init__(self) -> None: ...
     def encrypt_encoded(self, fixedpoint: FixedpointVector, obfuscate: bool) -> FixedpointPaillierVector: ...
     def encrypt_encoded_scalar(self, fixedpoint: FixedpointEncoded, obfuscate: bool) -> PyCT: ...
+    def encrypt_encoded_par(
+        self, fixedpoint: FixedpointVector, obfuscate: bool, num_threads: int, min_chunk_size: int
+    ) -> FixedpointPaillierVector: ...
+    def start_obfuscator_pool(self, pool_size: int, num_threads: int) -> None: ...
+    def stop_obfuscator_pool(self) -> None: ...
+    def obfuscator_pool_stats(self) -> Optional[Tuple[int, int, int]]: ...
     def __new__(self) -> "PK": ...
     def __getstate__(self) -> List[bytes]: ...
     def __setstate__(self, state: List[bytes]) -> None: ...
@@ -14,6 +20,9 @@ class SK:
     def __init__(self) -> None: ...
     def decrypt_to_encoded(self, data: FixedpointPaillierVector) -> FixedpointVector: ...
     def decrypt_to_encoded_scalar(self, data: PyCT) -> FixedpointEncoded: ...
+    def decrypt_to_encoded_par(
+        self, data: FixedpointPaillierVector, num_threads: int, min_chunk_size: int
+    ) -> FixedpointVector: ...
     def __new__(self) -> "SK": ...
     def __getstate__(self) -> List[bytes]: ...
     def __setstate__(self, state: List[bytes]) -> None: ...